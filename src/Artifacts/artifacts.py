@@ -4,8 +4,11 @@ import psycopg2
 import psycopg2.extras
 from datetime import datetime
 import uuid
+from pathlib import Path
 import traceback
 from config import Settings
+from db_pool import DBPool
+from migrations import Migrations
 
 psycopg2.extras.register_uuid()
 
@@ -58,12 +61,12 @@ class ScriptDataHandler:
         return script_folders
 
     # ---------------- File Handling ----------------
-    def load_files(self):
-        """Loads the latest JSON and corresponding .py/.txt scripts."""
+    def load_files(self, folder=None):
+        """Loads the JSON and corresponding .py/.txt scripts of `folder` (default: the latest run)."""
         print("📂 Loading JSON and script files ...")
 
-        json_folder = self.get_latest_folder(self.json_base)
-        manim_folder = self.get_latest_folder(self.manim_base)
+        json_folder = folder or self.get_latest_folder(self.json_base)
+        manim_folder = folder or self.get_latest_folder(self.manim_base)
 
         # ✅ Find JSON file dynamically
         json_files = [f for f in os.listdir(json_folder) if f.endswith(".json")]
@@ -88,12 +91,12 @@ class ScriptDataHandler:
             txt_path = os.path.join(folder, f"{seq_name}.txt")
 
             code_data[seq_name] = (
-                open(py_path, "r", encoding="utf-8").read()
+                Path(py_path).read_text(encoding="utf-8")
                 if os.path.exists(py_path)
                 else ""
             )
             narration_data[seq_name] = (
-                open(txt_path, "r", encoding="utf-8").read()
+                Path(txt_path).read_text(encoding="utf-8")
                 if os.path.exists(txt_path)
                 else ""
             )
@@ -111,26 +114,17 @@ class ScriptDataHandler:
     # ---------------- Database Methods ----------------
     def connect_db(self):
         print("🔗 Connecting to PostgreSQL ...")
-        self.conn = psycopg2.connect(**self.db_config)
+        self.conn = DBPool.getconn(self.db_config)
         self.cursor = self.conn.cursor()
         print("✅ Database connected successfully.")
 
     def create_table(self):
         print("🧱 Ensuring 'script_store' table exists ...")
-        create_table_query = """
-        CREATE TABLE IF NOT EXISTS script_store (
-            id UUID NOT NULL,
-            Transaction_id TEXT,
-            time TIMESTAMP DEFAULT NOW(),
-            folder_name TEXT,
-            scripts JSONB,
-            sequence TEXT,
-            code TEXT,
-            narration JSONB
-        );
-        """
-        self.cursor.execute(create_table_query)
-        self.conn.commit()
+        # Created by the versioned schema migration; a no-op once this process has run it
+        if not Migrations.ensure(self.db_config):
+            # Failed now or within the retry backoff: the table usually exists already, so try the insert
+            print("⚠️ Schema migration unavailable, inserting into existing 'script_store'")
+            return
         print("✅ Table ready for inserts.")
 
     def insert_data(self, data):
@@ -141,6 +135,7 @@ class ScriptDataHandler:
         narrations = data["narrations"]
         folder_name = data["folder_name"]
 
+        rows = []
         for entry in scripts:
             seq_num = entry.get("script_seq")
             seq_label = f"script_seq{seq_num}"
@@ -148,10 +143,7 @@ class ScriptDataHandler:
             code_data = codes.get(seq_label, "")
             narration_data = narrations.get(seq_label, "")
 
-            self.cursor.execute("""
-                INSERT INTO script_store (id, Transaction_id, time, folder_name, scripts, sequence, code, narration)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-            """, (
+            rows.append((
                 str(self.batch_id),
                 str(self.unique_id),
                 self.current_time,
@@ -162,39 +154,72 @@ class ScriptDataHandler:
                 json.dumps(narration_data),
             ))
 
+        # One multi-row INSERT for the whole batch
+        psycopg2.extras.execute_values(self.cursor, """
+            INSERT INTO script_store (id, Transaction_id, time, folder_name, scripts, sequence, code, narration)
+            VALUES %s
+        """, rows)
+
         self.conn.commit()
         print(f"✅ Data inserted successfully for batch ID = {self.batch_id}")
 
     def close_db(self):
-        print("🔒 Closing database connection ...")
+        print("🔒 Returning database connection to the pool ...")
         if self.cursor:
             self.cursor.close()
+            self.cursor = None
         if self.conn:
-            self.conn.close()
-        print("✅ Connection closed.")
+            DBPool.putconn(self.conn)
+            self.conn = None
+        print("✅ Connection released.")
 
 
 # ---------------- Main Execution ----------------
-def run_script_data_process(unique_id):
-    """Main function to run the complete data extraction and DB insertion pipeline."""
-    
+def _script_data_handler(unique_id):
     db_config = {k: v for k, v in Settings.POSTGRES.items() if k != "table"}
-
+    return ScriptDataHandler(
+        json_base=Settings.TEMP_GENERATED_FOLDER,
+        manim_base=Settings.TEMP_GENERATED_FOLDER,
+        db_config=db_config,
+        unique_id=unique_id
+    )
+
+
+def load_script_data(unique_id, folder=None):
+    """
+    Read a run's JSON, code and narrations once, for every DB writer that needs
+    them (Table_gen, run_script_data_process). Tries `folder` first, then the
+    latest run folder; None if neither could be read.
+    """
+    handler = _script_data_handler(unique_id)
+    for candidate in ([folder] if folder else []) + [None]:
+        try:
+            return handler.load_files(candidate)
+        except Exception as e:
+            print(f"⚠️ Could not load script data from {candidate or 'latest folder'}: {e}")
+    return None
+
+
+def run_script_data_process(unique_id, data=None):
+    """
+    Main function to run the complete data extraction and DB insertion pipeline.
+    `data` is what load_script_data returned, so the files are not read again.
+    """
     try:
         print("\n🚀 Starting Script Data Pipeline...\n")
 
-        handler = ScriptDataHandler(
-            json_base=Settings.TEMP_GENERATED_FOLDER,
-            manim_base=Settings.TEMP_GENERATED_FOLDER,
-            db_config=db_config,
-            unique_id=unique_id
-        )
+        handler = _script_data_handler(unique_id)
 
-        handler.connect_db()
+        # Read everything from disk (unless already in memory) before borrowing a connection
+        if data is None:
+            data = handler.load_files()
         handler.create_table()
-        data = handler.load_files()
-        handler.insert_data(data)
-        handler.close_db()
+        handler.connect_db()
+        try:
+            handler.insert_data(data)
+        finally:
+            # A pooled connection must always go back, even when an insert fails
+            handler.close_db()
 
         print("\n✅ Pipeline completed successfully.\n")
 
@@ -97,7 +97,14 @@ class CodeGenerator:
             input_variables=["final_prompt"],
             template="{final_prompt}"
         )
-    def generate_code(self, input_data: List[Dict], unique_id: str) -> List[Dict]:
+    def generate_code(self, input_data: List[Dict], unique_id: str, on_code=None) -> List[Dict]:
+        """
+        Generate Manim code for every scene, in order.
+
+        If given, `on_code(name, manim_code)` is called as soon as each scene's
+        code is ready, so it can be written and rendered while the next scene
+        is still being generated.
+        """
         result = []
         previous_code = ""
 
@@ -190,6 +197,12 @@ class CodeGenerator:
 
                     result.append({f"script_seq{script_seq}": manim_code})
 
+                    if on_code and manim_code:
+                        try:
+                            on_code(f"script_seq{script_seq}", manim_code)
+                        except Exception as cb_error:
+                            validation_logger.error(f"❌ on_code callback failed for {script_seq}: {cb_error}")
+
                 except Exception as per_script_error:
                     # Individual script failed but continue
                     validation_logger.error(f"❌ Error generating code for {script_seq}: {per_script_error}")
@@ -5,6 +5,9 @@ from datetime import datetime
 import uuid
 import traceback
 from config import Settings  # DB config
+from db_pool import DBPool
+from migrations import Migrations
+from Transaction.status_writer import StatusWriter
 
 psycopg2.extras.register_uuid()
 
@@ -20,13 +23,7 @@ class ExceptionHandler:
     # ---------------- Connection ----------------
     def connect_db(self):
         try:
-            self.conn = psycopg2.connect(
-                host=self.db_config["host"],
-                port=self.db_config["port"],
-                user=self.db_config["user"],
-                password=self.db_config["password"],
-                dbname=self.db_config["dbname"],
-            )
+            self.conn = DBPool.getconn(self.db_config)
             self.cursor = self.conn.cursor()
         except Exception as e:
             print("❌ Database connection failed:", str(e))
@@ -38,48 +35,10 @@ class ExceptionHandler:
             if self.cursor:
                 self.cursor.close()
             if self.conn:
-                self.conn.close()
+                DBPool.putconn(self.conn)   # back to the shared pool, not closed
         except Exception as e:
             print("⚠️ Error closing DB connection:", e)
 
-    # ---------------- Table Creation ----------------
-    def create_table_if_not_exists(self):
-        """Create table with only required columns."""
-        try:
-            query = """
-            CREATE TABLE IF NOT EXISTS exception_store (
-                exception_id UUID PRIMARY KEY,
-                transaction_id TEXT,
-                type TEXT,
-                description TEXT,
-                module TEXT,
-                created_at TIMESTAMP DEFAULT NOW(),
-                updated_at TIMESTAMP
-            );
-            """
-            self.cursor.execute(query)
-            self.conn.commit()
-
-            # Auto-heal if missing
-            alter_queries = [
-                "ALTER TABLE exception_store ADD COLUMN IF NOT EXISTS transaction_id TEXT;",
-                "ALTER TABLE exception_store ADD COLUMN IF NOT EXISTS type TEXT;",
-                "ALTER TABLE exception_store ADD COLUMN IF NOT EXISTS description TEXT;",
-                "ALTER TABLE exception_store ADD COLUMN IF NOT EXISTS module TEXT;",
-                "ALTER TABLE exception_store ADD COLUMN IF NOT EXISTS created_at TIMESTAMP DEFAULT NOW();",
-                "ALTER TABLE exception_store ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP;"
-            ]
-
-            for q in alter_queries:
-                self.cursor.execute(q)
-            self.conn.commit()
-
-        except Exception as e:
-            print("❌ Error creating/updating exception_store:", str(e))
-            traceback.print_exc()
-            self.conn.rollback()
-            raise
-
     # ---------------- UPSERT ----------------
     def upsert_exception(
         self,
@@ -89,16 +48,19 @@ class ExceptionHandler:
         module: str = None,
     ):
         """Insert or update error record."""
-        try:
-            exception_id = uuid.uuid4()
-            now = datetime.now()
+        exception_id = uuid.uuid4()
+        self.upsert_exceptions([(exception_id, exception_fields(transaction_id, type, description, module))])
+        print(f"⚠️ Exception logged for transaction {transaction_id} → {exception_id}")
 
+    def upsert_exceptions(self, rows):
+        """Insert many error records in one statement; `rows` is [(exception_id, fields)]."""
+        try:
             query = """
                 INSERT INTO exception_store (
                     exception_id, transaction_id, type,
                     description, module, created_at, updated_at
                 )
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
+                VALUES %s
                 ON CONFLICT (exception_id)
                 DO UPDATE SET
                     type = COALESCE(EXCLUDED.type, exception_store.type),
@@ -107,21 +69,44 @@ class ExceptionHandler:
                     updated_at = EXCLUDED.updated_at;
             """
 
-            self.cursor.execute(
-                query,
-                (exception_id, transaction_id, type, description, module, now, now),
-            )
+            values = [
+                (
+                    exception_id, fields.get("transaction_id"), fields.get("type"),
+                    fields.get("description"), fields.get("module"), fields["created_at"], fields["created_at"],
+                )
+                for exception_id, fields in rows
+            ]
+            psycopg2.extras.execute_values(self.cursor, query, values)
             self.conn.commit()
 
-            print(f"⚠️ Exception logged for transaction {transaction_id} → {exception_id}")
-
         except Exception as e:
-            print(f"❌ Error inserting exception for {transaction_id}: {e}")
+            print(f"❌ Error inserting {len(rows)} exception(s): {e}")
             traceback.print_exc()
             self.conn.rollback()
             raise
 
 
+def exception_fields(transaction_id, type=None, description=None, module=None):
+    return {
+        "transaction_id": transaction_id, "type": type, "description": description,
+        "module": module, "created_at": datetime.now(),
+    }
+
+
+def _write_exceptions(rows):
+    """StatusWriter sink: one multi-row INSERT for the queued exception records."""
+    Migrations.ensure(Settings.POSTGRES)
+    handler = ExceptionHandler()
+    try:
+        handler.connect_db()
+        handler.upsert_exceptions(rows)
+    finally:
+        handler.close_db()
+
+
+StatusWriter.register("exception", _write_exceptions)
+
+
 # ---------------- Wrapper ----------------
 def exception(
     transaction_id: str,
@@ -129,11 +114,19 @@ def exception(
     description: str = None,
     module: str = None,
 ):
-    """Lightweight one-line exception logger."""
+    """
+    Lightweight one-line exception logger. With STATUS_WRITE_BEHIND it only
+    queues the record; StatusWriter inserts queued records in batches.
+    """
+    if Settings.STATUS_WRITE_BEHIND:
+        # Every record is its own row (fresh exception_id), so nothing coalesces here
+        StatusWriter.submit("exception", uuid.uuid4(), exception_fields(transaction_id, type, description, module))
+        return
+
     handler = ExceptionHandler()
     try:
+        Migrations.ensure(handler.db_config)
         handler.connect_db()
-        handler.create_table_if_not_exists()
         handler.upsert_exception(transaction_id, type, description, module)
     except Exception as e:
         print(f"❌ Failed to log exception for transaction {transaction_id}: {e}")
@@ -0,0 +1,143 @@
+import atexit
+import threading
+import time
+from config import Settings
+
+
+class StatusWriter:
+    """
+    Write-behind buffer for status rows (`transaction()` / `exception()`).
+
+    Callers `submit` an update and return immediately; a background thread
+    writes queued updates in batches through the sink registered for their
+    kind. Updates for the same key (e.g. one transaction_id) are coalesced
+    into a single row, later non-None values winning — the same outcome as
+    the sequential COALESCE upserts. `flush` blocks until everything submitted
+    before it has been written, for stage boundaries and shutdown.
+
+    At most STATUS_QUEUE_MAX rows wait at once. Beyond that, the "block"
+    policy waits up to STATUS_QUEUE_BLOCK_SECONDS for room and the "drop"
+    policy discards the new update; coalesced updates always fit.
+    """
+
+    _sinks = {}       # kind -> write_batch(rows), rows = [(key, fields), ...]
+    _pending = {}     # kind -> {key: fields}, insertion ordered
+    _queued = 0       # rows in _pending
+    _submitted = 0    # updates accepted so far
+    _written = 0      # updates covered by finished batches
+    _flush_requested = False
+    _stats = {"batches": 0, "rows": 0, "coalesced": 0, "dropped": 0, "failed_batches": 0}
+    _cond = threading.Condition()
+    _thread = None
+
+    # ---------------- Registration ----------------
+    @staticmethod
+    def register(kind, write_batch):
+        with StatusWriter._cond:
+            StatusWriter._sinks[kind] = write_batch
+            StatusWriter._pending.setdefault(kind, {})
+
+    # ---------------- Producer ----------------
+    @staticmethod
+    def submit(kind, key, fields) -> bool:
+        """Queue `fields` (None values ignored) for row `key`; False if the update was dropped."""
+        fields = {k: v for k, v in fields.items() if v is not None}
+        with StatusWriter._cond:
+            pending = StatusWriter._pending[kind]
+            if key in pending:
+                pending[key].update(fields)
+                StatusWriter._stats["coalesced"] += 1
+            else:
+                if StatusWriter._queued >= Settings.STATUS_QUEUE_MAX and not StatusWriter._wait_for_room():
+                    StatusWriter._stats["dropped"] += 1
+                    print(f"⚠️ Status queue full, dropped {kind} update for {key}")
+                    return False
+                pending[key] = fields
+                StatusWriter._queued += 1
+            StatusWriter._submitted += 1
+            StatusWriter._start_worker()
+            StatusWriter._cond.notify_all()
+            return True
+
+    @staticmethod
+    def _wait_for_room():
+        """Called with the lock held once the queue is full; True when a row may be added."""
+        if Settings.STATUS_QUEUE_POLICY != "block":
+            return False
+        StatusWriter._flush_requested = True
+        StatusWriter._cond.notify_all()
+        return StatusWriter._cond.wait_for(
+            lambda: StatusWriter._queued < Settings.STATUS_QUEUE_MAX,
+            timeout=Settings.STATUS_QUEUE_BLOCK_SECONDS,
+        )
+
+    @staticmethod
+    def flush(timeout=None) -> bool:
+        """Wait until every update submitted so far is written (or its batch failed)."""
+        with StatusWriter._cond:
+            target = StatusWriter._submitted
+            if StatusWriter._written >= target:
+                return True
+            StatusWriter._flush_requested = True
+            StatusWriter._cond.notify_all()
+            return StatusWriter._cond.wait_for(lambda: StatusWriter._written >= target, timeout=timeout)
+
+    # ---------------- Background writer ----------------
+    @staticmethod
+    def _start_worker():
+        if StatusWriter._thread is None:
+            StatusWriter._thread = threading.Thread(target=StatusWriter._run, name="status_writer", daemon=True)
+            StatusWriter._thread.start()
+
+    @staticmethod
+    def _next_batch():
+        """Block until a batch is due (interval, size or flush request), then take it."""
+        with StatusWriter._cond:
+            deadline = None
+            while True:
+                if StatusWriter._queued:
+                    now = time.monotonic()
+                    deadline = deadline or now + Settings.STATUS_FLUSH_INTERVAL_MS / 1000
+                    if (StatusWriter._flush_requested or now >= deadline
+                            or StatusWriter._queued >= Settings.STATUS_BATCH_SIZE):
+                        break
+                    StatusWriter._cond.wait(deadline - now)
+                else:
+                    StatusWriter._cond.wait()
+
+            batch = {kind: list(rows.items()) for kind, rows in StatusWriter._pending.items() if rows}
+            for rows in StatusWriter._pending.values():
+                rows.clear()
+            StatusWriter._queued = 0
+            StatusWriter._flush_requested = False
+            StatusWriter._cond.notify_all()   # wake producers blocked on a full queue
+            return batch, StatusWriter._submitted
+
+    @staticmethod
+    def _run():
+        while True:
+            batch, covered = StatusWriter._next_batch()
+            failed = 0
+            for kind, rows in batch.items():
+                try:
+                    StatusWriter._sinks[kind](rows)
+                except Exception as e:
+                    # Same outcome as a failed synchronous write: reported, never raised into the pipeline
+                    failed += 1
+                    print(f"❌ Failed to write {len(rows)} queued {kind} update(s): {e}")
+            with StatusWriter._cond:
+                StatusWriter._written = covered
+                StatusWriter._stats["batches"] += 1
+                StatusWriter._stats["rows"] += sum(len(rows) for rows in batch.values())
+                StatusWriter._stats["failed_batches"] += failed
+                StatusWriter._cond.notify_all()
+
+    # ---------------- Metrics ----------------
+    @staticmethod
+    def stats() -> dict:
+        with StatusWriter._cond:
+            return {**StatusWriter._stats, "queued": StatusWriter._queued}
+
+
+# Don't lose the last updates of a run when the process exits normally
+atexit.register(lambda: StatusWriter.flush(timeout=Settings.STATUS_QUEUE_BLOCK_SECONDS))
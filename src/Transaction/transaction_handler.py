@@ -4,6 +4,9 @@ import psycopg2.extras
 from datetime import datetime
 import traceback
 from config import Settings  # ✅ shared config for DB connection
+from db_pool import DBPool
+from migrations import Migrations
+from Transaction.status_writer import StatusWriter
 
 psycopg2.extras.register_uuid()
 
@@ -18,15 +21,9 @@ class TransactionHandler:
 
     # ---------------- Connection Methods ----------------
     def connect_db(self):
-        """Establish connection to PostgreSQL using config."""
+        """Borrow a pooled PostgreSQL connection (see db_pool.DBPool)."""
         try:
-            self.conn = psycopg2.connect(
-                host=self.db_config["host"],
-                port=self.db_config["port"],
-                user=self.db_config["user"],
-                password=self.db_config["password"],
-                dbname=self.db_config["dbname"],
-            )
+            self.conn = DBPool.getconn(self.db_config)
             self.cursor = self.conn.cursor()
         except Exception as e:
             print("❌ Database connection failed:", str(e))
@@ -34,65 +31,15 @@ class TransactionHandler:
             raise
 
     def close_db(self):
-        """Safely close DB connection."""
+        """Safely return the DB connection to the pool."""
         try:
             if self.cursor:
                 self.cursor.close()
             if self.conn:
-                self.conn.close()
+                DBPool.putconn(self.conn)   # back to the shared pool, not closed
         except Exception as e:
             print("⚠️ Error closing DB connection:", e)
 
-    # ---------------- Table Creation & Schema Healing ----------------
-    def create_table_if_not_exists(self):
-        """Ensure the transaction table exists and has all expected columns."""
-        try:
-            base_table_query = """
-            CREATE TABLE IF NOT EXISTS transaction (
-                transaction_id UUID PRIMARY KEY,
-                topic TEXT,
-                meta_prompt TEXT,
-                cleaned_script JSON,
-                script_gen_status TEXT,
-                filegenration TEXT,
-                code_gen TEXT,
-                manim_output_status TEXT,
-                script_written TEXT,
-                merge_status TEXT,
-                video_status TEXT,
-                created_at TIMESTAMP DEFAULT NOW(),
-                updated_at TIMESTAMP
-            );
-            """
-            self.cursor.execute(base_table_query)
-            self.conn.commit()
-
-            # ✅ Auto-heal (for schema evolution)
-            alter_queries = [
-                "ALTER TABLE transaction ADD COLUMN IF NOT EXISTS topic TEXT;",
-                "ALTER TABLE transaction ADD COLUMN IF NOT EXISTS meta_prompt TEXT;",
-                "ALTER TABLE transaction ADD COLUMN IF NOT EXISTS cleaned_script JSON;",
-                "ALTER TABLE transaction ADD COLUMN IF NOT EXISTS script_gen_status TEXT;",
-                "ALTER TABLE transaction ADD COLUMN IF NOT EXISTS filegenration TEXT;",
-                "ALTER TABLE transaction ADD COLUMN IF NOT EXISTS code_gen TEXT;",
-                "ALTER TABLE transaction ADD COLUMN IF NOT EXISTS manim_output_status TEXT;",
-                "ALTER TABLE transaction ADD COLUMN IF NOT EXISTS script_written TEXT;",
-                "ALTER TABLE transaction ADD COLUMN IF NOT EXISTS merge_status TEXT;"
-                "ALTER TABLE transaction ADD COLUMN IF NOT EXISTS video_status TEXT;"
-                "ALTER TABLE transaction ADD COLUMN IF NOT EXISTS created_at TIMESTAMP DEFAULT NOW();",
-                "ALTER TABLE transaction ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP;"
-            ]
-
-            for q in alter_queries:
-                self.cursor.execute(q)
-            self.conn.commit()
-
-        except Exception as e:
-            print("❌ Error creating/updating transaction table:", str(e))
-            traceback.print_exc()
-            self.conn.rollback()
-            raise
-
     # ---------------- UPSERT Logic ----------------
     def upsert_transaction(
         self,
@@ -109,23 +56,28 @@ class TransactionHandler:
         video_status: str = None,
     ):
         """Insert or update a transaction record safely (UPSERT)."""
+        fields = status_fields(
+            topic=topic, meta_prompt=meta_prompt, cleaned_script=cleaned_script,
+            script_gen_status=script_gen_status, filegenration=filegenration, code_gen=code_gen,
+            manim_output_status=manim_output_status, script_written=script_written,
+            merge_status=merge_status, video_status=video_status,
+        )
+        self.upsert_transactions([(transaction_id, fields)])
+        print(f"✅ Transaction upserted successfully: {transaction_id}")
+
+    def upsert_transactions(self, rows):
+        """
+        UPSERT many transactions in one statement. `rows` is [(transaction_id, fields)]
+        with at most one row per id; `fields` holds STATUS_COLUMNS values and updated_at.
+        """
         try:
-            now = datetime.now()
-
-            # Safely convert cleaned_script to JSON string
-            json_data = (
-                json.dumps(cleaned_script)
-                if cleaned_script is not None and not isinstance(cleaned_script, str)
-                else cleaned_script
-            )
-
             # ✅ Correct UPSERT query
             query = """
                 INSERT INTO transaction (
                     transaction_id, topic, meta_prompt, cleaned_script,script_gen_status,
                     filegenration, code_gen, manim_output_status, script_written,merge_status,video_status, created_at, updated_at
                 )
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s,%s,%s,%s, %s)
+                VALUES %s
                 ON CONFLICT (transaction_id)
                 DO UPDATE SET
                     topic = COALESCE(EXCLUDED.topic, transaction.topic),
@@ -141,34 +93,55 @@ class TransactionHandler:
                     updated_at = EXCLUDED.updated_at;
             """
 
-            self.cursor.execute(
-                query,
+            values = [
                 (
                     transaction_id,
-                    topic,
-                    meta_prompt,
-                    json_data,
-                    script_gen_status,
-                    filegenration,
-                    code_gen,
-                    manim_output_status,
-                    script_written,
-                    merge_status,
-                    video_status,
-                    now,
-                    now,
-                ),
-            )
+                    *(fields.get(column) for column in STATUS_COLUMNS),
+                    fields["updated_at"],
+                    fields["updated_at"],
+                )
+                for transaction_id, fields in rows
+            ]
+            psycopg2.extras.execute_values(self.cursor, query, values)
             self.conn.commit()
-            print(f"✅ Transaction upserted successfully: {transaction_id}")
 
         except Exception as e:
-            print(f"❌ Error upserting transaction {transaction_id}: {e}")
+            print(f"❌ Error upserting {len(rows)} transaction(s): {e}")
             traceback.print_exc()
             self.conn.rollback()
             raise
 
 
+STATUS_COLUMNS = (
+    "topic", "meta_prompt", "cleaned_script", "script_gen_status", "filegenration",
+    "code_gen", "manim_output_status", "script_written", "merge_status", "video_status",
+)
+
+
+def status_fields(**columns):
+    """Non-None status columns plus updated_at, with cleaned_script serialized to JSON."""
+    cleaned_script = columns.get("cleaned_script")
+    if cleaned_script is not None and not isinstance(cleaned_script, str):
+        columns["cleaned_script"] = json.dumps(cleaned_script)
+    fields = {k: v for k, v in columns.items() if v is not None}
+    fields["updated_at"] = datetime.now()
+    return fields
+
+
+def _write_transactions(rows):
+    """StatusWriter sink: one batched UPSERT for the queued transaction updates."""
+    Migrations.ensure(Settings.POSTGRES)
+    handler = TransactionHandler()
+    try:
+        handler.connect_db()
+        handler.upsert_transactions(rows)
+    finally:
+        handler.close_db()
+
+
+StatusWriter.register("transaction", _write_transactions)
+
+
 # ---------------- Helper Wrapper ----------------
 def transaction(
     transaction_id: str,
@@ -186,7 +159,9 @@ def transaction(
     """
     Flexible one-line transaction logger:
       - Inserts if not exists, updates if already present.
-      - Automatically heals missing columns if schema changes.
+      - Only DML: the table is created/migrated once per process (see migrations.Migrations).
+      - With STATUS_WRITE_BEHIND, returns at once; updates are coalesced per
+        transaction_id and written in batches (StatusWriter.flush() to wait).
 
     Examples:
       transaction(unique_id, topic="Math", meta_prompt="Algebra lesson for class 8")
@@ -195,10 +170,19 @@ def transaction(
       transaction(unique_id, code_gen="Code created successfully")
       transaction(unique_id, script_written="Scripts written successfully")
     """
+    if Settings.STATUS_WRITE_BEHIND:
+        StatusWriter.submit("transaction", transaction_id, status_fields(
+            topic=topic, meta_prompt=meta_prompt, cleaned_script=cleaned_script,
+            script_gen_status=script_gen_status, filegenration=filegenration, code_gen=code_gen,
+            manim_output_status=manim_output_status, script_written=script_written,
+            merge_status=merge_status, video_status=video_status,
+        ))
+        return
+
     handler = TransactionHandler()
     try:
+        Migrations.ensure(handler.db_config)
         handler.connect_db()
-        handler.create_table_if_not_exists()
         handler.upsert_transaction(
             transaction_id, topic, meta_prompt, cleaned_script,script_gen_status, filegenration, code_gen, manim_output_status, script_written,merge_status,video_status
         )
@@ -9,6 +9,7 @@ import httpx
 import asyncio
 
 from config import Settings
+from migrations import Migrations
 from logger import pipeline_logger
 from main import prepare_files, process_pipeline
 from LLM_Processor.script_factory import ScriptGeneratorFactory
@@ -21,6 +22,12 @@ topicName = ""
 #  🚀 FastAPI Setup
 # ================================================================
 app = FastAPI(title="🎬 Video Processing Pipeline API")
+
+
+@app.on_event("startup")
+def apply_schema_migrations():
+    # Create/upgrade every pipeline table once, so status writes are plain DML
+    Migrations.ensure()
 API_KEY = "dZfHrqzrU2lw32MX2RPRiG8ARSKqavpiqpLsU2b0"
 BASE_INPUT_ROOT = Path(r"C:\Vivek_Main\Manim_project\inputbox")
 
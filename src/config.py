@@ -5,9 +5,53 @@ class Settings:
     RUN_FROM = "local" 
     GENERATE_NEW_FILES = False
     VIDEO_PROCESSOR = "manim"
-    AUDIO_PROCESSOR = "kokoro"
+    AUDIO_PROCESSOR = "kokoro"      # tts / coqui / indic / kokoro / kokoro_int8 (quantized, CPU hosts)
     FILE_TYPES = ["py", "txt"]
 
+    # === Manim rendering ===
+    MANIM_QUALITY = "low_quality"   # low_quality / medium_quality / high_quality / production_quality
+    MANIM_RENDER_WORKERS = 0        # parallel scene renders (0 = one per CPU core)
+    MANIM_RENDER_MODE = "subprocess"  # "subprocess" (manim CLI per scene) or "inprocess" (pre-warmed workers)
+    MANIM_WORKER_MAX_RENDERS = 20   # inprocess mode: recycle a worker after N renders (0 = never)
+    RENDER_CACHE_ENABLED = True     # reuse mp4s for scenes whose source/quality/manim version match
+    RENDER_CACHE_DIR = Path(__file__).resolve().parent / "media" / "render_cache"
+    RENDER_CACHE_MAX_MB = 2048
+    MANIM_ASSET_CACHE_ENABLED = True  # share compiled Tex/Text SVGs across scenes and sessions
+    MANIM_ASSET_CACHE_DIR = Path(__file__).resolve().parent / "media" / "asset_cache"
+    MANIM_ASSET_CACHE_MAX_MB = 512
+    MANIM_ASSET_PREWARM_FORMULAS = [r"a^2 + b^2 = c^2", r"\sqrt{a^2 + b^2}"]
+    STREAMING_RENDER = False        # /Generator: write + render each scene as soon as its code arrives
+
+    # === Merging ===
+    MERGE_MODE = "two_stage"        # "two_stage" (mux each, then concat) or "single_pass" (one ffmpeg run; falls back to two_stage on failure)
+    STREAMING_MERGE = False         # mux each scene as soon as its video + audio exist
+    STREAMING_MERGE_WORKERS = 2     # concurrent per-scene ffmpeg mux jobs in streaming mode
+    STREAMING_AUDIO = False         # with STREAMING_MERGE: pipe kokoro/coqui/indic PCM into ffmpeg per scene as it's synthesized
+
+    # === Audio ===
+    AUDIO_OUTPUT_FORMAT = "native"  # "native" (WAV/MP3 as synthesized) or "aac" (delivery codec, merger stream-copies it)
+    AUDIO_SAMPLE_RATE = 48000       # delivery sample rate / channels / bitrate, used by every backend and the merger
+    AUDIO_CHANNELS = 2
+    AUDIO_BITRATE = "192k"
+    EARLY_AUDIO_STAGE = True        # start TTS from /generate-files-api, before Manim code exists
+    AUDIO_STAGE_WORKERS = 1         # concurrent early TTS jobs (one per unique_id)
+    AUDIO_STAGE_MAX_PENDING = 8     # unclaimed staged results kept before the oldest is dropped
+    TTS_PRELOAD = True              # load + warm up AUDIO_PROCESSOR's model at API startup
+    TTS_POOL_MAX_INSTANCES = 1      # resident models per backend (callers beyond this wait)
+    TTS_POOL_IDLE_SECONDS = 1800    # unload a model unused for this long (0 = never)
+    TTS_POOL_MAX_RSS_MB = 0         # unload idle models, LRU first, while process RSS exceeds this (0 = off)
+    TTS_POOL_SWEEP_SECONDS = 60     # how often idle models are checked for eviction
+    TTS_THREAD_WORKERS = 4          # gTTS: scenes synthesized concurrently (network-bound)
+    TTS_PROCESS_WORKERS = 2         # kokoro/coqui/indic: worker processes, each with its own model (1 = sequential)
+    TTS_SHARD_MIN_CHARS = 300       # split narrations into sentence shards of at least this many chars (0 = off)
+    TTS_SHARD_GAP_MS = 150          # kokoro: silence where two shards of one narration are joined
+    TTS_CACHE_ENABLED = True        # reuse synthesized sentences (same text/backend/voice/speed)
+    TTS_CACHE_DIR = Path(__file__).resolve().parent / "media" / "tts_cache"
+    TTS_CACHE_MAX_MB = 1024
+    KOKORO_G2P_CACHE_ENABLED = True   # persist Kokoro phonemization per text chunk across restarts
+    KOKORO_G2P_CACHE_PATH = Path(__file__).resolve().parent / "media" / "g2p_cache.sqlite3"
+    KOKORO_G2P_CACHE_MAX_ENTRIES = 200000
+
 
     JSON_FILE_PATH = Path(r"C:\Vivek_Main\Manim_project\jsonfiles\script1.json")
     TEMP_GENERATED_FOLDER = Path(r"C:\ArkMalay\Framework_1\Video_data")
@@ -34,6 +78,29 @@ class Settings:
         "table": "videos",
     }
 
+    FINAL_VIDEO_TABLE = "final_videos"  # PostgresSaver's BYTEA table (POSTGRES["table"] holds Table_gen's path rows)
+
+    # === Status writes (transaction() / exception()) ===
+    STATUS_WRITE_BEHIND = True      # queue status rows and write them in batches on a background thread
+    STATUS_FLUSH_INTERVAL_MS = 500  # max delay before queued updates are written
+    STATUS_BATCH_SIZE = 200         # write early once this many rows are queued
+    STATUS_QUEUE_MAX = 5000         # queued rows before STATUS_QUEUE_POLICY applies
+    STATUS_QUEUE_POLICY = "block"   # "block" (wait up to STATUS_QUEUE_BLOCK_SECONDS, then drop) or "drop"
+    STATUS_QUEUE_BLOCK_SECONDS = 5
+
+    # === Error logs in Postgres ('exceptions' table) ===
+    LOG_DB_QUEUE_MAX = 1000         # ERROR records buffered for the DB writer (more are dropped, files keep them)
+    LOG_DB_BATCH_SIZE = 100         # records per multi-row INSERT
+    LOG_DB_FLUSH_INTERVAL_MS = 1000 # max delay before buffered records are written
+
+    # === Database connection pool ===
+    DB_POOL_MIN_CONN = 2            # connections kept open while idle (extras are closed when returned)
+    DB_POOL_MAX_CONN = 10           # per database; callers beyond this wait for a free one
+    DB_POOL_TIMEOUT_SECONDS = 30    # max wait for a free connection before failing
+    DB_POOL_HEALTHCHECK_SECONDS = 60  # ping connections idle longer than this before reuse (0 = always)
+    DB_CONNECT_TIMEOUT_SECONDS = 5  # TCP/auth timeout for new connections
+    DB_MIGRATION_RETRY_SECONDS = 30 # after a failed schema migration, writers skip retrying it for this long
+
     SCRIPT_QUERY = "SELECT script_seq, script_for_manim, script_voice_over FROM scripts_table;"
 
     debugging = False
@@ -0,0 +1,183 @@
+import threading
+import time
+from contextlib import contextmanager
+import psycopg2
+from psycopg2 import pool as pg_pool
+from config import Settings
+
+# Keys of a credentials dict that identify a database (anything else, e.g. "table", is ignored)
+CONNECT_KEYS = ("host", "port", "user", "password", "dbname")
+
+
+class DBPool:
+    """
+    Process-wide PostgreSQL connection pools, shared by every DB writer.
+
+    One ThreadedConnectionPool is kept per distinct set of credentials
+    (Settings.POSTGRES unless a caller passes its own), holding between
+    DB_POOL_MIN_CONN and DB_POOL_MAX_CONN connections. Callers beyond the
+    maximum wait up to DB_POOL_TIMEOUT_SECONDS for a connection to be returned.
+    Connections idle for longer than DB_POOL_HEALTHCHECK_SECONDS are pinged
+    before being handed out and replaced if the server dropped them.
+
+    Nothing here logs: the Postgres logging handler borrows connections too,
+    and must not feed back into itself.
+    """
+
+    _pools = {}       # credentials key -> {"pool", "slots", "stats"}
+    _owners = {}      # id(conn) -> credentials key
+    _last_used = {}   # id(conn) -> monotonic time it was returned
+    _lock = threading.Lock()
+
+    # ---------------- Pools ----------------
+    @staticmethod
+    def _key(credentials):
+        credentials = credentials or Settings.POSTGRES
+        return tuple(credentials.get(k) for k in CONNECT_KEYS)
+
+    @staticmethod
+    def _get_pool(key):
+        with DBPool._lock:
+            entry = DBPool._pools.get(key)
+        if entry is not None:
+            return entry
+
+        # Opening minconn connections can take DB_CONNECT_TIMEOUT_SECONDS, so it happens
+        # outside the lock; other databases, stats() and closeall() never wait on it.
+        # Raises if the server is unreachable; nothing is cached, so the next call retries.
+        maxconn = max(1, Settings.DB_POOL_MAX_CONN)
+        pool = pg_pool.ThreadedConnectionPool(
+            min(Settings.DB_POOL_MIN_CONN, maxconn), maxconn,
+            connect_timeout=Settings.DB_CONNECT_TIMEOUT_SECONDS,
+            **dict(zip(CONNECT_KEYS, key)),
+        )
+        with DBPool._lock:
+            entry = DBPool._pools.get(key)
+            if entry is None:
+                entry = {
+                    "pool": pool,
+                    "slots": threading.BoundedSemaphore(maxconn),
+                    "stats": {"checkouts": 0, "waits": 0, "timeouts": 0, "replaced": 0},
+                }
+                DBPool._pools[key] = entry
+                return entry
+        # Another thread built this database's pool first
+        pool.closeall()
+        return entry
+
+    # ---------------- Borrowing ----------------
+    @staticmethod
+    def getconn(credentials=None):
+        """
+        Borrow a healthy connection; return it with `putconn`. Raises
+        psycopg2.OperationalError if none could be obtained in time.
+        """
+        key = DBPool._key(credentials)
+        entry = DBPool._get_pool(key)
+
+        if not entry["slots"].acquire(blocking=False):
+            with DBPool._lock:
+                entry["stats"]["waits"] += 1
+            if not entry["slots"].acquire(timeout=Settings.DB_POOL_TIMEOUT_SECONDS):
+                with DBPool._lock:
+                    entry["stats"]["timeouts"] += 1
+                raise psycopg2.OperationalError(
+                    f"No free PostgreSQL connection after {Settings.DB_POOL_TIMEOUT_SECONDS}s"
+                )
+
+        try:
+            conn = entry["pool"].getconn()
+            if not DBPool._healthy(conn):
+                entry["pool"].putconn(conn, close=True)
+                with DBPool._lock:
+                    entry["stats"]["replaced"] += 1
+                conn = entry["pool"].getconn()
+        except Exception:
+            entry["slots"].release()
+            raise
+
+        with DBPool._lock:
+            DBPool._owners[id(conn)] = key
+            entry["stats"]["checkouts"] += 1
+        return conn
+
+    @staticmethod
+    def putconn(conn, discard=False):
+        """Return a borrowed connection (rolled back if left mid-transaction); `discard` closes it."""
+        discard = discard or bool(conn.closed)
+        with DBPool._lock:
+            key = DBPool._owners.pop(id(conn), None)
+            entry = DBPool._pools.get(key)
+            if discard:
+                DBPool._last_used.pop(id(conn), None)
+            else:
+                DBPool._last_used[id(conn)] = time.monotonic()
+        if entry is None:
+            # Pool was closed meanwhile (or the connection never came from one)
+            conn.close()
+            return
+        try:
+            entry["pool"].putconn(conn, close=discard)
+        except Exception:
+            conn.close()
+        finally:
+            entry["slots"].release()
+
+    @staticmethod
+    @contextmanager
+    def connection(credentials=None):
+        """`with DBPool.connection() as conn:` — borrowed for the block, discarded if it broke."""
+        conn = DBPool.getconn(credentials)
+        broken = False
+        try:
+            yield conn
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            broken = True
+            raise
+        finally:
+            DBPool.putconn(conn, discard=broken)
+
+    @staticmethod
+    def _healthy(conn):
+        if conn.closed:
+            return False
+        with DBPool._lock:
+            last_used = DBPool._last_used.get(id(conn))
+        if last_used is not None and time.monotonic() - last_used < Settings.DB_POOL_HEALTHCHECK_SECONDS:
+            return True
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            return False
+
+    # ---------------- Lifecycle ----------------
+    @staticmethod
+    def closeall():
+        """Close every pooled connection (e.g. at shutdown); pools are rebuilt on next use."""
+        with DBPool._lock:
+            entries, DBPool._pools = list(DBPool._pools.values()), {}
+            DBPool._last_used.clear()
+        for entry in entries:
+            entry["pool"].closeall()
+
+    # ---------------- Metrics ----------------
+    @staticmethod
+    def stats() -> dict:
+        """Per database ("user@host:port/dbname"): open/in-use/idle connections and counters."""
+        with DBPool._lock:
+            out = {}
+            for key, entry in DBPool._pools.items():
+                host, port, user, _, dbname = key
+                pool = entry["pool"]
+                in_use = len(pool._used)
+                out[f"{user}@{host}:{port}/{dbname}"] = {
+                    "open": in_use + len(pool._pool),
+                    "in_use": in_use,
+                    "idle": len(pool._pool),
+                    "max": pool.maxconn,
+                    **entry["stats"],
+                }
+            return out
@@ -0,0 +1,162 @@
+import os
+import hashlib
+import shutil
+import threading
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from logger import pipeline_logger, validation_logger
+
+
+class DiskLRUCache:
+    """
+    Size-bounded, content-addressed file cache on local disk.
+
+    Entries are stored as `<key><suffix>` inside `cache_dir`. A hit refreshes the
+    entry's mtime, and eviction removes the oldest entries once the total size
+    exceeds `max_bytes`, so mtime order is LRU order. The total is tracked in
+    memory (seeded by one directory scan) so a store under budget never scans;
+    other processes sharing the directory are picked up at the next eviction,
+    which re-scans and resets it.
+    """
+
+    def __init__(self, cache_dir, max_bytes: int, suffix: str = "", name: str = "cache"):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._bytes = None   # running size of the cache dir; None until first scanned
+
+    # ---------------- Keys ----------------
+    @staticmethod
+    def make_key(*parts) -> str:
+        """SHA-256 over the given parts (str or bytes), separated so boundaries can't collide."""
+        digest = hashlib.sha256()
+        for part in parts:
+            if not isinstance(part, bytes):
+                part = str(part).encode("utf-8")
+            digest.update(len(part).to_bytes(8, "big"))
+            digest.update(part)
+        return digest.hexdigest()
+
+    def path_for(self, key: str) -> Path:
+        return self.cache_dir / f"{key}{self.suffix}"
+
+    # ---------------- Lookup ----------------
+    def get(self, key: str):
+        """Return the cached file path for `key`, or None on a miss."""
+        path = self.path_for(key)
+        try:
+            os.utime(path)  # refresh LRU position
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return path
+
+    # ---------------- Store ----------------
+    def put(self, key: str, src_path) -> Path:
+        """Copy `src_path` into the cache under `key` (atomic replace) and evict if over budget."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        with NamedTemporaryFile(dir=self.cache_dir, delete=False, suffix=".tmp") as tmp:
+            tmp_path = tmp.name
+        try:
+            shutil.copyfile(src_path, tmp_path)
+            return self._commit(key, tmp_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def put_bytes(self, key: str, data: bytes) -> Path:
+        """Store raw bytes in the cache under `key`."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        with NamedTemporaryFile(dir=self.cache_dir, delete=False, suffix=".tmp") as tmp:
+            tmp.write(data)
+            tmp_path = tmp.name
+        try:
+            return self._commit(key, tmp_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _commit(self, key: str, tmp_path) -> Path:
+        path = self.path_for(key)
+        added = os.path.getsize(tmp_path)
+        try:
+            added -= os.path.getsize(path)   # replacing an existing entry
+        except OSError:
+            pass
+        os.replace(tmp_path, path)
+        with self._lock:
+            if self._bytes is not None:
+                self._bytes += added
+        self.evict()
+        return path
+
+    # ---------------- Eviction ----------------
+    def _entries(self):
+        entries = []
+        if not self.cache_dir.exists():
+            return entries
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_file() and entry.name.endswith(self.suffix) and not entry.name.endswith(".tmp"):
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, entry.path))
+        return entries
+
+    def evict(self):
+        """Remove least-recently-used entries until the cache fits in `max_bytes`."""
+        with self._lock:
+            if self._bytes is not None and self._bytes <= self.max_bytes:
+                return 0
+
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        if total <= self.max_bytes:
+            with self._lock:
+                self._bytes = total
+            return 0
+
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+                removed += 1
+            except OSError as e:
+                validation_logger.warning(f"⚠️ Could not evict {path} from {self.name}: {e}")
+
+        with self._lock:
+            self._bytes = total
+        pipeline_logger.info(f"🧹 {self.name}: evicted {removed} entr(ies), {total} bytes kept")
+        return removed
+
+    # ---------------- Metrics ----------------
+    def add_counts(self, hits: int = 0, misses: int = 0):
+        """Fold in lookups counted elsewhere (e.g. by worker processes sharing the directory)."""
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+
+    def stats(self) -> dict:
+        entries = self._entries()
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+            "entries": len(entries),
+            "bytes": sum(size for _, size, _ in entries),
+        }
@@ -1,6 +1,6 @@
-import psycopg2
 from psycopg2.extras import execute_values
 from logger import pipeline_logger
+from db_pool import DBPool
 
 # Your Postgres credentials (replace with your env vars or config)
 POSTGRES = {
@@ -24,20 +24,19 @@ class PostgresErrorHandler(logging.Handler):
             msg = self.format(record)
             part_name = getattr(record, "part_name", "unknown_part")
 
-            conn = psycopg2.connect(**self.db_config)
-            cur = conn.cursor()
+            with DBPool.connection(self.db_config) as conn:
+                cur = conn.cursor()
 
-            cur.execute(
-                """
-                INSERT INTO error_logs (log_type, part_name, error_details)
-                VALUES (%s, %s, %s)
-                """,
-                (self.log_type, part_name, msg)
-            )
+                cur.execute(
+                    """
+                    INSERT INTO error_logs (log_type, part_name, error_details)
+                    VALUES (%s, %s, %s)
+                    """,
+                    (self.log_type, part_name, msg)
+                )
 
-            conn.commit()
-            cur.close()
-            conn.close()
+                conn.commit()
+                cur.close()
 
         except Exception as e:
             print(f"⚠️ Failed to log error to Postgres: {e}")
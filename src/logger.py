@@ -1,8 +1,15 @@
 import os
+import time
+import queue
+import atexit
 import logging
+import threading
+from logging.handlers import QueueHandler
 from datetime import datetime
-import psycopg2
+from psycopg2.extras import execute_values
 from config import Settings
+from db_pool import DBPool
+from migrations import Migrations
 
 # ---------------- CONFIG ----------------
 LOG_LEVEL = "ERROR"
@@ -71,87 +78,166 @@ class PostgresErrorHandler(logging.Handler):
     """
     Logs full ERROR blocks (STDERR, STDOUT, Tracebacks, etc.)
     into the PostgreSQL 'exceptions' table.
+
+    Loggers don't call this directly: records reach it in batches through
+    PostgresLogListener, so the DB insert never runs in the logging thread.
     """
 
     def __init__(self, log_type, db_config):
         super().__init__(level=logging.ERROR)
         self.log_type = log_type
         self.db_config = db_config
-        self._ensure_table_exists()
-
-    def _connect(self):
-        return psycopg2.connect(
-            host=self.db_config["host"],
-            port=self.db_config["port"],
-            user=self.db_config["user"],
-            password=self.db_config["password"],
-            dbname=self.db_config["dbname"],
-        )
-
-    def _ensure_table_exists(self):
-        """Creates the table if missing."""
-        try:
-            conn = self._connect()
-            cur = conn.cursor()
-            cur.execute("""
-                CREATE TABLE IF NOT EXISTS exceptions (
-                    id SERIAL PRIMARY KEY,
-                    log_type VARCHAR(50) NOT NULL,
-                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    part_name VARCHAR(255),
-                    error_summary TEXT,
-                    error_details TEXT NOT NULL
-                );
-            """)
-            conn.commit()
-            cur.close()
-            conn.close()
-        except Exception as e:
-            print(f"⚠️ Failed to ensure 'exceptions' table exists: {e}")
 
     def emit(self, record):
         """Insert a new full log record."""
-        try:
-            # Get full formatted message (entire block)
-            full_message = self.format(record) if self.formatter else record.getMessage()
-            part_name = getattr(record, "part_name", None)
+        self.emit_batch([record])
 
-            # Extract short summary (first line or first sentence)
-            lines = full_message.strip().splitlines()
-            error_summary = lines[0].strip() if lines else "Unknown Error"
+    def emit_batch(self, records):
+        """Insert many log records with one multi-row INSERT."""
+        try:
+            rows = []
+            for record in records:
+                # Get full formatted message (entire block)
+                full_message = self.format(record) if self.formatter else record.getMessage()
+                part_name = getattr(record, "part_name", None)
 
-            conn = self._connect()
-            cur = conn.cursor()
+                # Extract short summary (first line or first sentence)
+                lines = full_message.strip().splitlines()
+                error_summary = lines[0].strip() if lines else "Unknown Error"
+                rows.append((getattr(record, "log_type", self.log_type), part_name, error_summary, full_message))
 
             insert_sql = """
                 INSERT INTO exceptions (log_type, part_name, error_summary, error_details)
-                VALUES (%s, %s, %s, %s);
+                VALUES %s;
             """
-            cur.execute(insert_sql, (self.log_type, part_name, error_summary, full_message))
-
-            conn.commit()
-            cur.close()
-            conn.close()
+            # The 'exceptions' table comes from the schema migration, not from DDL here
+            Migrations.ensure(self.db_config)
+            with DBPool.connection(self.db_config) as conn:
+                cur = conn.cursor()
+                execute_values(cur, insert_sql, rows)
+                conn.commit()
+                cur.close()
 
         except Exception as e:
-            print(f"⚠️ Failed to log error to Postgres: {e}")
+            print(f"⚠️ Failed to log {len(records)} error(s) to Postgres: {e}")
+
+
+class BufferedQueueHandler(QueueHandler):
+    """
+    Formats an ERROR record and puts it on the shared DB log buffer without
+    blocking; when the buffer is full the record is dropped (and counted).
+    The file handlers still receive every record.
+    """
+
+    dropped = 0
+
+    def __init__(self, buffer, log_type):
+        super().__init__(buffer)
+        self.log_type = log_type
+
+    def prepare(self, record):
+        record = super().prepare(record)
+        record.log_type = self.log_type
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            BufferedQueueHandler.dropped += 1
+
+
+class PostgresLogListener:
+    """
+    Background thread that drains the DB log buffer into PostgresErrorHandler.
+
+    Records are collected for up to LOG_DB_FLUSH_INTERVAL_MS (or until
+    LOG_DB_BATCH_SIZE are waiting) and written with one INSERT. `stop` writes
+    whatever is buffered before returning; it runs at interpreter exit.
+    """
+
+    _STOP = object()
+
+    def __init__(self, buffer, handler):
+        self.buffer = buffer
+        self.handler = handler
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="postgres_log_writer", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            batch = [self.buffer.get()]
+            deadline = time.monotonic() + Settings.LOG_DB_FLUSH_INTERVAL_MS / 1000
+            while batch[-1] is not self._STOP and len(batch) < Settings.LOG_DB_BATCH_SIZE:
+                try:
+                    batch.append(self.buffer.get(timeout=max(0.0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+
+            stop = batch[-1] is self._STOP
+            records = batch[:-1] if stop else batch
+            try:
+                if records:
+                    self.handler.emit_batch(records)
+            finally:
+                for _ in batch:
+                    self.buffer.task_done()
+            if stop:
+                return
+
+    def flush(self, timeout=None) -> bool:
+        """Wait until every buffered record has been written (or its batch failed); False on timeout."""
+        with self.buffer.all_tasks_done:
+            if self._thread is None:
+                # Nothing is draining the buffer, so waiting could never succeed
+                return not self.buffer.unfinished_tasks
+            return self.buffer.all_tasks_done.wait_for(lambda: not self.buffer.unfinished_tasks, timeout)
+
+    def stop(self, timeout=None):
+        """Write what is buffered, then end the thread."""
+        if self._thread is None:
+            return
+        try:
+            self.buffer.put(self._STOP, timeout=timeout)
+        except queue.Full:
+            return
+        self._thread.join(timeout)
+        self._thread = None
+
+
+# One buffer + writer thread per process, shared by both loggers
+postgres_log_buffer = queue.Queue(maxsize=Settings.LOG_DB_QUEUE_MAX)
+postgres_log_listener = PostgresLogListener(postgres_log_buffer, PostgresErrorHandler("pipeline", POSTGRES))
+
+
+def flush_postgres_logs(timeout=None) -> bool:
+    """Block until buffered ERROR records are in the DB (e.g. before a worker process exits)."""
+    return postgres_log_listener.flush(timeout)
+
 
 # ---------------- ATTACH HANDLERS ----------------
 def add_postgres_handlers():
     global pipeline_logger, validation_logger
-    if not any(isinstance(h, PostgresErrorHandler) for h in pipeline_logger.handlers):
-        pg_pipeline_handler = PostgresErrorHandler("pipeline", POSTGRES)
+    if not any(isinstance(h, BufferedQueueHandler) for h in pipeline_logger.handlers):
+        pg_pipeline_handler = BufferedQueueHandler(postgres_log_buffer, "pipeline")
         pg_pipeline_handler.setLevel(logging.ERROR)
         pg_pipeline_handler.setFormatter(formatter)
         pipeline_logger.addHandler(pg_pipeline_handler)
 
-    if not any(isinstance(h, PostgresErrorHandler) for h in validation_logger.handlers):
-        pg_validation_handler = PostgresErrorHandler("validation", POSTGRES)
+    if not any(isinstance(h, BufferedQueueHandler) for h in validation_logger.handlers):
+        pg_validation_handler = BufferedQueueHandler(postgres_log_buffer, "validation")
         pg_validation_handler.setLevel(logging.ERROR)
         pg_validation_handler.setFormatter(formatter)
         validation_logger.addHandler(pg_validation_handler)
 
+    postgres_log_listener.start()
+
 add_postgres_handlers()
+atexit.register(postgres_log_listener.stop, timeout=Settings.LOG_DB_FLUSH_INTERVAL_MS / 1000 + 5)
 
 # ---------------- TEST ----------------
 if __name__ == "__main__":
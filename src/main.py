@@ -2,16 +2,19 @@ import asyncio
 from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from config import Settings
-from merger_factory import MergerFactory
+from merger_factory import MergerFactory, StreamingMerger
+from media_handle import MediaHandle
 from parsers.base_handler import InputHandlerFactory
 from file_fetcher_factory import FileFetcherFactory
 from processor.process_factory import ProcessFactory
+from processor.audio_stage import AudioStage
 from saver_factory import SaverFactory
 from table_gen import Table_gen
 from logger import pipeline_logger, validation_logger
-from Artifacts.artifacts import run_script_data_process
+from Artifacts.artifacts import load_script_data, run_script_data_process
 from Transaction.transaction_handler import transaction
 from Transaction.excepetion import exception
+from Transaction.status_writer import StatusWriter
 import traceback
 from video_pipeline.drive_utils import upload_folder_to_drive
 from shutil import copy2
@@ -44,26 +47,59 @@ def prepare_files(run_from: str, generate_new_files: bool, file_types, unique_id
 
 # --- Core pipeline ---
 async def process_pipeline(generated_files, video: str, audio: str, run_from: str,unique_id:str):
+    audio_bytes_list = []
+    final_video_bytes = None
+    streaming_merger = None
     try:
+        # Streaming mode: mux each scene as soon as both halves exist, overlapping with rendering
+        streaming_merger = StreamingMerger(unique_id) if Settings.STREAMING_MERGE else None
+
         with ThreadPoolExecutor() as executor:
-            video_callable = ProcessFactory.get_processor(video, generated_files[0], unique_id)
+            video_callable = ProcessFactory.get_processor(
+                video, generated_files[0], unique_id,
+                on_scene=streaming_merger.add_video if streaming_merger else None,
+            )
             pipeline_logger.info(f"video callable prepared for: {generated_files[1]}")
-            audio_callable = ProcessFactory.get_processor(audio, generated_files[0], unique_id)
+            # Streaming audio: each narration reaches the merger as soon as its last chunk is encoded
+            stream_audio = streaming_merger if Settings.STREAMING_AUDIO else None
+            audio_callable = ProcessFactory.get_processor(
+                audio, generated_files[0], unique_id,
+                on_scene=stream_audio.add_audio if stream_audio else None,
+            )
+            # Prefer narration already synthesized during /generate-files-api
+            audio_callable = AudioStage.claim(audio_callable, unique_id, generated_files[0].get("txt_files", []))
+
+            def audio_job():
+                # Spill each narration to a temp file once; later stages only pass paths around
+                audio_list = [
+                    a if isinstance(a, MediaHandle) else MediaHandle.from_bytes(a, ".mp3")
+                    for a in audio_callable()
+                ]
+                if streaming_merger:
+                    streaming_merger.add_audio_list(audio_list)
+                return audio_list
 
             video_task = asyncio.create_task(run_in_executor(executor, video_callable))
-            audio_task = asyncio.create_task(run_in_executor(executor, audio_callable))
+            audio_task = asyncio.create_task(run_in_executor(executor, audio_job))
             video_bytes_list, audio_bytes_list = await asyncio.gather(video_task, audio_task)
+        # Stage boundary: render/TTS status rows are in the DB before saving starts
+        StatusWriter.flush(timeout=Settings.STATUS_QUEUE_BLOCK_SECONDS)
         print("generated_files",generated_files)
 
         # ✅ Only pass the dict part (generated_files[0])
         PathList = SaverFactory.save_all_script_media(video_bytes_list, audio_bytes_list, generated_files)
         print("PathList =>", PathList)
 
-        Table_gen.table_generator(generated_files, PathList,)
+        # Scripts and narrations are read once and shared by both DB writers
+        script_data = load_script_data(unique_id, generated_files[1])
+        Table_gen.table_generator(generated_files, PathList, script_data["narrations"] if script_data else None)
 
 
         # --- Merge final video/audio ---
-        final_video_bytes = MergerFactory.merge_all_videos_with_audio(video_bytes_list, audio_bytes_list,unique_id)
+        if streaming_merger:
+            final_video_bytes = streaming_merger.finish(len(video_bytes_list), len(audio_bytes_list))
+        else:
+            final_video_bytes = MergerFactory.merge_all_videos_with_audio(video_bytes_list, audio_bytes_list,unique_id)
         
         
 
@@ -74,7 +110,8 @@ async def process_pipeline(generated_files, video: str, audio: str, run_from: st
             video_bytes=final_video_bytes,
             filename=filename,
             save_to=run_from,
-            db_credentials=Settings.POSTGRES if run_from == "postgres" else None
+            # POSTGRES["table"] holds Table_gen's rows; final videos have their own table
+            db_credentials={**Settings.POSTGRES, "table": Settings.FINAL_VIDEO_TABLE} if run_from == "postgres" else None
         )
 
         folder_path = latest_input_folder(Settings.TEMP_GENERATED_FOLDER, unique_id)
@@ -87,7 +124,7 @@ async def process_pipeline(generated_files, video: str, audio: str, run_from: st
         ) 
 
         print("mainUid",unique_id )
-        run_script_data_process(unique_id)
+        run_script_data_process(unique_id, script_data)
 
         pipeline_logger.info(f"🎉 Final video saved at: {output_path}")
         return output_path
@@ -112,6 +149,17 @@ async def process_pipeline(generated_files, video: str, audio: str, run_from: st
 
         raise   # rethrow to let caller know failure occurred
 
+    finally:
+        # Stop the mux pool and drop per-scene muxes if the run failed before `finish`
+        if streaming_merger:
+            streaming_merger.close()
+        # Temp narration / merge output that no saver took ownership of
+        for handle in list(audio_bytes_list) + [final_video_bytes]:
+            if isinstance(handle, MediaHandle):
+                handle.release()
+        # The run's final merge/video statuses are written before the caller sees the result
+        StatusWriter.flush(timeout=Settings.STATUS_QUEUE_BLOCK_SECONDS)
+
 
 async def main():
     generated_files = prepare_files(Settings.RUN_FROM, Settings.GENERATE_NEW_FILES, Settings.FILE_TYPES,)
@@ -0,0 +1,196 @@
+import os
+import re
+import shutil
+import subprocess
+from dataclasses import dataclass
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import Optional
+import numpy as np
+
+
+def probe_media(path):
+    """
+    Read duration and stream parameters from `ffmpeg -i` output.
+
+    Returns {"duration": seconds or None, "video": (codec, pix_fmt, width,
+    height, fps) or None, "audio": (codec, sample_rate, layout) or None}.
+    Only ffmpeg itself is required (no ffprobe).
+    """
+    result = subprocess.run(
+        ["ffmpeg", "-hide_banner", "-i", str(path)],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+    )
+    info = result.stderr.decode(errors="replace")
+
+    duration = None
+    match = re.search(r"Duration: (\d+):(\d+):(\d+(?:\.\d+)?)", info)
+    if match:
+        h, m, sec = match.groups()
+        duration = int(h) * 3600 + int(m) * 60 + float(sec)
+
+    video = None
+    match = re.search(
+        r"Video: (\w+).*?, (\w+)(?:\([^)]*\))?, (\d+)x(\d+).*?, ([\d.]+k?) (?:fps|tbr)", info
+    )
+    if match:
+        codec, pix_fmt, width, height, fps = match.groups()
+        video = (codec, pix_fmt, int(width), int(height), fps)
+
+    audio = None
+    match = re.search(r"Audio: (\w+).*?, (\d+) Hz, ([^,]+)", info)
+    if match:
+        codec, sample_rate, layout = match.groups()
+        audio = (codec, int(sample_rate), layout.strip())
+
+    return {"duration": duration, "video": video, "audio": audio}
+
+
+@dataclass
+class MediaHandle:
+    """
+    A media file on disk plus the metadata later stages need.
+
+    Rendering, merging, saving and uploading pass handles instead of `bytes`,
+    so a lesson's videos are never held in Python memory. `owned` marks temp
+    files produced by the pipeline itself, which are deleted with `release`
+    once consumed; files owned by someone else (render caches, media dirs) are
+    only ever read, linked or copied. Audio backends fill duration, codec,
+    sample rate and channels at synthesis time, so consumers need not probe.
+    """
+
+    path: Path
+    duration: Optional[float] = None
+    codec: Optional[str] = None
+    size: int = 0
+    owned: bool = False
+    sample_rate: Optional[int] = None
+    channels: Optional[int] = None
+
+    def __post_init__(self):
+        self.path = Path(self.path)
+        if not self.size and self.path.exists():
+            self.size = self.path.stat().st_size
+
+    @classmethod
+    def from_path(cls, path, owned: bool = False, probe: bool = False) -> "MediaHandle":
+        """Wrap an existing file (raises FileNotFoundError if it is missing)."""
+        path = Path(path)
+        handle = cls(path, size=path.stat().st_size, owned=owned)
+        if probe:
+            handle.probe()
+        return handle
+
+    @classmethod
+    def from_bytes(cls, data: bytes, suffix: str = "", **metadata) -> "MediaHandle":
+        """Spill in-memory media to an owned temp file (metadata: duration, codec, ...)."""
+        with NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
+            tmp.write(data)
+        return cls(Path(tmp.name), size=len(data), owned=True, **metadata)
+
+    def probe(self) -> "MediaHandle":
+        """Fill duration, codec and audio format from the file (video codec if present, else audio)."""
+        info = probe_media(self.path)
+        self.duration = info["duration"]
+        stream = info["video"] or info["audio"]
+        self.codec = stream[0] if stream else None
+        if info["audio"]:
+            _, self.sample_rate, layout = info["audio"]
+            self.channels = {"mono": 1, "stereo": 2}.get(layout)
+        return self
+
+    @property
+    def audio_format(self):
+        """(codec, sample_rate, channels) when all are known, else None."""
+        if self.codec and self.sample_rate and self.channels:
+            return self.codec, self.sample_rate, self.channels
+        return None
+
+    def read_bytes(self) -> bytes:
+        """Only for sinks that genuinely need bytes (e.g. BYTEA columns)."""
+        return self.path.read_bytes()
+
+    def copy_to(self, dest) -> Path:
+        """
+        Place a copy of the file at `dest`: hard-linked where possible (free),
+        copied otherwise. The handle keeps pointing at the original, which other
+        stages may still be reading; owned originals are removed by `release`.
+        """
+        dest = Path(dest)
+        if dest.exists():
+            os.remove(dest)
+        try:
+            os.link(self.path, dest)
+        except OSError:
+            shutil.copyfile(self.path, dest)
+        return dest
+
+    def release(self):
+        """Delete the file if it is a pipeline temp file."""
+        if self.owned and self.path.exists():
+            os.remove(self.path)
+
+
+class PCMStreamWriter:
+    """
+    Encodes PCM to an audio file by piping it into ffmpeg's stdin as it is produced.
+
+    TTS backends write each chunk the moment it is synthesized, so encoding
+    overlaps synthesis and a narration is never held in memory as a whole.
+    `close` returns an owned MediaHandle for the finished file.
+    """
+
+    def __init__(self, sample_rate: int, channels: int = 1, suffix: str = ".m4a",
+                 codec_args=("-c:a", "aac", "-b:a", "192k")):
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.samples = 0
+        codec_args = list(codec_args)
+
+        def option(flag, default):
+            return codec_args[codec_args.index(flag) + 1] if flag in codec_args else default
+
+        # Output format, for the metadata on the finished handle
+        self.codec = option("-c:a", None)
+        self.out_sample_rate = int(option("-ar", sample_rate))
+        self.out_channels = int(option("-ac", channels))
+        with NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
+            self.path = Path(tmp.name)
+        self._proc = subprocess.Popen(
+            [
+                "ffmpeg", "-y", "-loglevel", "error",
+                "-f", "s16le", "-ar", str(sample_rate), "-ac", str(channels), "-i", "pipe:0",
+                *codec_args, str(self.path),
+            ],
+            stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+        )
+
+    def write(self, samples):
+        """Append float (-1..1) or int16 samples (interleaved if multi-channel)."""
+        samples = np.asarray(samples)
+        if samples.dtype != np.int16:
+            samples = (np.clip(samples, -1.0, 1.0) * 32767).astype(np.int16)
+        self._proc.stdin.write(samples.tobytes())
+        self.samples += samples.size // self.channels
+
+    def write_silence(self, ms: int):
+        if ms > 0:
+            self.write(np.zeros(int(self.sample_rate * ms / 1000) * self.channels, dtype=np.int16))
+
+    def close(self) -> MediaHandle:
+        """Finish encoding; raises RuntimeError (and removes the file) if ffmpeg failed."""
+        self._proc.stdin.close()
+        stderr = self._proc.stderr.read().decode(errors="replace")
+        if self._proc.wait() != 0:
+            self.path.unlink(missing_ok=True)
+            raise RuntimeError(f"ffmpeg audio encode failed: {stderr.strip()}")
+        return MediaHandle(
+            self.path, duration=self.samples / self.sample_rate, codec=self.codec, owned=True,
+            sample_rate=self.out_sample_rate, channels=self.out_channels,
+        )
+
+    def abort(self):
+        """Stop ffmpeg and discard the partial file."""
+        self._proc.kill()
+        self._proc.wait()
+        self.path.unlink(missing_ok=True)
@@ -1,8 +1,13 @@
 import os
+import time
 from pathlib import Path
 from tempfile import NamedTemporaryFile
 import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from config import Settings
+from media_handle import MediaHandle, probe_media
+from processor.audio_utils import delivery_codec_args
 from logger import pipeline_logger, validation_logger
 from Transaction.transaction_handler import transaction
 from Transaction.excepetion import exception
@@ -17,16 +22,15 @@ class MergerFactory:
     # ---------------- Debugging Mode ----------------
     @staticmethod
     def merge_video_with_audio_debug(video_bytes, audio_bytes, idx=1, unique_id=None):
-        """Debug version — merges a single video/audio pair and returns bytes."""
+        """Debug version — merges a single video/audio pair (bytes or MediaHandle) and returns the same kind."""
         pipeline_logger.debug("🧩 merge_video_with_audio called in debugging mode")
-        v_temp_path = a_temp_path = out_temp_path = None
+        temp_paths, out_temp_path = [], None
+        as_handle = isinstance(video_bytes, MediaHandle)
         try:
-            with NamedTemporaryFile(delete=False, suffix=".mp4") as v_temp, \
-                 NamedTemporaryFile(delete=False, suffix=".mp3") as a_temp, \
-                 NamedTemporaryFile(delete=False, suffix=".mp4") as out_temp:
-                v_temp.write(video_bytes)
-                a_temp.write(audio_bytes)
-                v_temp_path, a_temp_path, out_temp_path = v_temp.name, a_temp.name, out_temp.name
+            v_temp_path = MergerFactory._input_path(video_bytes, ".mp4", temp_paths)
+            a_temp_path = MergerFactory._input_path(audio_bytes, ".mp3", temp_paths)
+            with NamedTemporaryFile(delete=False, suffix=".mp4") as out_temp:
+                out_temp_path = out_temp.name
 
             ffmpeg_cmd = [
                 "ffmpeg", "-y",
@@ -48,10 +52,11 @@ class MergerFactory:
                     transaction(unique_id, merge_status="Merge failed during debugging")
                 return None
 
-            with open(out_temp_path, "rb") as f:
-                merged_bytes = f.read()
+            merged_bytes = MergerFactory._output(out_temp_path, as_handle)
+            if as_handle:
+                out_temp_path = None
 
-            pipeline_logger.info(f"✅ Merged video {idx} returned as bytes (debug mode)")
+            pipeline_logger.info(f"✅ Merged video {idx} returned (debug mode)")
             if unique_id:
                 print("uidHello2")
                 transaction(unique_id, merge_status="Merge completed successfully (debug mode)")
@@ -59,27 +64,104 @@ class MergerFactory:
             return merged_bytes
 
         finally:
-            for path in [v_temp_path, a_temp_path, out_temp_path]:
+            for path in temp_paths + [out_temp_path]:
                 if path and os.path.exists(path):
                     os.remove(path)
 
+    # ---------------- Media I/O ----------------
+    @staticmethod
+    def _input_path(media, suffix, temp_paths):
+        """Path ffmpeg can read for a bytes-or-MediaHandle input; bytes are spilled to a tracked temp file."""
+        if isinstance(media, MediaHandle):
+            return str(media.path)
+        with NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
+            tmp.write(media)
+        temp_paths.append(tmp.name)
+        return tmp.name
+
+    @staticmethod
+    def _output(out_path, as_handle):
+        """ffmpeg output as an owned MediaHandle (path in, path out) or as bytes for bytes callers."""
+        if as_handle:
+            return MediaHandle.from_path(out_path, owned=True)
+        with open(out_path, "rb") as f:
+            return f.read()
+
+    @staticmethod
+    def _release(items, keep=None):
+        """Delete intermediate temp files (owned handles), except `keep`."""
+        for item in items:
+            if isinstance(item, MediaHandle) and item is not keep:
+                item.release()
+
+    # ---------------- Stream Probing ----------------
+    @staticmethod
+    def _probe_stream(path):
+        """Duration and stream parameters of a media file (see media_handle.probe_media)."""
+        return probe_media(path)
+
+    @staticmethod
+    def _audio_stream(audio):
+        """
+        (duration, (codec, sample_rate, channels)) of a narration. Synthesized
+        MediaHandles carry both from the TTS backend; anything else is probed.
+        """
+        if isinstance(audio, MediaHandle):
+            if audio.duration and audio.audio_format:
+                return audio.duration, audio.audio_format
+            audio = audio.path
+        probe = MergerFactory._probe_stream(audio)
+        if not probe["audio"]:
+            return probe["duration"], None
+        codec, sample_rate, layout = probe["audio"]
+        return probe["duration"], (codec, sample_rate, {"mono": 1, "stereo": 2}.get(layout))
+
+    @staticmethod
+    def _audio_copyable(video_path, audio):
+        """
+        True when the narration (path or MediaHandle) is already delivery AAC
+        (rate/layout from Settings) and covers the whole scene, so muxing can
+        stream-copy it instead of re-encoding with apad.
+        """
+        if Settings.AUDIO_OUTPUT_FORMAT != "aac":
+            return False
+        duration, audio_format = MergerFactory._audio_stream(audio)
+        if audio_format != ("aac", Settings.AUDIO_SAMPLE_RATE, Settings.AUDIO_CHANNELS) or not duration:
+            return False
+        video = MergerFactory._probe_stream(video_path)
+        # Shorter narrations still need padding (a copied track can't be extended)
+        return bool(video["duration"]) and duration >= video["duration"] - 0.05
+
+    @staticmethod
+    def _streams_uniform(paths):
+        """True when every file has a video stream and all share video + audio parameters."""
+        probes = [MergerFactory._probe_stream(p) for p in paths]
+        if any(probe["video"] is None for probe in probes):
+            return False
+        return len({(probe["video"], probe["audio"]) for probe in probes}) == 1
+
     @staticmethod
     def concatenate_videos(video_bytes_list):
-        """Concatenate multiple videos (as bytes) and return the final combined video bytes."""
+        """
+        Concatenate multiple videos and return the combined video.
+
+        Items may be bytes or MediaHandles; handle inputs are read in place and
+        produce an owned MediaHandle, bytes inputs produce bytes.
+        """
         if not video_bytes_list:
             validation_logger.warning("⚠️ No videos to concatenate.")
             return None
 
         if len(video_bytes_list) == 1:
-            pipeline_logger.info("🎬 Single video returned as bytes (no concatenation needed)")
+            pipeline_logger.info("🎬 Single video returned as is (no concatenation needed)")
             return video_bytes_list[0]
 
-        temp_video_paths, list_file_path, final_output_path = [], None, None
+        as_handle = any(isinstance(v, MediaHandle) for v in video_bytes_list)
+        temp_paths, list_file_path, final_output_path = [], None, None
         try:
-            for idx, v_bytes in enumerate(video_bytes_list, 1):
-                with NamedTemporaryFile(delete=False, suffix=".mp4") as v_temp:
-                    v_temp.write(v_bytes)
-                    temp_video_paths.append(Path(v_temp.name))
+            temp_video_paths = [
+                Path(MergerFactory._input_path(v, ".mp4", temp_paths)) for v in video_bytes_list
+            ]
 
             # Write concat list
             with NamedTemporaryFile(delete=False, mode="w", encoding="utf-8") as list_file:
@@ -90,39 +172,102 @@ class MergerFactory:
             with NamedTemporaryFile(delete=False, suffix=".mp4") as final_temp:
                 final_output_path = final_temp.name
 
-            ffmpeg_concat_cmd = [
-                "ffmpeg", "-y",
-                "-f", "concat",
-                "-safe", "0",
-                "-i", list_file_path,
+            concat_input = ["ffmpeg", "-y", "-f", "concat", "-safe", "0", "-i", list_file_path]
+            reencode_cmd = concat_input + [
                 "-c:v", "libx264",
-                "-c:a", "aac",
-                "-b:a", "192k",
+                *delivery_codec_args(),
                 "-pix_fmt", "yuv420p",
                 final_output_path
             ]
 
-            result = subprocess.run(ffmpeg_concat_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            # Scenes from one quality preset share their encoding: remux instead of re-encoding
+            result = None
+            if MergerFactory._streams_uniform(temp_video_paths):
+                pipeline_logger.info("🎬 Uniform scene encodings, concatenating with stream copy")
+                result = subprocess.run(
+                    concat_input + ["-c", "copy", final_output_path],
+                    stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                )
+                if result.returncode != 0:
+                    validation_logger.warning(
+                        f"⚠️ Stream-copy concat failed, re-encoding instead:\n{result.stderr.decode()}"
+                    )
+                    result = None
+
+            if result is None:
+                result = subprocess.run(reencode_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
             if result.returncode != 0:
                 validation_logger.error(f"❌ Error concatenating videos:\n{result.stderr.decode()}")
                 return None
 
-            with open(final_output_path, "rb") as f:
-                final_bytes = f.read()
+            final_bytes = MergerFactory._output(final_output_path, as_handle)
+            if as_handle:
+                final_output_path = None
 
-            pipeline_logger.info("🎬 Final concatenated MP4 video returned as bytes")
+            pipeline_logger.info("🎬 Final concatenated MP4 video returned")
             return final_bytes
 
         finally:
-            for path in temp_video_paths + [list_file_path, final_output_path]:
-                if path and path is not None and os.path.exists(path):
+            for path in temp_paths + [list_file_path, final_output_path]:
+                if path and os.path.exists(path):
                     os.remove(path)
 
     # ---------------- Production Mode ----------------
+    @staticmethod
+    def mux_pair(video_bytes, audio_bytes, pair_idx=1):
+        """
+        Mux one scene's video and narration; returns None on ffmpeg failure.
+
+        Inputs may be bytes or MediaHandles; a MediaHandle video yields an owned
+        MediaHandle, a bytes video yields bytes.
+        """
+        temp_paths, out_temp_path = [], None
+        as_handle = isinstance(video_bytes, MediaHandle)
+        try:
+            v_temp_path = MergerFactory._input_path(video_bytes, ".mp4", temp_paths)
+            a_temp_path = MergerFactory._input_path(audio_bytes, ".mp3", temp_paths)
+            with NamedTemporaryFile(delete=False, suffix=".mp4") as out_temp:
+                out_temp_path = out_temp.name
+
+            audio = audio_bytes if isinstance(audio_bytes, MediaHandle) else a_temp_path
+            if MergerFactory._audio_copyable(v_temp_path, audio):
+                audio_args = ["-c:a", "copy"]
+            else:
+                # Re-encode to the delivery rate/layout so every scene concatenates with stream copy
+                audio_args = [*delivery_codec_args(), "-af", "apad"]
+
+            ffmpeg_cmd = [
+                "ffmpeg", "-y",
+                "-i", v_temp_path,
+                "-i", a_temp_path,
+                "-c:v", "copy",
+                *audio_args,
+                "-shortest",
+                out_temp_path
+            ]
+
+            result = subprocess.run(ffmpeg_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            if result.returncode != 0:
+                validation_logger.error(f"❌ Error merging video {pair_idx}:\n{result.stderr.decode()}")
+                return None
+
+            merged_bytes = MergerFactory._output(out_temp_path, as_handle)
+            if as_handle:
+                out_temp_path = None
+
+            pipeline_logger.info(f"✅ Merged video {pair_idx} successfully")
+            return merged_bytes
+
+        finally:
+            for path in temp_paths + [out_temp_path]:
+                if path and os.path.exists(path):
+                    os.remove(path)
+
     @staticmethod
     def merge_video_with_audio(video_bytes_list, audio_bytes_list, unique_id, idx=1):
         """
-        Merge one or multiple video/audio pairs and return final merged video as bytes.
+        Merge one or multiple video/audio pairs and return the final merged video
+        (bytes, or an owned MediaHandle when given MediaHandles).
         Updates `merge_status` in transaction table.
         """
         if len(video_bytes_list) != len(audio_bytes_list):
@@ -136,41 +281,9 @@ class MergerFactory:
         merged_videos_bytes = []
 
         for pair_idx, (video_bytes, audio_bytes) in enumerate(zip(video_bytes_list, audio_bytes_list), 1):
-            v_temp_path = a_temp_path = out_temp_path = None
-            try:
-                with NamedTemporaryFile(delete=False, suffix=".mp4") as v_temp, \
-                     NamedTemporaryFile(delete=False, suffix=".mp3") as a_temp, \
-                     NamedTemporaryFile(delete=False, suffix=".mp4") as out_temp:
-                    v_temp.write(video_bytes)
-                    a_temp.write(audio_bytes)
-                    v_temp_path, a_temp_path, out_temp_path = v_temp.name, a_temp.name, out_temp.name
-
-                ffmpeg_cmd = [
-                    "ffmpeg", "-y",
-                    "-i", v_temp_path,
-                    "-i", a_temp_path,
-                    "-c:v", "copy",
-                    "-c:a", "aac",
-                    "-b:a", "192k",
-                    "-af", "apad",
-                    "-shortest",
-                    out_temp_path
-                ]
-
-                result = subprocess.run(ffmpeg_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-                if result.returncode != 0:
-                    validation_logger.error(f"❌ Error merging video {pair_idx}:\n{result.stderr.decode()}")
-                    continue
-
-                with open(out_temp_path, "rb") as f:
-                    merged_videos_bytes.append(f.read())
-
-                pipeline_logger.info(f"✅ Merged video {pair_idx} successfully")
-
-            finally:
-                for path in [v_temp_path, a_temp_path, out_temp_path]:
-                    if path and os.path.exists(path):
-                        os.remove(path)
+            merged_bytes = MergerFactory.mux_pair(video_bytes, audio_bytes, pair_idx)
+            if merged_bytes:
+                merged_videos_bytes.append(merged_bytes)
 
         if not merged_videos_bytes:
             print("uidHello4")
@@ -179,6 +292,7 @@ class MergerFactory:
 
         # Concatenate all merged videos
         final_bytes = MergerFactory.concatenate_videos(merged_videos_bytes)
+        MergerFactory._release(merged_videos_bytes, keep=final_bytes)
         if final_bytes:
             print("uidHello5")
             transaction(unique_id, merge_status="Final video merged successfully")
@@ -188,6 +302,135 @@ class MergerFactory:
 
         return final_bytes
 
+    # ---------------- Single-pass Mode ----------------
+    @staticmethod
+    def assemble(video_bytes_list, audio_bytes_list, unique_id):
+        """
+        Build the final video from all scene/narration pairs in ONE ffmpeg run.
+
+        Each narration is padded or trimmed to its scene's length (same result as
+        apad + -shortest per pair), and the narrations are concatenated in a single
+        filter graph. When every scene shares codec, pixel format, size and frame
+        rate, video goes through the concat demuxer with stream copy, so frames are
+        never decoded; otherwise the scenes are normalized and encoded once.
+        Accepts bytes or MediaHandles (MediaHandle videos yield an owned MediaHandle).
+        Updates `merge_status` in the transaction table.
+        """
+        if len(video_bytes_list) != len(audio_bytes_list):
+            pipeline_logger.error("❌ Video and audio list length mismatch", extra={"part_name": "MergerFactory"})
+            exception(unique_id, type="Merge", description="Video and audio list length mismatch", module="MergerFactory")
+            transaction(unique_id, merge_status="Final video merge failed (list mismatch)")
+            raise ValueError("Video and audio lists must have the same length")
+
+        if not video_bytes_list:
+            transaction(unique_id, merge_status="Final video merge failed (no output)")
+            return None
+
+        as_handle = isinstance(video_bytes_list[0], MediaHandle)
+        temp_paths, list_file_path, out_temp_path = [], None, None
+        try:
+            video_paths = [Path(MergerFactory._input_path(v, ".mp4", temp_paths)) for v in video_bytes_list]
+            audio_paths = [Path(MergerFactory._input_path(a, ".audio", temp_paths)) for a in audio_bytes_list]
+
+            probes = [MergerFactory._probe_stream(p) for p in video_paths]
+            if any(not probe["duration"] or not probe["video"] for probe in probes):
+                validation_logger.error("❌ Could not probe scene videos for single-pass assembly")
+                transaction(unique_id, merge_status="Final video merge failed (probe error)")
+                return None
+
+            uniform = len({probe["video"] for probe in probes}) == 1
+            n = len(video_paths)
+
+            cmd = ["ffmpeg", "-y"]
+            filters = []
+            if uniform:
+                with NamedTemporaryFile(delete=False, mode="w", encoding="utf-8", suffix=".txt") as list_file:
+                    for video_file in video_paths:
+                        list_file.write(f"file '{video_file.resolve()}'\n")
+                    list_file_path = list_file.name
+                cmd += ["-f", "concat", "-safe", "0", "-i", list_file_path]
+                audio_offset = 1
+            else:
+                for video_file in video_paths:
+                    cmd += ["-i", str(video_file)]
+                audio_offset = n
+                _, _, width, height, fps = probes[0]["video"]
+                for i in range(n):
+                    filters.append(
+                        f"[{i}:v]scale={width}:{height}:force_original_aspect_ratio=decrease,"
+                        f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2,setsar=1,fps={fps},format=yuv420p[v{i}]"
+                    )
+
+            for audio_file in audio_paths:
+                cmd += ["-i", str(audio_file)]
+
+            # Narration lengths come with synthesized handles, so overruns are caught without probing audio
+            for i, (probe, audio) in enumerate(zip(probes, audio_bytes_list), 1):
+                if isinstance(audio, MediaHandle) and audio.duration and audio.duration > probe["duration"] + 0.5:
+                    validation_logger.warning(
+                        f"⚠️ Narration {i} ({audio.duration:.1f}s) is longer than its scene "
+                        f"({probe['duration']:.1f}s); its end will be cut"
+                    )
+
+            # Fit each narration to its scene, then join them
+            for i, probe in enumerate(probes):
+                filters.append(
+                    f"[{audio_offset + i}:a]aformat=sample_fmts=fltp:sample_rates={Settings.AUDIO_SAMPLE_RATE}:"
+                    f"channel_layouts={'mono' if Settings.AUDIO_CHANNELS == 1 else 'stereo'},"
+                    f"apad,atrim=end={probe['duration']:.3f},asetpts=PTS-STARTPTS[a{i}]"
+                )
+
+            if uniform:
+                filters.append("".join(f"[a{i}]" for i in range(n)) + f"concat=n={n}:v=0:a=1[aout]")
+                cmd += ["-filter_complex", ";".join(filters), "-map", "0:v", "-map", "[aout]", "-c:v", "copy"]
+            else:
+                filters.append("".join(f"[v{i}][a{i}]" for i in range(n)) + f"concat=n={n}:v=1:a=1[vout][aout]")
+                cmd += [
+                    "-filter_complex", ";".join(filters), "-map", "[vout]", "-map", "[aout]",
+                    "-c:v", "libx264", "-pix_fmt", "yuv420p",
+                ]
+
+            with NamedTemporaryFile(delete=False, suffix=".mp4") as out_temp:
+                out_temp_path = out_temp.name
+            cmd += ["-c:a", "aac", "-b:a", Settings.AUDIO_BITRATE, "-movflags", "+faststart", out_temp_path]
+
+            pipeline_logger.info(
+                f"🎞️ Single-pass assembly of {n} scene(s) ({'stream copy' if uniform else 're-encode'})"
+            )
+            result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            if result.returncode != 0:
+                validation_logger.error(f"❌ Error in single-pass assembly:\n{result.stderr.decode()}")
+                transaction(unique_id, merge_status="Final video merge failed during assembly")
+                return None
+
+            final_bytes = MergerFactory._output(out_temp_path, as_handle)
+            if as_handle:
+                out_temp_path = None
+
+            transaction(unique_id, merge_status="Final video merged successfully")
+            return final_bytes
+
+        finally:
+            for path in temp_paths + [list_file_path, out_temp_path]:
+                if path and os.path.exists(path):
+                    os.remove(path)
+
+    @staticmethod
+    def benchmark(video_bytes_list, audio_bytes_list, unique_id="benchmark"):
+        """Time the two-stage merge against single-pass assembly on the same inputs (seconds)."""
+        timings = {}
+        for mode, merge in (
+            ("two_stage", MergerFactory.merge_video_with_audio),
+            ("single_pass", MergerFactory.assemble),
+        ):
+            start = time.perf_counter()
+            final_bytes = merge(video_bytes_list, audio_bytes_list, unique_id)
+            timings[mode] = round(time.perf_counter() - start, 3)
+            size = final_bytes.size if isinstance(final_bytes, MediaHandle) else len(final_bytes or b"")
+            pipeline_logger.info(f"⏱️ {mode}: {timings[mode]}s, {size} bytes")
+            MergerFactory._release([final_bytes])
+        return timings
+
     # ---------------- Unified Entry Point ----------------
     @staticmethod
     def merge_all_videos_with_audio(video_bytes_list, audio_bytes_list, unique_id):
@@ -207,5 +450,124 @@ class MergerFactory:
                     merged_videos.append(merged_bytes)
 
             return MergerFactory.concatenate_videos(merged_videos)
+        elif Settings.MERGE_MODE == "single_pass":
+            final_bytes = MergerFactory.assemble(video_bytes_list, audio_bytes_list, unique_id)
+            if final_bytes is not None:
+                return final_bytes
+            # Two-stage drops a scene whose mux fails instead of failing the whole lesson
+            validation_logger.warning("⚠️ Single-pass assembly failed, falling back to two-stage merge")
+            return MergerFactory.merge_video_with_audio(video_bytes_list, audio_bytes_list, unique_id)
         else:
             return MergerFactory.merge_video_with_audio(video_bytes_list, audio_bytes_list, unique_id)
+
+
+# ---------------- Streaming Mode ----------------
+class StreamingMerger:
+    """
+    Muxes each scene's video+audio pair the moment both halves exist.
+
+    Producers call `add_video` / `add_audio` (from any thread) as scenes finish;
+    muxing runs on a small thread pool so it overlaps with rendering, leaving
+    only the final concatenation for `finish`. `close` must run in any case
+    (it is a no-op after `finish`): it stops the pool and deletes mux outputs
+    that `finish` never consumed, e.g. when rendering or TTS failed.
+    """
+
+    def __init__(self, unique_id, max_workers=None):
+        self.unique_id = unique_id
+        self._videos = {}
+        self._audios = {}
+        self._futures = {}
+        self._audio_streamed = False
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers or Settings.STREAMING_MERGE_WORKERS)
+
+    def add_video(self, idx, video_bytes):
+        with self._lock:
+            self._videos[idx] = video_bytes
+            self._maybe_submit(idx)
+
+    def add_audio(self, idx, audio_bytes):
+        """A narration streamed as soon as it is synthesized; `idx` is its scene index."""
+        with self._lock:
+            self._audio_streamed = True
+            self._add_audio(idx, audio_bytes)
+
+    def add_audio_list(self, audio_bytes_list):
+        """
+        End-of-stage narrations. Ignored once narrations were streamed: those carry
+        their scene index, while this list has dropped narrations removed.
+        """
+        with self._lock:
+            if self._audio_streamed:
+                return
+            for idx, audio_bytes in enumerate(audio_bytes_list):
+                self._add_audio(idx, audio_bytes)
+
+    def _add_audio(self, idx, audio_bytes):
+        # Caller holds the lock
+        if idx in self._audios or idx in self._futures:
+            return
+        self._audios[idx] = audio_bytes
+        self._maybe_submit(idx)
+
+    def _maybe_submit(self, idx):
+        # Caller holds the lock
+        if idx in self._futures or idx not in self._videos or idx not in self._audios:
+            return
+        video_bytes = self._videos.pop(idx)
+        audio_bytes = self._audios.pop(idx)
+        pipeline_logger.info(f"🔀 Scene {idx + 1}: video and audio ready, muxing now")
+        self._futures[idx] = self._executor.submit(MergerFactory.mux_pair, video_bytes, audio_bytes, idx + 1)
+
+    def finish(self, video_count, audio_count):
+        """Wait for pending muxes (scene order) and concatenate; returns final bytes or None."""
+        unique_id = self.unique_id
+        try:
+            if video_count != audio_count:
+                pipeline_logger.error("❌ Video and audio list length mismatch", extra={"part_name": "MergerFactory"})
+                exception(unique_id, type="Merge", description="Video and audio list length mismatch", module="MergerFactory")
+                transaction(unique_id, merge_status="Final video merge failed (list mismatch)")
+                raise ValueError("Video and audio lists must have the same length")
+
+            merged_videos_bytes = []
+            for idx in sorted(self._futures):
+                merged_bytes = self._futures.pop(idx).result()
+                if merged_bytes:
+                    merged_videos_bytes.append(merged_bytes)
+        finally:
+            self._executor.shutdown(wait=True)
+
+        if not merged_videos_bytes:
+            transaction(unique_id, merge_status="Final video merge failed (no output)")
+            return None
+
+        final_bytes = MergerFactory.concatenate_videos(merged_videos_bytes)
+        MergerFactory._release(merged_videos_bytes, keep=final_bytes)
+        if final_bytes:
+            transaction(unique_id, merge_status="Final video merged successfully")
+        else:
+            transaction(unique_id, merge_status="Final video merge failed during concatenation")
+
+        return final_bytes
+
+    def close(self):
+        """Stop muxing and delete the outputs of muxes `finish` did not consume."""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        with self._lock:
+            futures, self._futures = list(self._futures.values()), {}
+        for future in futures:
+            if not future.cancelled() and future.exception() is None:
+                MergerFactory._release([future.result()])
+
+
+if __name__ == "__main__":
+    # Usage: python merger_factory.py scene1.mp4 scene1.wav [scene2.mp4 scene2.wav ...]
+    import sys
+
+    pair_paths = sys.argv[1:]
+    if not pair_paths or len(pair_paths) % 2:
+        sys.exit("usage: merger_factory.py VIDEO AUDIO [VIDEO AUDIO ...]")
+    videos = [Path(p).read_bytes() for p in pair_paths[0::2]]
+    audios = [Path(p).read_bytes() for p in pair_paths[1::2]]
+    print(MergerFactory.benchmark(videos, audios))
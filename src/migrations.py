@@ -0,0 +1,189 @@
+import threading
+import time
+from psycopg2 import sql
+from config import Settings
+from db_pool import DBPool
+
+# pg_advisory_xact_lock key, so concurrent workers don't apply the same step twice
+MIGRATION_LOCK_ID = 727001
+
+
+# ---------------- Steps ----------------
+def _v1_baseline(cur):
+    """Every table the pipeline writes, with the columns the old per-write DDL healed in."""
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS transaction (
+            transaction_id UUID PRIMARY KEY,
+            topic TEXT,
+            meta_prompt TEXT,
+            cleaned_script JSON,
+            script_gen_status TEXT,
+            filegenration TEXT,
+            code_gen TEXT,
+            manim_output_status TEXT,
+            script_written TEXT,
+            merge_status TEXT,
+            video_status TEXT,
+            created_at TIMESTAMP DEFAULT NOW(),
+            updated_at TIMESTAMP
+        );
+    """)
+    for column in (
+        "topic TEXT", "meta_prompt TEXT", "cleaned_script JSON", "script_gen_status TEXT",
+        "filegenration TEXT", "code_gen TEXT", "manim_output_status TEXT", "script_written TEXT",
+        "merge_status TEXT", "video_status TEXT", "created_at TIMESTAMP DEFAULT NOW()", "updated_at TIMESTAMP",
+    ):
+        cur.execute(f"ALTER TABLE transaction ADD COLUMN IF NOT EXISTS {column};")
+
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS exception_store (
+            exception_id UUID PRIMARY KEY,
+            transaction_id TEXT,
+            type TEXT,
+            description TEXT,
+            module TEXT,
+            created_at TIMESTAMP DEFAULT NOW(),
+            updated_at TIMESTAMP
+        );
+    """)
+    for column in (
+        "transaction_id TEXT", "type TEXT", "description TEXT", "module TEXT",
+        "created_at TIMESTAMP DEFAULT NOW()", "updated_at TIMESTAMP",
+    ):
+        cur.execute(f"ALTER TABLE exception_store ADD COLUMN IF NOT EXISTS {column};")
+
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS exceptions (
+            id SERIAL PRIMARY KEY,
+            log_type VARCHAR(50) NOT NULL,
+            timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            part_name VARCHAR(255),
+            error_summary TEXT,
+            error_details TEXT NOT NULL
+        );
+    """)
+
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS script_store (
+            id UUID NOT NULL,
+            Transaction_id TEXT,
+            time TIMESTAMP DEFAULT NOW(),
+            folder_name TEXT,
+            scripts JSONB,
+            sequence TEXT,
+            code TEXT,
+            narration JSONB
+        );
+    """)
+
+    # Table_gen: one row per scene with its file paths
+    cur.execute(sql.SQL("""
+        CREATE TABLE IF NOT EXISTS {table} (
+            content_id TEXT PRIMARY KEY,
+            video_script TEXT,
+            video_path TEXT,
+            video_type TEXT,
+            tts_script TEXT,
+            tts_type TEXT,
+            tts_path TEXT,
+            creation_timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            update_timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            flag TEXT,
+            exception TEXT
+        )
+    """).format(table=sql.Identifier(Settings.POSTGRES["table"])))
+
+    # PostgresSaver: final videos as BYTEA
+    cur.execute(sql.SQL("""
+        CREATE TABLE IF NOT EXISTS {table} (
+            id SERIAL PRIMARY KEY,
+            filename TEXT,
+            video BYTEA,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """).format(table=sql.Identifier(Settings.FINAL_VIDEO_TABLE)))
+
+
+# (version, description, step) — append new steps, never edit applied ones
+MIGRATIONS = [
+    (1, "baseline pipeline tables", _v1_baseline),
+]
+
+
+class Migrations:
+    """
+    Versioned schema setup, applied once per database instead of on every write.
+
+    `run` is called at application startup; the write helpers call `ensure`,
+    which is a no-op once this process has migrated the database, so status
+    and log writes only ever issue DML. After a failure `ensure` returns False
+    without retrying for DB_MIGRATION_RETRY_SECONDS, so writers don't pay a
+    connect timeout for the migration on every call while the DB is down.
+    Applied versions are recorded in the
+    `schema_version` table. Failures are printed rather than logged, since the
+    Postgres log handler itself depends on the schema.
+    """
+
+    _migrated = set()   # credentials keys already at the latest version
+    _failed_at = {}     # credentials key -> monotonic time of the last failed attempt
+    _lock = threading.Lock()
+
+    @staticmethod
+    def run(credentials=None) -> int:
+        """Apply pending steps (each in its own transaction); returns how many were applied."""
+        applied = 0
+        with DBPool.connection(credentials) as conn:
+            cur = conn.cursor()
+            try:
+                cur.execute("""
+                    CREATE TABLE IF NOT EXISTS schema_version (
+                        version INTEGER PRIMARY KEY,
+                        description TEXT,
+                        applied_at TIMESTAMP DEFAULT NOW()
+                    );
+                """)
+                conn.commit()
+
+                for version, description, step in MIGRATIONS:
+                    cur.execute("SELECT pg_advisory_xact_lock(%s);", (MIGRATION_LOCK_ID,))
+                    cur.execute("SELECT 1 FROM schema_version WHERE version = %s;", (version,))
+                    if cur.fetchone():
+                        conn.commit()
+                        continue
+                    step(cur)
+                    cur.execute(
+                        "INSERT INTO schema_version (version, description) VALUES (%s, %s);",
+                        (version, description),
+                    )
+                    conn.commit()
+                    applied += 1
+                    print(f"🧱 Applied schema migration {version}: {description}")
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                cur.close()
+
+        Migrations._migrated.add(DBPool._key(credentials))
+        return applied
+
+    @staticmethod
+    def ensure(credentials=None) -> bool:
+        """Migrate `credentials`' database unless this process already has; False if that failed (now or recently)."""
+        key = DBPool._key(credentials)
+        if key in Migrations._migrated:
+            return True
+        with Migrations._lock:
+            if key in Migrations._migrated:
+                return True
+            failed_at = Migrations._failed_at.get(key)
+            if failed_at is not None and time.monotonic() - failed_at < Settings.DB_MIGRATION_RETRY_SECONDS:
+                return False
+            try:
+                Migrations.run(credentials)
+                Migrations._failed_at.pop(key, None)
+                return True
+            except Exception as e:
+                Migrations._failed_at[key] = time.monotonic()
+                print(f"❌ Schema migration failed: {e}")
+                return False
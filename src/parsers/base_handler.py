@@ -3,7 +3,7 @@ import json
 from pathlib import Path
 from datetime import datetime
 from abc import ABC, abstractmethod
-import psycopg2
+from db_pool import DBPool
 import traceback
 from logger import pipeline_logger, validation_logger
 from Transaction.transaction_handler import transaction
@@ -190,20 +190,13 @@ class PostgresHandler(InputHandler):
             raise ValueError("❌ No DB credentials set for PostgresHandler")
 
         try:
-            conn = psycopg2.connect(
-                host=self.credentials["host"],
-                port=self.credentials["port"],
-                user=self.credentials["user"],
-                password=self.credentials["password"],
-                dbname=self.credentials["dbname"],
-            )
-            cursor = conn.cursor()
-            cursor.execute(query)
-            rows = cursor.fetchall()
-            col_names = [desc[0] for desc in cursor.description]
-            data = [dict(zip(col_names, row)) for row in rows]
-            cursor.close()
-            conn.close()
+            with DBPool.connection(self.credentials) as conn:
+                cursor = conn.cursor()
+                cursor.execute(query)
+                rows = cursor.fetchall()
+                col_names = [desc[0] for desc in cursor.description]
+                data = [dict(zip(col_names, row)) for row in rows]
+                cursor.close()
 
             pipeline_logger.info("📝 Generating Python and TXT files from Postgres data")
             return self._generate_files(data, "postgres_input", file_types)
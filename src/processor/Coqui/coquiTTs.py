@@ -1,63 +1,101 @@
 # src/processor/TTSX/audio_factory.py
 from TTS.api import TTS
-from pydub import AudioSegment
+import numpy as np
 from pathlib import Path
-import os
+from config import Settings
 from logger import pipeline_logger, validation_logger
+from Transaction.excepetion import exception
+from processor.tts_model_pool import TTSModelPool
+from processor.tts_parallel import ParallelTTS
+from processor.tts_cache import TTSCache
+from processor.audio_utils import to_pcm16, join_with_silence, encode_audio, group_shards
+
+
+def _load_model():
+    # Multilingual xtts_v2
+    return TTS("tts_models/multilingual/multi-dataset/xtts_v2")
+
+
+def _warmup_model(tts):
+    pipeline_logger.info(f"🌍 Available Speakers: {tts.speakers}")
+    pipeline_logger.info(f"🗣️ Available Languages: {tts.languages}")
+    tts.tts(text="Hello.", language="en", speaker="Kumar Dahl")
+
+
+TTSModelPool.register("coqui", _load_model, _warmup_model)
 
 
 class AudioFactory:
-    """Generates Hinglish audio (WAV bytes, memory-only) from TXT files using Coqui TTS."""
+    """Generates Hinglish audio (MediaHandles with duration/format metadata) from TXT files using Coqui TTS."""
 
     @staticmethod
-    def text_files_to_audio_bytes(generated_files, unique_id):
-        audio_bytes_list = []
-
-        # Load TTS model (multilingual xtts_v2)
-        model_name = "tts_models/multilingual/multi-dataset/xtts_v2"
-        tts = TTS(model_name)
-
-        pipeline_logger.info(f"🌍 Available Speakers: {tts.speakers}")
-        pipeline_logger.info(f"🗣️ Available Languages: {tts.languages}")
-
-        for txt_file in generated_files["txt_files"]:
-            txt_path = Path(txt_file)
-
-            with open(txt_file, "r", encoding="utf-8") as f:
-                text = f.read().strip()
-
-            if not text:
-                validation_logger.warning(f"⚠️ Skipping empty file: {txt_file}")
-                continue
-
-            # Split into smaller segments if text is long (basic safeguard)
-            segments = [s.strip() for s in text.split(".") if s.strip()]
-
-            # Container for combined audio
-            final_audio = AudioSegment.empty()
-
-            # Generate audio per segment
-            for i, seg in enumerate(segments):
-                part_file = f"part_{i}.wav"
-                tts.tts_to_file(
-                    text=seg,
-                    file_path=part_file,
-                    language="en",                   # Hinglish handled via Hindi model
-                    speaker="Kumar Dahl",        # Example: custom voice
-                    speed=1.0,
-                    temperature=0.7
-                )
-                final_audio += AudioSegment.from_wav(part_file) + AudioSegment.silent(duration=400)
-                os.remove(part_file)
-
-            # Export to memory (WAV bytes)
-            from io import BytesIO
-            audio_buffer = BytesIO()
-            final_audio.export(audio_buffer, format="wav")
-            audio_buffer.seek(0)
-
-            audio_bytes_list.append(audio_buffer.read())
-            pipeline_logger.info(f"✅ Generated Hinglish audio for: {txt_path.name} (in memory)")
+    def text_files_to_audio_bytes(generated_files, unique_id, on_scene=None):
+        # Sentence shards are spread over worker processes, each with a resident xtts_v2 model
+        audio_bytes_list = ParallelTTS.map_shards(
+            "coqui", AudioFactory, generated_files["txt_files"], unique_id, on_scene=on_scene
+        )
 
         pipeline_logger.info(f"🎵 Total audio files generated: {len(audio_bytes_list)}")
         return audio_bytes_list
+
+    @staticmethod
+    def read_shards(txt_file, unique_id):
+        with open(txt_file, "r", encoding="utf-8") as f:
+            text = f.read().strip()
+
+        if not text:
+            validation_logger.warning(f"⚠️ Skipping empty file: {txt_file}")
+            return None
+
+        # Split into smaller segments if text is long (basic safeguard)
+        segments = [s.strip() for s in text.split(".") if s.strip()]
+        return group_shards(segments, Settings.TTS_SHARD_MIN_CHARS)
+
+    @staticmethod
+    def synthesize_shard(tts, segments, txt_name, unique_id):
+        """Synthesize one shard; returns (samples, sample_rate), or None if it failed."""
+        def synthesize(seg):
+            wav = tts.tts(
+                text=seg,
+                language="en",                   # Hinglish handled via Hindi model
+                speaker="Kumar Dahl",        # Example: custom voice
+                speed=1.0,
+                temperature=0.7
+            )
+            return to_pcm16(wav)
+
+        try:
+            sample_rate = tts.synthesizer.output_sample_rate
+
+            # Generate audio per segment straight into memory, reusing cached sentences
+            parts = []
+            for seg in segments:
+                key = TTSCache.sentence_key("coqui", "Kumar Dahl:en", seg, speed=1.0, sample_rate=sample_rate)
+                parts.append(TTSCache.cached_samples(key, lambda: synthesize(seg)))
+
+            # Every segment is followed by a 400 ms gap, so shards join seamlessly
+            return join_with_silence(parts, sample_rate, gap_ms=400), sample_rate
+
+        except Exception as e:
+            # Only this narration is dropped; the rest of the stage carries on
+            exception(unique_id, type="audio", description=f"Coqui TTS failed for {txt_name}: {e}", module="AudioFactory")
+            validation_logger.error(f"❌ Error generating audio for {txt_name}: {e}", extra={"part_name": "CoquiAudioFactory"})
+            return None
+
+    @staticmethod
+    def shard_gap_ms():
+        # Every segment already ends with its 400 ms gap
+        return 0
+
+    @staticmethod
+    def assemble(txt_file, shards, unique_id):
+        """Join a narration's shards into one encoded handle; None if any shard failed."""
+        if any(shard is None for shard in shards):
+            return None
+
+        # Encode once (WAV or delivery AAC, with duration/format metadata)
+        sample_rate = shards[0][1]
+        final_audio = np.concatenate([samples for samples, _ in shards])
+
+        pipeline_logger.info(f"✅ Generated Hinglish audio for: {Path(txt_file).name} (in memory)")
+        return encode_audio(final_audio, sample_rate)
@@ -1,73 +1,107 @@
 # src/processor/TTSX/audio_factory.py
 from TTS.api import TTS
-from pydub import AudioSegment
+import numpy as np
 from pathlib import Path
-from io import BytesIO
-import os
+from config import Settings
 from logger import pipeline_logger, validation_logger
+from Transaction.excepetion import exception
+from processor.tts_model_pool import TTSModelPool
+from processor.tts_parallel import ParallelTTS
+from processor.tts_cache import TTSCache
+from processor.audio_utils import to_pcm16, join_with_silence, encode_audio, group_shards
+
+
+def _load_model():
+    # Local Hindi model (not multilingual)
+    return TTS(
+        model_path="C:/Vivek_Main/Datasets/indictts/en+hi/fastpitch/best_model.pth",
+        config_path="C:/Vivek_Main/Datasets/indictts/en+hi/fastpitch/config.json",
+        vocoder_path="C:/Vivek_Main/Datasets/indictts/en+hi/hifigan/best_model.pth",
+        vocoder_config_path="C:/Vivek_Main/Datasets/indictts/en+hi/hifigan/config.json"
+    )
+
+
+def _warmup_model(tts):
+    # Try to print speaker info
+    try:
+        pipeline_logger.info(f"🎙️ Available Speakers: {tts.speakers}")
+    except Exception:
+        pipeline_logger.info("ℹ️ Speaker info not available for this model.")
+    tts.tts(text="नमस्ते", speaker="female")
+
+
+TTSModelPool.register("indic", _load_model, _warmup_model)
 
 
 class AudioFactory:
-    """Generates Hindi audio (WAV bytes in memory) using your FastPitch + HiFi-GAN model."""
+    """Generates Hindi audio (MediaHandles with duration/format metadata) using your FastPitch + HiFi-GAN model."""
 
     @staticmethod
-    def text_files_to_audio_bytes(generated_files, unique_id):
-        audio_bytes_list = []
-
-        # Load your local Hindi model (not multilingual)
-        tts = TTS(
-            model_path="C:/Vivek_Main/Datasets/indictts/en+hi/fastpitch/best_model.pth",
-            config_path="C:/Vivek_Main/Datasets/indictts/en+hi/fastpitch/config.json",
-            vocoder_path="C:/Vivek_Main/Datasets/indictts/en+hi/hifigan/best_model.pth",
-            vocoder_config_path="C:/Vivek_Main/Datasets/indictts/en+hi/hifigan/config.json"
+    def text_files_to_audio_bytes(generated_files, unique_id, on_scene=None):
+        # Sentence shards are spread over worker processes, each with a resident FastPitch + HiFi-GAN model
+        audio_bytes_list = ParallelTTS.map_shards(
+            "indic", AudioFactory, generated_files["txt_files"], unique_id, on_scene=on_scene
         )
 
-        # Try to print speaker info
-        try:
-            pipeline_logger.info(f"🎙️ Available Speakers: {tts.speakers}")
-        except Exception:
-            pipeline_logger.info("ℹ️ Speaker info not available for this model.")
-
-        for txt_file in generated_files["txt_files"]:
-            txt_path = Path(txt_file)
+        pipeline_logger.info(f"🎵 Total audio files generated: {len(audio_bytes_list)}")
+        return audio_bytes_list
 
-            with open(txt_file, "r", encoding="utf-8") as f:
-                text = f.read().strip()
+    @staticmethod
+    def read_shards(txt_file, unique_id):
+        with open(txt_file, "r", encoding="utf-8") as f:
+            text = f.read().strip()
 
-            if not text:
-                validation_logger.warning(f"⚠️ Skipping empty file: {txt_file}")
-                continue
+        if not text:
+            validation_logger.warning(f"⚠️ Skipping empty file: {txt_file}")
+            return None
 
-            # Split into smaller sentences
-            segments = [s.strip() for s in text.split("।") if s.strip()]
+        # Split into smaller sentences
+        segments = [s.strip() for s in text.split("।") if s.strip()]
+        return group_shards(segments, Settings.TTS_SHARD_MIN_CHARS)
 
-            final_audio = AudioSegment.empty()
+    @staticmethod
+    def synthesize_shard(tts, segments, txt_name, unique_id):
+        """Synthesize one shard; returns (samples, sample_rate), or None if it failed."""
+        # Choose speaker dynamically (use 'male' or 'female')
+        chosen_speaker = "female"
 
-            # Choose speaker dynamically (use 'male' or 'female')
-            chosen_speaker = "female"
+        try:
+            sample_rate = tts.synthesizer.output_sample_rate
 
-            for i, seg in enumerate(segments):
+            # Reuse cached sentences; synthesize the rest
+            parts = []
+            for seg in segments:
                 if not seg:
                     continue
 
-                temp_wav = f"part_{i}.wav"
-                tts.tts_to_file(
-                    text=seg,
-                    speaker=chosen_speaker,
-                    file_path=temp_wav
-                )
+                key = TTSCache.sentence_key("indic", chosen_speaker, seg, sample_rate=sample_rate)
+                parts.append(TTSCache.cached_samples(
+                    key, lambda: to_pcm16(tts.tts(text=seg, speaker=chosen_speaker))
+                ))
 
-                # Add to final combined audio
-                final_audio += AudioSegment.from_wav(temp_wav) + AudioSegment.silent(duration=400)
-                os.remove(temp_wav)
+            # Every segment is followed by a 400 ms gap, so shards join seamlessly
+            return join_with_silence(parts, sample_rate, gap_ms=400), sample_rate
 
-            # Export to in-memory WAV
-            buffer = BytesIO()
-            final_audio.export(buffer, format="wav")
-            buffer.seek(0)
+        except Exception as e:
+            # Only this narration is dropped; the rest of the stage carries on
+            exception(unique_id, type="audio", description=f"IndicTTS failed for {txt_name}: {e}", module="AudioFactory")
+            validation_logger.error(f"❌ Error generating audio for {txt_name}: {e}", extra={"part_name": "IndicAudioFactory"})
+            return None
 
-            audio_bytes_list.append(buffer.read())
-            pipeline_logger.info(f"✅ Generated Hindi audio for: {txt_path.name}")
+    @staticmethod
+    def shard_gap_ms():
+        # Every segment already ends with its 400 ms gap
+        return 0
 
-        pipeline_logger.info(f"🎵 Total audio files generated: {len(audio_bytes_list)}")
-        return audio_bytes_list
+    @staticmethod
+    def assemble(txt_file, shards, unique_id):
+        """Join a narration's shards into one encoded handle; None if any shard failed."""
+        if any(shard is None for shard in shards):
+            return None
+
+        # Encode once (WAV or delivery AAC, with duration/format metadata)
+        sample_rate = shards[0][1]
+        final_audio = np.concatenate([samples for samples, _ in shards])
+
+        pipeline_logger.info(f"✅ Generated Hindi audio for: {Path(txt_file).name}")
+        return encode_audio(final_audio, sample_rate)
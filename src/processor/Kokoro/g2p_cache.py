@@ -0,0 +1,166 @@
+import pickle
+import sqlite3
+import threading
+import time
+from importlib import metadata
+from pathlib import Path
+from config import Settings
+from logger import pipeline_logger, validation_logger
+
+
+class G2PCache:
+    """
+    Persistent grapheme-to-phoneme cache for Kokoro.
+
+    `install(pipeline, lang_code)` puts a caching wrapper in front of the
+    pipeline's `g2p`, so KPipeline's own splitting, chunking and timestamp
+    handling run unchanged on cached (phonemes, tokens) results. Entries live
+    in a SQLite file keyed by (language code, misaki version, text chunk) and
+    survive restarts; worker processes share the file (WAL mode).
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS g2p (
+            lang TEXT NOT NULL,
+            version TEXT NOT NULL,
+            text TEXT NOT NULL,
+            result BLOB NOT NULL,
+            last_used REAL NOT NULL,
+            PRIMARY KEY (lang, version, text)
+        )
+    """
+
+    def __init__(self, g2p, lang_code: str, db_path, max_entries: int = 0):
+        self.g2p = g2p
+        self.lang_code = lang_code
+        self.version = G2PCache.misaki_version()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(db_path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(G2PCache.SCHEMA)
+        self._conn.commit()
+        if max_entries:
+            self.prune(max_entries)
+
+    @staticmethod
+    def misaki_version() -> str:
+        try:
+            return metadata.version("misaki")
+        except metadata.PackageNotFoundError:
+            return "unknown"
+
+    @staticmethod
+    def install(pipeline, lang_code: str):
+        """Wrap `pipeline.g2p` with the cache configured in Settings (no-op when disabled)."""
+        if not Settings.KOKORO_G2P_CACHE_ENABLED or isinstance(pipeline.g2p, G2PCache):
+            return pipeline
+        try:
+            pipeline.g2p = G2PCache(
+                pipeline.g2p, lang_code,
+                Settings.KOKORO_G2P_CACHE_PATH,
+                max_entries=Settings.KOKORO_G2P_CACHE_MAX_ENTRIES,
+            )
+        except sqlite3.Error as e:
+            validation_logger.warning(f"⚠️ G2P cache unavailable, phonemizing uncached: {e}")
+        return pipeline
+
+    # ---------------- Lookup ----------------
+    def __call__(self, text):
+        key = (self.lang_code, self.version, text)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT result FROM g2p WHERE lang = ? AND version = ? AND text = ?", key
+            ).fetchone()
+            if row is not None:
+                self.hits += 1
+                self._conn.execute(
+                    "UPDATE g2p SET last_used = ? WHERE lang = ? AND version = ? AND text = ?",
+                    (time.time(), *key),
+                )
+                self._conn.commit()
+
+        if row is not None:
+            # A fresh copy per call: KPipeline writes timestamps onto the tokens
+            return pickle.loads(row[0])
+
+        result = self.g2p(text)
+        with self._lock:
+            self.misses += 1
+            self._conn.execute(
+                "INSERT OR REPLACE INTO g2p (lang, version, text, result, last_used) VALUES (?, ?, ?, ?, ?)",
+                (*key, pickle.dumps(result), time.time()),
+            )
+            self._conn.commit()
+        return result
+
+    def __getattr__(self, name):
+        # Anything else KPipeline reads from its g2p (e.g. lexicon) comes from the wrapped one
+        if name == "g2p":
+            raise AttributeError(name)
+        return getattr(self.g2p, name)
+
+    # ---------------- Eviction ----------------
+    def prune(self, max_entries: int) -> int:
+        """Keep the `max_entries` most recently used rows. Returns rows removed."""
+        with self._lock:
+            cur = self._conn.execute(
+                "DELETE FROM g2p WHERE rowid NOT IN (SELECT rowid FROM g2p ORDER BY last_used DESC LIMIT ?)",
+                (max_entries,),
+            )
+            self._conn.commit()
+        if cur.rowcount:
+            pipeline_logger.info(f"🧹 G2P cache: pruned {cur.rowcount} entr(ies)")
+        return cur.rowcount
+
+    # ---------------- Metrics ----------------
+    def stats(self) -> dict:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM g2p").fetchone()[0]
+            hits, misses = self.hits, self.misses
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+            "entries": entries,
+        }
+
+    @staticmethod
+    def benchmark(texts, lang_code="a", db_path=None):
+        """
+        Time Kokoro G2P over `texts` uncached, then cold and warm through the
+        cache (seconds). Only the G2P model is loaded (KPipeline(model=False)).
+        """
+        import tempfile
+        from kokoro import KPipeline
+
+        g2p = KPipeline(lang_code=lang_code, model=False).g2p
+        db_path = db_path or Path(tempfile.mkdtemp(prefix="g2p_bench_")) / "g2p.sqlite3"
+        cache = G2PCache(g2p, lang_code, db_path)
+
+        timings = {}
+        for mode, phonemize in (("uncached", g2p), ("cold", cache), ("warm", cache)):
+            start = time.perf_counter()
+            for text in texts:
+                phonemize(text)
+            timings[mode] = round(time.perf_counter() - start, 3)
+            pipeline_logger.info(f"⏱️ G2P {mode}: {timings[mode]}s for {len(texts)} chunk(s)")
+        timings["speedup"] = round(timings["uncached"] / max(timings["warm"], 1e-6), 1)
+        return timings
+
+
+if __name__ == "__main__":
+    # Usage: python -m processor.Kokoro.g2p_cache script_seq1.txt [script_seq2.txt ...]
+    import sys
+    from processor.audio_utils import split_sentences
+
+    if len(sys.argv) < 2:
+        sys.exit("usage: g2p_cache.py NARRATION.txt [NARRATION.txt ...]")
+    sentences = [
+        s for p in sys.argv[1:] for s in split_sentences(Path(p).read_text(encoding="utf-8"))
+    ]
+    print(G2PCache.benchmark(sentences))
@@ -1,132 +1,209 @@
-import soundfile as sf
 import torch
 import numpy as np
-from io import BytesIO
 from pathlib import Path
 from kokoro import KPipeline
+from config import Settings
 from logger import pipeline_logger, validation_logger
 from Transaction.excepetion import exception
+from processor.tts_model_pool import TTSModelPool
+from processor.tts_parallel import ParallelTTS
+from processor.tts_cache import TTSCache
+from processor.Kokoro.g2p_cache import G2PCache
+from processor.audio_utils import split_sentences, group_shards, join_with_silence, encode_audio
 
 
-class AudioFactory:
-    """Generates audio bytes from TXT files using Kokoro TTS (in memory)."""
+def _load_pipeline():
+    # Phonemization of recurring text is served from the persistent G2P cache
+    return G2PCache.install(KPipeline(lang_code='a'), 'a')
 
-    @staticmethod
-    def text_files_to_audio_bytes(generated_files, unique_id):
-        audio_bytes_list = []
-        pipeline = KPipeline(lang_code='a')
 
-        module_name = "AudioFactory"
+def _warmup_pipeline(pipeline):
+    for _ in pipeline("Hello.", voice="af_aoede"):
+        pass
 
-        for txt_file in generated_files.get("txt_files", []):
-            txt_path = Path(txt_file)
 
-            try:
-                with open(txt_file, "r", encoding="utf-8") as f:
-                    text = f.read().strip()
+TTSModelPool.register("kokoro", _load_pipeline, _warmup_pipeline)
+
 
-                if not text:
-                    validation_logger.warning(f"⚠️ Skipping empty file: {txt_file}")
+class AudioFactory:
+    """Generates audio from TXT files using Kokoro TTS (MediaHandles with duration/format metadata)."""
 
-                    # ⬇️ NEW: Log skipped/empty content
-                    exception(
-                        unique_id,
-                        type="audio",
-                        description=f"Empty text file skipped: {txt_path.name}",
-                        module=module_name
-                    )
-                    continue
+    # Model pool / TTS cache name; variants of the model subclass with their own
+    BACKEND = "kokoro"
 
-            except Exception as e:
-                import traceback
-                error_trace = traceback.format_exc()
+    @classmethod
+    def text_files_to_audio_bytes(cls, generated_files, unique_id, on_scene=None):
+        # Sentence shards are spread over worker processes, each with a resident Kokoro pipeline
+        audio_bytes_list = ParallelTTS.map_shards(
+            cls.BACKEND, cls, generated_files.get("txt_files", []), unique_id, on_scene=on_scene
+        )
 
+        pipeline_logger.debug(f"Audio bytes count: {len(audio_bytes_list)}")
+        print("audio_bytes_list", len(audio_bytes_list))
+        return audio_bytes_list
+
+    @staticmethod
+    def read_shards(txt_file, unique_id):
+        """Read one TXT file and split it into sentence shards; None if it is skipped."""
+        module_name = "AudioFactory"
+        txt_path = Path(txt_file)
+
+        try:
+            with open(txt_file, "r", encoding="utf-8") as f:
+                text = f.read().strip()
+
+            if not text:
+                validation_logger.warning(f"⚠️ Skipping empty file: {txt_file}")
+
+                # ⬇️ NEW: Log skipped/empty content
                 exception(
                     unique_id,
                     type="audio",
-                    description=f"Error reading text file: {txt_path.name} | {e}",
+                    description=f"Empty text file skipped: {txt_path.name}",
                     module=module_name
                 )
+                return None
+
+        except Exception as e:
+            import traceback
+            error_trace = traceback.format_exc()
+
+            exception(
+                unique_id,
+                type="audio",
+                description=f"Error reading text file: {txt_path.name} | {e}",
+                module=module_name
+            )
+
+            validation_logger.error(
+                f"❌ Failed reading text file {txt_path.name}: {e}\n{error_trace}"
+            )
+            return None
+
+        shards = group_shards(split_sentences(text), Settings.TTS_SHARD_MIN_CHARS)
+        if len(shards) <= 1:
+            # Short narration: let Kokoro see the text exactly as written
+            return [[text]]
+        return shards
+
+    @classmethod
+    def synthesize_shard(cls, pipeline, sentences, txt_name, unique_id):
+        """Synthesize one shard; returns (samples, sample_rate), or None if it failed."""
+        module_name = "AudioFactory"
 
-                validation_logger.error(
-                    f"❌ Failed reading text file {txt_path.name}: {e}\n{error_trace}"
+        try:
+            # A one-piece shard (a short narration, kept as written) is synthesized whole, exactly
+            # as before sharding. Multi-sentence shards go sentence by sentence when caching, so
+            # recurring lines are reused, with the same pause between sentences as between shards.
+            if len(sentences) > 1 and Settings.TTS_CACHE_ENABLED:
+                pieces = list(sentences)
+            else:
+                pieces = [" ".join(sentences)]
+
+            parts = []
+            for piece in pieces:
+                key = TTSCache.sentence_key(cls.BACKEND, "af_aoede", piece, speed=1.0, sample_rate=24000)
+                audio = TTSCache.cached_samples(
+                    key, lambda: AudioFactory._generate(pipeline, piece, txt_name, unique_id)
                 )
-                continue
+                if audio is not None:
+                    parts.append(audio)
+
+            if not parts:
+                return None
+            return join_with_silence(parts, 24000, gap_ms=cls.shard_gap_ms(), trailing=False), 24000
+
+        except Exception as e:
+            # General fallback for generator-level errors
+            exception(
+                unique_id,
+                type="audio",
+                description=f"Kokoro TTS failed for {txt_name}: {e}",
+                module=module_name
+            )
+
+            validation_logger.error(
+                f"❌ Error generating audio for {txt_name}: {e}",
+                extra={"part_name": "KokoroAudioFactory"}
+            )
+            return None
+
+    @staticmethod
+    def _generate(pipeline, text, txt_name, unique_id):
+        module_name = "AudioFactory"
+
+        generator = pipeline(text, voice="af_aoede")
+        all_audio_chunks = []
 
+        # ----------------------------------------------------
+        # Process Kokoro generator chunks
+        # ----------------------------------------------------
+        for _, _, audio in generator:
             try:
-                generator = pipeline(text, voice="af_aoede")
-                all_audio_chunks = []
-
-                # ----------------------------------------------------
-                # Process Kokoro generator chunks
-                # ----------------------------------------------------
-                for _, _, audio in generator:
-                    try:
-                        if isinstance(audio, torch.Tensor):
-                            audio = audio.detach().cpu().numpy()
-
-                        all_audio_chunks.append(audio)
-
-                    except Exception as e:
-                        import traceback
-                        error_trace = traceback.format_exc()
-
-                        # ⬇️ NEW: Exception placeholder for chunk-level error
-                        exception(
-                            unique_id,
-                            type="audio",
-                            description=f"Error processing audio chunk: {e}",
-                            module=module_name
-                        )
-
-                        pipeline_logger.error(
-                            f"\n❌ Error in audio chunk loop for {txt_path.name}:\n"
-                            f"──────────────────────────────────────────\n"
-                            f"{e}\n{error_trace}\n"
-                            f"──────────────────────────────────────────"
-                        )
-                        continue
-
-                # ----------------------------------------------------
-                # Concatenate chunks into final audio
-                # ----------------------------------------------------
-                if all_audio_chunks:
-                    try:
-                        full_audio = np.concatenate(all_audio_chunks)
-                        buffer = BytesIO()
-                        sf.write(buffer, full_audio, samplerate=24000, format="WAV")
-                        buffer.seek(0)
-                        audio_bytes_list.append(buffer.read())
-
-                        pipeline_logger.debug(
-                            f"✅ Generated full audio for: {txt_path.name} (in memory)"
-                        )
-
-                    except Exception as e:
-                        exception(
-                            unique_id,
-                            type="audio",
-                            description=f"Failed concatenating final audio for {txt_path.name}: {e}",
-                            module=module_name
-                        )
-                        validation_logger.error(
-                            f"❌ Audio concatenation error for {txt_path.name}: {e}"
-                        )
+                if isinstance(audio, torch.Tensor):
+                    audio = audio.detach().cpu().numpy()
+
+                all_audio_chunks.append(audio)
 
             except Exception as e:
-                # General fallback for generator-level errors
+                import traceback
+                error_trace = traceback.format_exc()
+
+                # ⬇️ NEW: Exception placeholder for chunk-level error
                 exception(
                     unique_id,
                     type="audio",
-                    description=f"Kokoro TTS failed for {txt_path.name}: {e}",
+                    description=f"Error processing audio chunk: {e}",
                     module=module_name
                 )
 
-                validation_logger.error(
-                    f"❌ Error generating audio for {txt_path.name}: {e}",
-                    extra={"part_name": "KokoroAudioFactory"}
+                pipeline_logger.error(
+                    f"\n❌ Error in audio chunk loop for {txt_name}:\n"
+                    f"──────────────────────────────────────────\n"
+                    f"{e}\n{error_trace}\n"
+                    f"──────────────────────────────────────────"
                 )
+                continue
 
-        pipeline_logger.debug(f"Audio bytes count: {len(audio_bytes_list)}")
-        print("audio_bytes_list", len(audio_bytes_list))
-        return audio_bytes_list
+        if not all_audio_chunks:
+            return None
+        return np.concatenate(all_audio_chunks)
+
+    @staticmethod
+    def shard_gap_ms():
+        return Settings.TTS_SHARD_GAP_MS
+
+    @staticmethod
+    def assemble(txt_file, shards, unique_id):
+        """Stitch a narration's shards into one encoded handle; None if any shard failed."""
+        module_name = "AudioFactory"
+        txt_path = Path(txt_file)
+
+        if any(shard is None for shard in shards):
+            return None
+
+        # ----------------------------------------------------
+        # Concatenate shards into final audio
+        # ----------------------------------------------------
+        try:
+            full_audio = join_with_silence(
+                [samples for samples, _ in shards], 24000,
+                gap_ms=AudioFactory.shard_gap_ms(), trailing=False,
+            )
+            handle = encode_audio(full_audio, 24000)
+            pipeline_logger.debug(
+                f"✅ Generated full audio for: {txt_path.name} ({handle.duration:.1f}s {handle.codec})"
+            )
+            return handle
+
+        except Exception as e:
+            exception(
+                unique_id,
+                type="audio",
+                description=f"Failed concatenating final audio for {txt_path.name}: {e}",
+                module=module_name
+            )
+            validation_logger.error(
+                f"❌ Audio concatenation error for {txt_path.name}: {e}"
+            )
+            return None
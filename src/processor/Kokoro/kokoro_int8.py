@@ -0,0 +1,90 @@
+import time
+import torch
+from kokoro import KPipeline
+from logger import pipeline_logger
+from processor.tts_model_pool import TTSModelPool
+from processor.Kokoro.kokoro import AudioFactory as KokoroAudioFactory, _warmup_pipeline
+from processor.Kokoro.g2p_cache import G2PCache
+from processor.audio_utils import spectral_similarity
+
+
+def _quantized_pipeline():
+    """Kokoro with its Linear/LSTM layers dynamically quantized to int8 for CPU inference."""
+    pipeline = KPipeline(lang_code='a')
+    torch.ao.quantization.quantize_dynamic(
+        pipeline.model, {torch.nn.Linear, torch.nn.LSTM}, dtype=torch.qint8, inplace=True
+    )
+    return pipeline
+
+
+def _load_int8_pipeline():
+    # Same persistent G2P cache as the eager backend
+    return G2PCache.install(_quantized_pipeline(), 'a')
+
+
+TTSModelPool.register("kokoro_int8", _load_int8_pipeline, _warmup_pipeline)
+
+
+class AudioFactory(KokoroAudioFactory):
+    """Kokoro TTS on the int8-quantized model (same voice, pipeline and output format)."""
+
+    BACKEND = "kokoro_int8"
+
+    @staticmethod
+    def benchmark(texts, voice="af_aoede"):
+        """
+        Compare eager and int8 Kokoro on `texts`.
+
+        Reports load time, synthesis time and real-time factor (synthesis
+        seconds per second of audio, lower is better) for each variant, plus a
+        quality spot-check: duration ratio and average-spectrum similarity of
+        the int8 output against the eager output, per text. Both variants run
+        without the G2P cache, so only the model differs between them.
+        """
+        report, outputs = {}, {}
+        for name, load in (("eager", lambda: KPipeline(lang_code='a')), ("int8", _quantized_pipeline)):
+            start = time.perf_counter()
+            pipeline = load()
+            load_s = time.perf_counter() - start
+            _warmup_pipeline(pipeline)
+
+            clips, synth_s = [], 0.0
+            for text in texts:
+                start = time.perf_counter()
+                chunks = [audio for _, _, audio in pipeline(text, voice=voice)]
+                synth_s += time.perf_counter() - start
+                clips.append(torch.cat([torch.as_tensor(c) for c in chunks]).numpy())
+
+            audio_s = sum(len(c) for c in clips) / 24000
+            report[name] = {
+                "load_s": round(load_s, 2),
+                "synth_s": round(synth_s, 2),
+                "audio_s": round(audio_s, 2),
+                "rtf": round(synth_s / audio_s, 3) if audio_s else None,
+            }
+            outputs[name] = clips
+            pipeline_logger.info(f"⏱️ Kokoro {name}: {report[name]}")
+            del pipeline
+
+        report["quality"] = [
+            {
+                "duration_ratio": round(len(q) / len(e), 3) if len(e) else None,
+                "spectral_similarity": round(spectral_similarity(e, q), 4),
+            }
+            for e, q in zip(outputs["eager"], outputs["int8"])
+        ]
+        if report["eager"]["rtf"] and report["int8"]["rtf"]:
+            report["speedup"] = round(report["eager"]["rtf"] / report["int8"]["rtf"], 2)
+        return report
+
+
+if __name__ == "__main__":
+    # Usage: python -m processor.Kokoro.kokoro_int8 script_seq1.txt [script_seq2.txt ...]
+    import json
+    import sys
+    from pathlib import Path
+
+    if len(sys.argv) < 2:
+        sys.exit("usage: kokoro_int8.py NARRATION.txt [NARRATION.txt ...]")
+    texts = [Path(p).read_text(encoding="utf-8").strip() for p in sys.argv[1:]]
+    print(json.dumps(AudioFactory.benchmark(texts), indent=2))
@@ -0,0 +1,142 @@
+import os
+import re
+import shutil
+import tempfile
+from pathlib import Path
+
+
+# Manim's default Tex / Pango text cache folders inside a --media_dir
+ASSET_SUBDIRS = ("Tex", "texts")
+
+# Build intermediates that are not worth sharing
+SKIPPED_SUFFIXES = (".log", ".aux", ".tmp")
+
+
+def seed_assets(shared_dir, media_dir):
+    """
+    Populate `media_dir`'s Tex/texts folders from the shared asset cache.
+
+    Files are hard-linked where possible (copied otherwise), so a render finds
+    previously compiled formulas and text SVGs instead of rebuilding them. Manim
+    only writes cache files that don't exist yet, so linked files are never
+    modified in place. Returns the number of files seeded.
+    """
+    seeded = 0
+    for sub in ASSET_SUBDIRS:
+        src_dir = Path(shared_dir) / sub
+        if not src_dir.is_dir():
+            continue
+        dst_dir = Path(media_dir) / sub
+        dst_dir.mkdir(parents=True, exist_ok=True)
+
+        for entry in os.scandir(src_dir):
+            if not entry.is_file() or entry.name.endswith(SKIPPED_SUFFIXES):
+                continue
+            dst = dst_dir / entry.name
+            if dst.exists():
+                continue
+            try:
+                os.link(entry.path, dst)
+            except OSError:
+                try:
+                    shutil.copyfile(entry.path, dst)
+                except OSError:
+                    # Evicted or being replaced concurrently — manim will just rebuild it
+                    continue
+            try:
+                os.utime(entry.path)  # refresh LRU position, as DiskLRUCache.get does
+            except OSError:
+                pass
+            seeded += 1
+    return seeded
+
+
+def publish_assets(shared_dir, media_dir):
+    """
+    Copy Tex/text assets produced by a render into the shared cache.
+
+    Each file is written to a temp name in the cache folder and moved into place
+    with os.replace, so parallel renders never observe a partially written file.
+    Returns the number of files published.
+    """
+    published = 0
+    for sub in ASSET_SUBDIRS:
+        src_dir = Path(media_dir) / sub
+        if not src_dir.is_dir():
+            continue
+        dst_dir = Path(shared_dir) / sub
+        dst_dir.mkdir(parents=True, exist_ok=True)
+
+        for entry in os.scandir(src_dir):
+            if not entry.is_file() or entry.name.endswith(SKIPPED_SUFFIXES):
+                continue
+            dst = dst_dir / entry.name
+            if dst.exists():
+                continue
+            fd, tmp_path = tempfile.mkstemp(dir=dst_dir, suffix=".tmp")
+            os.close(fd)
+            try:
+                shutil.copyfile(entry.path, tmp_path)
+                os.replace(tmp_path, dst)
+                published += 1
+            except OSError:
+                continue
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+    return published
+
+
+def evict_assets(shared_dir, max_bytes):
+    """Drop the least recently used shared assets until the cache fits in `max_bytes`. Returns files removed."""
+    entries = []
+    for sub in ASSET_SUBDIRS:
+        sub_dir = Path(shared_dir) / sub
+        if not sub_dir.is_dir():
+            continue
+        for entry in os.scandir(sub_dir):
+            if entry.is_file() and not entry.name.endswith(".tmp"):
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, entry.path))
+
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+            total -= size
+            removed += 1
+        except OSError:
+            continue
+    return removed
+
+
+def extract_tex_strings(source: str):
+    """Pull literal MathTex/Tex arguments out of Manim source or catalog snippets."""
+    pattern = r"""\b(?:MathTex|Tex)\(\s*r?(["'])(.+?)\1"""
+    return [m.group(2) for m in re.finditer(pattern, source)]
+
+
+def prewarm_assets(shared_dir, formulas):
+    """
+    Compile `formulas` as MathTex once and publish the results to the shared cache.
+
+    Runs inside a render worker (manim already imported in "inprocess" mode).
+    Returns the number of files published.
+    """
+    from manim import MathTex, tempconfig
+
+    with tempfile.TemporaryDirectory(prefix="manim_prewarm_") as media_dir:
+        seed_assets(shared_dir, media_dir)
+        with tempconfig({"media_dir": media_dir}):
+            for formula in formulas:
+                try:
+                    MathTex(formula)
+                except Exception:
+                    continue
+        return publish_assets(shared_dir, media_dir)
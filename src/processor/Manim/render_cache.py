@@ -0,0 +1,34 @@
+from importlib import metadata
+from config import Settings
+from disk_cache import DiskLRUCache
+
+
+class RenderCache:
+    """Content-addressed cache of rendered scene videos (mp4), shared across pipelines."""
+
+    _cache = None
+
+    @staticmethod
+    def get_cache() -> DiskLRUCache:
+        if RenderCache._cache is None:
+            RenderCache._cache = DiskLRUCache(
+                Settings.RENDER_CACHE_DIR,
+                max_bytes=Settings.RENDER_CACHE_MAX_MB * 1024 * 1024,
+                suffix=".mp4",
+                name="render cache",
+            )
+        return RenderCache._cache
+
+    @staticmethod
+    def manim_version() -> str:
+        try:
+            return metadata.version("manim")
+        except metadata.PackageNotFoundError:
+            return "unknown"
+
+    @staticmethod
+    def scene_key(file, quality: str) -> str:
+        """Key = hash(scene source, quality preset, manim version)."""
+        with open(file, "rb") as f:
+            source = f.read()
+        return DiskLRUCache.make_key(source, quality, RenderCache.manim_version())
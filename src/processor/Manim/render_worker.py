@@ -0,0 +1,168 @@
+import os
+import re
+import sys
+import shutil
+import subprocess
+import traceback
+import importlib.util
+from pathlib import Path
+from processor.Manim.asset_cache import seed_assets, publish_assets
+
+
+# Manim CLI flag for each quality preset
+QUALITY_FLAGS = {
+    "low_quality": "-ql",
+    "medium_quality": "-qm",
+    "high_quality": "-qh",
+    "production_quality": "-qp",
+    "fourk_quality": "-qk",
+}
+
+
+def find_scene_video(file, media_dir):
+    """Locate the mp4 Manim rendered for the scene class defined in `file`."""
+    with open(file, "r", encoding="utf-8") as f:
+        content = f.read()
+
+    match = re.search(r"class\s+(\w+)\([^)]*Scene[^)]*\)", content)
+    pattern = f"{match.group(1)}.mp4" if match else "*.mp4"
+
+    found_files = list(Path(media_dir).rglob(pattern))
+    if not found_files:
+        return None
+    return str(max(found_files, key=os.path.getmtime))
+
+
+def _reset_media_dir(media_dir, asset_dir=None):
+    # Clean old media
+    if os.path.exists(media_dir):
+        shutil.rmtree(media_dir)
+    os.makedirs(media_dir, exist_ok=True)
+
+    # Reuse Tex/Text SVGs compiled by earlier scenes and sessions
+    if asset_dir:
+        seed_assets(asset_dir, media_dir)
+
+
+def _publish_media_assets(media_dir, asset_dir):
+    if asset_dir:
+        try:
+            publish_assets(asset_dir, media_dir)
+        except OSError:
+            pass
+
+
+def init_render_worker():
+    """Pool initializer for in-process mode: import manim (cairo, pango, numpy) once per worker."""
+    import manim  # noqa: F401
+
+
+def render_scene(file, media_dir, quality="low_quality", asset_dir=None):
+    """
+    Render a single Manim script into `media_dir`.
+
+    Runs inside a pool worker process, so it only touches the filesystem and
+    returns a plain dict; logging and transaction accounting stay in the parent.
+    """
+    result = {
+        "file": file,
+        "returncode": None,
+        "video_path": None,
+        "stdout": "",
+        "stderr": "",
+    }
+
+    try:
+        _reset_media_dir(media_dir, asset_dir)
+
+        # Run Manim
+        completed = subprocess.run(
+            ["poetry", "run", "manim", QUALITY_FLAGS.get(quality, "-ql"), file, "--media_dir", media_dir],
+            capture_output=True,
+            text=True
+        )
+        result["returncode"] = completed.returncode
+        result["stdout"] = completed.stdout.strip()
+        result["stderr"] = completed.stderr.strip()
+
+        if completed.returncode == 0:
+            result["video_path"] = find_scene_video(file, media_dir)
+        _publish_media_assets(media_dir, asset_dir)
+
+    except Exception as e:
+        result["returncode"] = -1
+        result["stderr"] = f"{type(e).__name__}: {e}"
+
+    return result
+
+
+def _load_scene_class(file, module_name):
+    """Import the generated script and return the Scene subclass it defines."""
+    from manim import Scene
+
+    spec = importlib.util.spec_from_file_location(module_name, file)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+
+    scenes = [
+        obj for obj in vars(module).values()
+        if isinstance(obj, type) and issubclass(obj, Scene) and obj.__module__ == module_name
+    ]
+    if not scenes:
+        raise LookupError(f"No Scene subclass found in {file}")
+
+    # Same rule as the subprocess path: the first `class X(...Scene...)` in the source wins
+    with open(file, "r", encoding="utf-8") as f:
+        match = re.search(r"class\s+(\w+)\([^)]*Scene[^)]*\)", f.read())
+    if match:
+        for scene in scenes:
+            if scene.__name__ == match.group(1):
+                return scene
+    return scenes[-1]
+
+
+def render_scene_inprocess(file, media_dir, quality="low_quality", asset_dir=None):
+    """
+    Render a single Manim script inside a pre-warmed pool worker.
+
+    Returns the same dict shape as `render_scene`, with the traceback in
+    `stderr` when the scene fails to load or render.
+    """
+    from manim import tempconfig
+
+    result = {
+        "file": file,
+        "returncode": None,
+        "video_path": None,
+        "stdout": "",
+        "stderr": "",
+    }
+    module_name = f"_manim_scene_{os.getpid()}_{Path(file).stem}"
+
+    try:
+        _reset_media_dir(media_dir, asset_dir)
+
+        with tempconfig({"media_dir": media_dir, "quality": quality, "input_file": file}):
+            scene_class = _load_scene_class(file, module_name)
+            scene = scene_class()
+            scene.render()
+            movie_path = getattr(scene.renderer.file_writer, "movie_file_path", None)
+
+        result["returncode"] = 0
+        result["stdout"] = f"Rendered {scene_class.__name__} in-process (pid {os.getpid()})"
+        if movie_path and os.path.exists(movie_path):
+            result["video_path"] = str(movie_path)
+        else:
+            result["video_path"] = find_scene_video(file, media_dir)
+
+    except Exception:
+        result["returncode"] = 1
+        result["stderr"] = traceback.format_exc().strip()
+
+    finally:
+        # Drop the scene module so a recycled worker does not accumulate them
+        sys.modules.pop(module_name, None)
+        _publish_media_assets(media_dir, asset_dir)
+
+    return result
@@ -1,10 +1,15 @@
 import os
-import subprocess
-import re
-import shutil
+import threading
 import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
+from config import Settings
+from media_handle import MediaHandle
 from logger import pipeline_logger, validation_logger
+from processor.Manim.render_worker import render_scene, render_scene_inprocess, init_render_worker
+from processor.Manim.render_cache import RenderCache
+from processor.Manim.asset_cache import evict_assets, extract_tex_strings, prewarm_assets
 from Transaction.transaction_handler import transaction
 from Transaction.excepetion import exception
 
@@ -12,64 +17,354 @@ from Transaction.excepetion import exception
 class VideoFactory:
     """Runs Manim scripts and saves videos in structured media folders."""
 
+    _executor = None
+    _executor_lock = threading.Lock()
+    _inflight = {}   # render cache key -> Future of a scene submitted ahead of the pipeline
+    _inflight_lock = threading.Lock()
+
     @staticmethod
-    def run_manim_on_files(generated_files, unique_id):
-        video_bytes_list = []
-        all_success = True   # Track overall success
+    def _get_worker_count():
+        """Resolve the render pool size from Settings (0 = one worker per CPU core)."""
+        return max(1, Settings.MANIM_RENDER_WORKERS or os.cpu_count() or 1)
+
+    @staticmethod
+    def _get_executor():
+        """
+        Return the long-lived render pool, creating it on first use.
+
+        In "inprocess" mode workers import manim once in their initializer and are
+        recycled after MANIM_WORKER_MAX_RENDERS renders to contain leaks.
+        """
+        with VideoFactory._executor_lock:
+            if VideoFactory._executor is None:
+                kwargs = {"max_workers": VideoFactory._get_worker_count()}
+                if Settings.MANIM_RENDER_MODE == "inprocess":
+                    kwargs["initializer"] = init_render_worker
+                    if Settings.MANIM_WORKER_MAX_RENDERS:
+                        kwargs["max_tasks_per_child"] = Settings.MANIM_WORKER_MAX_RENDERS
+                VideoFactory._executor = ProcessPoolExecutor(**kwargs)
+                pipeline_logger.info(
+                    f"🧵 Render pool started: {kwargs['max_workers']} worker(s), mode={Settings.MANIM_RENDER_MODE}"
+                )
+            return VideoFactory._executor
+
+    @staticmethod
+    def _reset_executor(broken):
+        """
+        Discard the `broken` pool so the next render starts a fresh one. A pool
+        that another pipeline already put in its place is left alone, so its
+        live futures are never cancelled.
+        """
+        with VideoFactory._executor_lock:
+            if VideoFactory._executor is broken:
+                VideoFactory._executor = None
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def _render_all(jobs, on_result=None):
+        """
+        Render (file, media_dir) jobs concurrently; results come back in job order.
+
+        `on_result(job_idx, result)` is called as each render finishes, in
+        completion order, so callers can start downstream work early.
+        """
+        if not jobs:
+            return []
+
+        quality = Settings.MANIM_QUALITY
+        asset_dir = str(Settings.MANIM_ASSET_CACHE_DIR) if Settings.MANIM_ASSET_CACHE_ENABLED else None
+        inprocess = Settings.MANIM_RENDER_MODE == "inprocess"
+        render_fn = render_scene_inprocess if inprocess else render_scene
+        pipeline_logger.info(f"🎬 Rendering {len(jobs)} scene(s) (mode={Settings.MANIM_RENDER_MODE})")
+
+        # A single subprocess worker gains nothing from a pool
+        results = [None] * len(jobs)
+        if not inprocess and VideoFactory._get_worker_count() == 1:
+            for idx, (file, media_dir) in enumerate(jobs):
+                results[idx] = render_scene(file, media_dir, quality, asset_dir)
+                if on_result:
+                    on_result(idx, results[idx])
+        else:
+            executor = VideoFactory._get_executor()
+            futures = {
+                executor.submit(render_fn, file, media_dir, quality, asset_dir): idx
+                for idx, (file, media_dir) in enumerate(jobs)
+            }
+            for future in as_completed(futures):
+                idx = futures[future]
+                try:
+                    results[idx] = future.result()
+                except BrokenProcessPool as e:
+                    VideoFactory._reset_executor(executor)
+                    results[idx] = VideoFactory._failed_result(jobs[idx][0], e)
+                except Exception as e:
+                    results[idx] = VideoFactory._failed_result(jobs[idx][0], e)
+                if on_result:
+                    on_result(idx, results[idx])
+
+        if asset_dir:
+            removed = evict_assets(asset_dir, Settings.MANIM_ASSET_CACHE_MAX_MB * 1024 * 1024)
+            if removed:
+                pipeline_logger.info(f"🧹 Tex/Text asset cache: evicted {removed} file(s)")
+        return results
+
+    @staticmethod
+    def prewarm_asset_cache(formulas=None):
+        """
+        Compile common formulas into the shared Tex cache on a render worker.
+
+        Defaults to Settings.MANIM_ASSET_PREWARM_FORMULAS plus any MathTex/Tex
+        literals in the Manim prompt template; returns a Future, or None when the
+        asset cache is disabled or there is nothing to compile.
+        """
+        if formulas is None:
+            formulas = list(Settings.MANIM_ASSET_PREWARM_FORMULAS)
+            try:
+                with open(Settings.TEST_MANIM_PROMPT_PATH_2, "r", encoding="utf-8") as f:
+                    formulas += extract_tex_strings(f.read())
+            except OSError:
+                pass
+        formulas = list(dict.fromkeys(formulas))
+        if not Settings.MANIM_ASSET_CACHE_ENABLED or not formulas:
+            return None
+        pipeline_logger.info(f"🔥 Pre-warming Tex cache with {len(formulas)} formula(s)")
+        return VideoFactory._get_executor().submit(prewarm_assets, str(Settings.MANIM_ASSET_CACHE_DIR), formulas)
+
+    @staticmethod
+    def _media_dir_for(file):
+        """Per-scene media dir: media/videos/<session folder>/<script name>."""
+        project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+        base_media_dir = os.path.join(project_root, "media", "videos")
+
+        # Detect session folder
+        parts = Path(file).parts
+        try:
+            session_folder = parts[-3]
+        except IndexError:
+            validation_logger.warning(f"⚠️ Could not detect session folder for {file}")
+            session_folder = "unknown_session"
+
+        script_folder = os.path.splitext(os.path.basename(file))[0]
+        return os.path.join(base_media_dir, session_folder, script_folder)
+
+    @staticmethod
+    def submit_early_render(file):
+        """
+        Start rendering one scene before the pipeline asks for it.
+
+        Used while the LLM is still generating later scenes. The result lands in
+        the render cache, and a pipeline that reaches the same scene while it is
+        still rendering waits on it instead of rendering twice. Returns the
+        Future, or None if the scene is already cached/in flight or caching is off.
+        """
+        if not Settings.RENDER_CACHE_ENABLED:
+            validation_logger.warning("⚠️ Early rendering needs RENDER_CACHE_ENABLED, skipping")
+            return None
 
         try:
-            project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
-            base_media_dir = os.path.join(project_root, "media", "videos")
+            key = RenderCache.scene_key(file, Settings.MANIM_QUALITY)
+        except OSError as e:
+            validation_logger.warning(f"⚠️ Could not hash {file} for early render: {e}")
+            return None
+
+        cache = RenderCache.get_cache()
+        with VideoFactory._inflight_lock:
+            if key in VideoFactory._inflight or cache.path_for(key).exists():
+                return None
+
+            asset_dir = str(Settings.MANIM_ASSET_CACHE_DIR) if Settings.MANIM_ASSET_CACHE_ENABLED else None
+            render_fn = render_scene_inprocess if Settings.MANIM_RENDER_MODE == "inprocess" else render_scene
+            executor = VideoFactory._get_executor()
+            future = executor.submit(
+                render_fn, file, VideoFactory._media_dir_for(file), Settings.MANIM_QUALITY, asset_dir
+            )
+            VideoFactory._inflight[key] = future
+
+        def store_early(done):
+            try:
+                result = done.result()
+                if result["returncode"] == 0 and result["video_path"]:
+                    cache.put(key, result["video_path"])
+                    pipeline_logger.info(f"⚡ Early render finished for {file}")
+                else:
+                    validation_logger.warning(f"⚠️ Early render failed for {file}")
+            except BrokenProcessPool as e:
+                VideoFactory._reset_executor(executor)
+                validation_logger.error(f"❌ Early render crashed for {file}: {e}")
+            except Exception as e:
+                validation_logger.error(f"❌ Early render crashed for {file}: {e}")
+            finally:
+                # Cache entry (if any) is in place before the in-flight entry goes away
+                with VideoFactory._inflight_lock:
+                    if VideoFactory._inflight.get(key) is done:
+                        del VideoFactory._inflight[key]
+
+        future.add_done_callback(store_early)
+        pipeline_logger.info(f"⚡ Early render submitted for {file}")
+        return future
+
+    @staticmethod
+    def _render_with_cache(jobs, on_result=None):
+        """
+        Serve scenes from the render cache where possible and render the rest.
 
+        Cache hits skip the render (and the media dir wipe) entirely; identical
+        scenes within one batch are rendered once. Early renders are waited on, and
+        rendered again here if they failed. Returns results in job order;
+        `on_result(job_idx, result)` fires as soon as each scene is available.
+        """
+        if not Settings.RENDER_CACHE_ENABLED:
+            return VideoFactory._render_all(jobs, on_result)
+
+        cache = RenderCache.get_cache()
+        results = [None] * len(jobs)
+        pending = {}   # cache key -> indexes of jobs waiting on that render
+        to_render = []
+
+        early = {}     # cache key -> early render still in flight
+        for idx, (file, media_dir) in enumerate(jobs):
+            try:
+                key = RenderCache.scene_key(file, Settings.MANIM_QUALITY)
+            except OSError as e:
+                validation_logger.warning(f"⚠️ Could not hash {file} for render cache: {e}")
+                to_render.append((idx, None, file, media_dir))
+                continue
+
+            if key in pending:
+                pending[key].append(idx)
+                continue
+
+            # Checked before the cache: an early render publishes to the cache first
+            with VideoFactory._inflight_lock:
+                early_future = VideoFactory._inflight.get(key)
+            if early_future is not None:
+                pipeline_logger.info(f"⚡ Waiting on early render for {file}")
+                pending[key] = [idx]
+                early[key] = early_future
+                continue
+
+            cached_path = cache.get(key)
+            if cached_path:
+                pipeline_logger.info(f"♻️ Render cache hit for {file}")
+                results[idx] = {
+                    "file": file, "returncode": 0, "video_path": str(cached_path),
+                    "stdout": "served from render cache", "stderr": "",
+                }
+                if on_result:
+                    on_result(idx, results[idx])
+                continue
+
+            pending[key] = [idx]
+            to_render.append((idx, key, file, media_dir))
+
+        def deliver(idx, key, result):
+            results[idx] = result
+            # Duplicate scenes share the first render's outcome
+            dup_indexes = pending[key][1:] if key is not None else []
+            for dup_idx in dup_indexes:
+                results[dup_idx] = dict(result, file=jobs[dup_idx][0])
+            if on_result:
+                for scene_idx in [idx] + dup_indexes:
+                    on_result(scene_idx, results[scene_idx])
+
+        def render(batch):
+            def store_rendered(render_idx, result):
+                idx, key, file, _ = batch[render_idx]
+                if key is not None and result["returncode"] == 0 and result["video_path"]:
+                    try:
+                        cache.put(key, result["video_path"])
+                    except OSError as e:
+                        validation_logger.warning(f"⚠️ Could not store {file} in render cache: {e}")
+                deliver(idx, key, result)
+
+            VideoFactory._render_all([(file, media_dir) for _, _, file, media_dir in batch], store_rendered)
+
+        def deliver_early(key, retry):
+            """Deliver a finished early render; a failed one is queued on `retry` to render normally."""
+            future = early.pop(key)
+            idx = pending[key][0]
+            file, media_dir = jobs[idx]
+            try:
+                result = dict(future.result(), file=file)
+            except Exception as e:
+                # A broken pool is reset by the early render's own callback (store_early)
+                result = VideoFactory._failed_result(file, e)
+            if result["returncode"] != 0 or not result["video_path"]:
+                validation_logger.warning(f"⚠️ Early render failed for {file}, rendering it again")
+                retry.append((idx, key, file, media_dir))
+                return
+            deliver(idx, key, result)
+
+        # Early renders that already finished go downstream before anything new renders
+        for key in [k for k, f in early.items() if f.done()]:
+            deliver_early(key, to_render)
+
+        render(to_render)
+
+        retry = []
+        for key in list(early):
+            deliver_early(key, retry)
+        if retry:
+            render(retry)
+        return results
+
+    @staticmethod
+    def _failed_result(file, error):
+        """Result dict for a scene whose worker died before returning."""
+        return {
+            "file": file, "returncode": -1, "video_path": None,
+            "stdout": "", "stderr": f"{type(error).__name__}: {error}",
+        }
+
+    @staticmethod
+    def run_manim_on_files(generated_files, unique_id, on_scene=None):
+        """
+        Render every py file and return MediaHandles for the videos in scene order.
+
+        If given, `on_scene(scene_idx, handle)` is called as soon as each scene's
+        video is available (completion order), e.g. to start muxing early.
+        """
+        video_handles = []
+        all_success = True   # Track overall success
+
+        try:
             total_words = 0
             total_tokens = 0
+            jobs = []
 
             for file in generated_files.get("py_files", []):
-                try:
-                    print("\n====================================")
-                    print(f"🧩 Processing File: {file}")
-                    pipeline_logger.info(f"🎬 Running Manim on {file} ...")
+                print("\n====================================")
+                print(f"🧩 Processing File: {file}")
+                pipeline_logger.info(f"🎬 Queueing Manim render for {file} ...")
 
-                    # Count words/tokens
-                    word_count, token_count = VideoFactory.count_words_in_file(file)
-                    total_words += word_count
-                    total_tokens += token_count
+                # Count words/tokens
+                word_count, token_count = VideoFactory.count_words_in_file(file)
+                total_words += word_count
+                total_tokens += token_count
 
-                    # Detect session folder
-                    parts = Path(file).parts
-                    try:
-                        session_folder = parts[-3]
-                    except IndexError:
-                        validation_logger.warning(f"⚠️ Could not detect session folder for {file}")
-                        session_folder = "unknown_session"
-
-                    # Output folder
-                    script_folder = os.path.splitext(os.path.basename(file))[0]
-                    custom_media_dir = os.path.join(base_media_dir, session_folder, script_folder)
-
-                    # Clean old media
-                    if os.path.exists(custom_media_dir):
-                        shutil.rmtree(custom_media_dir)
-                    os.makedirs(custom_media_dir, exist_ok=True)
-
-                    # Run Manim
-                    result = subprocess.run(
-                        ["poetry", "run", "manim", "-ql", file, "--media_dir", custom_media_dir],
-                        capture_output=True,
-                        text=True
-                    )
+                # Output folder
+                jobs.append((file, VideoFactory._media_dir_for(file)))
+
+            def emit_scene(scene_idx, result):
+                if result["returncode"] != 0 or not result["video_path"]:
+                    return
+                try:
+                    on_scene(scene_idx, MediaHandle.from_path(result["video_path"]))
+                except Exception as e:
+                    validation_logger.error(f"❌ on_scene callback failed for {result['file']}: {e}")
 
+            # Render all scenes through the cache + worker pool (results keep scene order)
+            for result in VideoFactory._render_with_cache(jobs, emit_scene if on_scene else None):
+                file = result["file"]
+                try:
                     # Manim failed for this file
-                    if result.returncode != 0:
+                    if result["returncode"] != 0:
                         all_success = False    # <-- Mark overall failure
-                        error_output = result.stderr.strip()
-                        stdout_output = result.stdout.strip()
-
                         full_error_log = (
                             f"\n❌ Error running Manim on {file}\n"
                             f"──────────────────────────────────────────────\n"
-                            f"STDERR:\n{error_output or '(no stderr)'}\n\n"
-                            f"STDOUT:\n{stdout_output or '(no stdout)'}\n"
+                            f"STDERR:\n{result['stderr'] or '(no stderr)'}\n\n"
+                            f"STDOUT:\n{result['stdout'] or '(no stdout)'}\n"
                             f"──────────────────────────────────────────────\n"
                         )
 
@@ -77,28 +372,18 @@ class VideoFactory:
                         print(full_error_log)
                         continue
 
-                    # Detect scene name
-                    with open(file, "r", encoding="utf-8") as f:
-                        content = f.read()
-
-                    match = re.search(r"class\s+(\w+)\([^)]*Scene[^)]*\)", content)
-                    pattern = f"{match.group(1)}.mp4" if match else "*.mp4"
-
                     # Find generated video
-                    found_files = list(Path(custom_media_dir).rglob(pattern))
-                    if not found_files:
+                    video_path = result["video_path"]
+                    if not video_path:
                         all_success = False    # <-- Missing video is failure
                         validation_logger.warning(f"⚠️ No video found for {file}")
                         continue
 
-                    video_path = max(found_files, key=os.path.getmtime)
-
-                    # Read video bytes
+                    # Hand the rendered file on by path (never loaded into memory)
                     try:
-                        with open(video_path, "rb") as f:
-                            video_bytes_list.append(f.read())
+                        video_handles.append(MediaHandle.from_path(video_path))
                     except Exception as read_err:
-                        all_success = False   # <-- Reading failed is failure
+                        all_success = False   # <-- Unreadable video is failure
                         validation_logger.error(f"❌ Failed to read video: {read_err}")
                         continue
 
@@ -112,9 +397,11 @@ class VideoFactory:
             # Summary
             summary_msg = (
                 f"Total words: {total_words} | Approx. GPT tokens: {total_tokens} | "
-                f"Total videos collected: {len(video_bytes_list)}"
+                f"Total videos collected: {len(video_handles)}"
             )
             pipeline_logger.info(summary_msg)
+            if Settings.RENDER_CACHE_ENABLED:
+                pipeline_logger.info(f"🗃️ Render cache stats: {RenderCache.get_cache().stats()}")
 
             # Final Transaction Status
             if all_success:
@@ -123,7 +410,7 @@ class VideoFactory:
                 transaction(unique_id, manim_output_status="Unsuccessful video generation")
                 exception(unique_id, type="video" ,description="At least one video failed to generate", module="VideoFactory")
 
-            return video_bytes_list
+            return video_handles
 
         except Exception as e:
             # Critical failure
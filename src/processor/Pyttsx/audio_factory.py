@@ -2,31 +2,55 @@
 from gtts import gTTS
 from io import BytesIO
 from pathlib import Path
+from config import Settings
 from logger import pipeline_logger, validation_logger
+from processor.tts_parallel import ParallelTTS
+from processor.tts_cache import TTSCache
+from processor.audio_utils import split_sentences, transcode_to_delivery
+from media_handle import MediaHandle
 
 
 class AudioFactory:
-    """Generates audio bytes from TXT files (memory-only)."""
+    """Generates audio from TXT files as MediaHandles carrying duration/format metadata."""
 
     @staticmethod
     def text_files_to_audio_bytes(generated_files, unique_id):
-        audio_bytes_list = []
+        # gTTS is network-bound: scenes are requested concurrently, results stay in scene order
+        audio_bytes_list = ParallelTTS.map_threads(
+            AudioFactory.synthesize_file, generated_files["txt_files"], unique_id
+        )
 
-        for txt_file in generated_files["txt_files"]:
-            txt_path = Path(txt_file) 
-            with open(txt_file, "r", encoding="utf-8") as f:
-                text = f.read().strip()
-            if not text:
-                validation_logger.warning(f"⚠️ Skipping empty file: {txt_file}")
-                continue
+        pipeline_logger.info(f"🎵 Total audio files generated: {len(audio_bytes_list)}")
+        return audio_bytes_list
 
-            tts = gTTS(text=text, lang="en")
-            mp3_fp = BytesIO()
-            tts.write_to_fp(mp3_fp)
-            mp3_fp.seek(0)
-            audio_bytes_list.append(mp3_fp.read())
+    @staticmethod
+    def synthesize_file(txt_file, unique_id):
+        txt_path = Path(txt_file) 
+        with open(txt_file, "r", encoding="utf-8") as f:
+            text = f.read().strip()
+        if not text:
+            validation_logger.warning(f"⚠️ Skipping empty file: {txt_file}")
+            return None
 
-            pipeline_logger.info(f"✅ Generated audio for: {txt_path.name} (in memory)")
+        # MP3 frames concatenate cleanly (gTTS itself joins its 100-char parts this way),
+        # so sentences are fetched — or reused from the cache — one by one
+        pieces = split_sentences(text) if Settings.TTS_CACHE_ENABLED else [text]
+        audio = b"".join(
+            TTSCache.cached_bytes(TTSCache.sentence_key("gtts", "en", piece), lambda: AudioFactory._fetch(piece))
+            for piece in pieces
+        )
 
-        pipeline_logger.info(f"🎵 Total audio files generated: {len(audio_bytes_list)}")
-        return audio_bytes_list
+        pipeline_logger.info(f"✅ Generated audio for: {txt_path.name} (in memory)")
+        if Settings.AUDIO_OUTPUT_FORMAT == "aac":
+            # Transcode once here so the merger can stream-copy it
+            return transcode_to_delivery(audio)
+        # MP3 has no sample count to go by: read duration/format off the file once, here
+        return MediaHandle.from_bytes(audio, ".mp3").probe()
+
+    @staticmethod
+    def _fetch(text):
+        tts = gTTS(text=text, lang="en")
+        mp3_fp = BytesIO()
+        tts.write_to_fp(mp3_fp)
+        mp3_fp.seek(0)
+        return mp3_fp.read()
@@ -0,0 +1,125 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from config import Settings
+from logger import pipeline_logger, validation_logger
+from processor.process_factory import ProcessFactory
+
+
+class AudioStage:
+    """
+    Runs narration synthesis ahead of the video stage.
+
+    `/generate-files-api` calls `start` right after the .txt files are written,
+    so TTS runs while the Manim code is still being generated. `process_pipeline`
+    later wraps its audio callable with `claim`, which returns the staged result
+    (waiting for it if still running) and falls back to fresh synthesis when
+    nothing usable was staged.
+    """
+
+    _executor = None
+    _staged = OrderedDict()   # unique_id -> (txt keys, future)
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _get_executor():
+        with AudioStage._lock:
+            if AudioStage._executor is None:
+                AudioStage._executor = ThreadPoolExecutor(
+                    max_workers=Settings.AUDIO_STAGE_WORKERS,
+                    thread_name_prefix="audio_stage",
+                )
+            return AudioStage._executor
+
+    @staticmethod
+    def _txt_keys(txt_files):
+        return [Path(f).as_posix() for f in txt_files]
+
+    @staticmethod
+    def _discard(future):
+        """Cancel a staged run, or delete the temp audio files it produced once it finishes."""
+        if future.cancel():
+            return
+
+        def release(done):
+            if done.cancelled() or done.exception() is not None:
+                return
+            for audio in done.result() or []:
+                if hasattr(audio, "release"):
+                    audio.release()
+
+        future.add_done_callback(release)
+
+    # ---------------- Producer ----------------
+    @staticmethod
+    def start(audio_processor: str, generated_files: dict, unique_id: str):
+        """Submit TTS for `generated_files["txt_files"]`, staged under `unique_id`."""
+        txt_files = generated_files.get("txt_files", [])
+        if not txt_files:
+            return None
+
+        audio_callable = ProcessFactory.get_processor(audio_processor, generated_files, unique_id)
+        future = AudioStage._get_executor().submit(audio_callable)
+
+        with AudioStage._lock:
+            AudioStage._staged.pop(unique_id, None)
+            AudioStage._staged[unique_id] = (AudioStage._txt_keys(txt_files), future)
+            # Drop the oldest entries nobody came back for
+            while len(AudioStage._staged) > Settings.AUDIO_STAGE_MAX_PENDING:
+                old_id, (_, old_future) = AudioStage._staged.popitem(last=False)
+                AudioStage._discard(old_future)
+                validation_logger.warning(f"⚠️ Dropped unclaimed staged audio for UID {old_id}")
+
+        pipeline_logger.info(f"🎙️ Audio synthesis started early for UID {unique_id} ({len(txt_files)} file(s))")
+        return future
+
+    # ---------------- Consumer ----------------
+    @staticmethod
+    def take(unique_id: str, txt_files):
+        """
+        Pop and return the staged audio list for `unique_id`, reordered to match
+        `txt_files`. Blocks until synthesis finishes. Returns None if nothing
+        matching was staged or the staged run failed.
+        """
+        with AudioStage._lock:
+            staged = AudioStage._staged.pop(unique_id, None)
+        if staged is None:
+            return None
+
+        staged_keys, future = staged
+        keys = AudioStage._txt_keys(txt_files)
+        if sorted(keys) != sorted(staged_keys):
+            validation_logger.warning(f"⚠️ Staged audio for UID {unique_id} was built from different files, discarding")
+            AudioStage._discard(future)
+            return None
+
+        try:
+            audio_bytes_list = future.result()
+        except Exception as e:
+            validation_logger.error(f"❌ Staged audio synthesis failed for UID {unique_id}: {e}")
+            return None
+
+        if keys == staged_keys:
+            return audio_bytes_list
+
+        # Same files, different order — remap only if every file produced audio
+        if len(audio_bytes_list) != len(staged_keys):
+            validation_logger.warning(f"⚠️ Staged audio for UID {unique_id} cannot be reordered, discarding")
+            for audio in audio_bytes_list:
+                if hasattr(audio, "release"):
+                    audio.release()
+            return None
+        by_file = dict(zip(staged_keys, audio_bytes_list))
+        return [by_file[k] for k in keys]
+
+    @staticmethod
+    def claim(audio_callable, unique_id: str, txt_files):
+        """Wrap `audio_callable` so staged audio is used when available."""
+        def run():
+            audio_bytes_list = AudioStage.take(unique_id, txt_files)
+            if audio_bytes_list is not None:
+                pipeline_logger.info(f"♻️ Using early-staged audio for UID {unique_id}")
+                return audio_bytes_list
+            return audio_callable()
+        return run
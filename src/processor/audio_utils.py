@@ -0,0 +1,155 @@
+import re
+import subprocess
+from io import BytesIO
+from tempfile import NamedTemporaryFile
+import numpy as np
+import soundfile as sf
+from config import Settings
+from media_handle import MediaHandle, PCMStreamWriter
+
+
+def to_pcm16(samples):
+    """
+    Peak-normalise float samples to int16, exactly as Coqui's `save_wav` does
+    before writing a file — so in-memory output matches the old temp WAVs.
+    """
+    samples = np.asarray(samples, dtype=np.float32)
+    if samples.size == 0:
+        return np.zeros(0, dtype=np.int16)
+    scale = 32767 / max(0.01, float(np.max(np.abs(samples))))
+    return (samples * scale).astype(np.int16)
+
+
+def join_with_silence(segments, sample_rate: int, gap_ms: int = 400, trailing: bool = True):
+    """
+    Concatenate `segments` with `gap_ms` of silence after each one (or only
+    between them when `trailing` is False).
+
+    The output buffer is allocated once at its final size and filled in place,
+    instead of growing an AudioSegment with repeated `+=`.
+    """
+    segments = [np.asarray(s) for s in segments]
+    dtype = segments[0].dtype if segments else np.int16
+    gap = int(sample_rate * gap_ms / 1000)
+    gaps = len(segments) if trailing else max(0, len(segments) - 1)
+
+    out = np.zeros(sum(len(s) for s in segments) + gap * gaps, dtype=dtype)
+    pos = 0
+    for seg in segments:
+        out[pos:pos + len(seg)] = seg
+        pos += len(seg) + gap
+    return out
+
+
+def encode_wav(samples, sample_rate: int) -> bytes:
+    """Encode mono samples as a WAV file in memory (16-bit PCM)."""
+    buffer = BytesIO()
+    sf.write(buffer, samples, samplerate=sample_rate, format="WAV", subtype="PCM_16")
+    return buffer.getvalue()
+
+
+def delivery_codec_args():
+    """ffmpeg output args for the delivery audio format (AAC at the shared rate/layout)."""
+    return [
+        "-ar", str(Settings.AUDIO_SAMPLE_RATE), "-ac", str(Settings.AUDIO_CHANNELS),
+        "-c:a", "aac", "-b:a", Settings.AUDIO_BITRATE,
+    ]
+
+
+def encode_delivery(samples, sample_rate: int) -> MediaHandle:
+    """Encode mono samples straight to delivery AAC (.m4a), resampled/upmixed by ffmpeg."""
+    writer = PCMStreamWriter(sample_rate, codec_args=delivery_codec_args())
+    try:
+        writer.write(samples)
+    except Exception:
+        writer.abort()
+        raise
+    return writer.close()
+
+
+def transcode_to_delivery(data: bytes) -> MediaHandle:
+    """Re-encode compressed audio bytes (e.g. gTTS MP3) to delivery AAC (.m4a)."""
+    with NamedTemporaryFile(delete=False, suffix=".m4a") as tmp:
+        out_path = tmp.name
+    result = subprocess.run(
+        ["ffmpeg", "-y", "-loglevel", "error", "-i", "pipe:0", "-vn", *delivery_codec_args(), out_path],
+        input=data, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+    )
+    handle = MediaHandle(out_path, codec="aac", owned=True)
+    if result.returncode != 0:
+        handle.release()
+        raise RuntimeError(f"ffmpeg audio transcode failed: {result.stderr.decode(errors='replace').strip()}")
+    # Compressed input has no sample count to go by: read the duration off the small output once
+    return handle.probe()
+
+
+def encode_audio(samples, sample_rate: int) -> MediaHandle:
+    """
+    Encode a finished mono narration in the configured AUDIO_OUTPUT_FORMAT.
+
+    The handle carries duration, codec, sample rate and channels computed from
+    the samples, so the merger never has to probe synthesized audio.
+    """
+    if Settings.AUDIO_OUTPUT_FORMAT == "aac":
+        # Already in the delivery codec: the merger can stream-copy it
+        return encode_delivery(samples, sample_rate)
+    return MediaHandle.from_bytes(
+        encode_wav(samples, sample_rate), ".wav",
+        duration=len(samples) / sample_rate, codec="pcm_s16le", sample_rate=sample_rate, channels=1,
+    )
+
+
+def split_sentences(text: str, delimiters: str = ".!?।"):
+    """Split narration after sentence-ending punctuation, keeping the punctuation."""
+    pattern = rf"(?<=[{re.escape(delimiters)}])\s+"
+    return [s.strip() for s in re.split(pattern, text) if s.strip()]
+
+
+def group_shards(sentences, min_chars: int):
+    """
+    Group consecutive sentences into shards of at least `min_chars` characters.
+
+    A short tail is folded into the previous shard. Texts shorter than two
+    shards (or min_chars <= 0) stay in one shard, where splitting would only
+    add overhead.
+    """
+    sentences = list(sentences)
+    if not sentences:
+        return []
+    if min_chars <= 0 or sum(len(s) for s in sentences) < 2 * min_chars:
+        return [sentences]
+
+    shards, current, size = [], [], 0
+    for sentence in sentences:
+        current.append(sentence)
+        size += len(sentence)
+        if size >= min_chars:
+            shards.append(current)
+            current, size = [], 0
+    if current:
+        shards[-1].extend(current)
+    return shards
+
+
+def average_spectrum(samples, n_fft: int = 1024):
+    """Long-term average magnitude spectrum (Hann-windowed frames, 50% overlap)."""
+    samples = np.asarray(samples, dtype=np.float32).ravel()
+    if len(samples) < n_fft:
+        samples = np.pad(samples, (0, n_fft - len(samples)))
+    hop = n_fft // 2
+    count = 1 + (len(samples) - n_fft) // hop
+    frames = np.stack([samples[i * hop:i * hop + n_fft] for i in range(count)])
+    return np.abs(np.fft.rfft(frames * np.hanning(n_fft), axis=1)).mean(axis=0)
+
+
+def spectral_similarity(reference, candidate, n_fft: int = 1024) -> float:
+    """
+    Cosine similarity (0..1) of two clips' average log spectra.
+
+    Insensitive to small timing differences, so it works as a quality
+    spot-check between model variants whose outputs differ in length.
+    """
+    a = np.log1p(average_spectrum(reference, n_fft))
+    b = np.log1p(average_spectrum(candidate, n_fft))
+    denom = float(np.linalg.norm(a) * np.linalg.norm(b))
+    return float(np.dot(a, b) / denom) if denom else 0.0
@@ -3,6 +3,7 @@ from processor.Pyttsx.audio_factory import AudioFactory as PyttsxAudioFactory
 from processor.Coqui.coquiTTs import AudioFactory as CoquiAudioFactory
 from processor.IndicTTS.indicTTs import AudioFactory as IndicTTSAudioFactory
 from processor.Kokoro.kokoro import AudioFactory as KokoroAudioFactory
+from processor.Kokoro.kokoro_int8 import AudioFactory as KokoroInt8AudioFactory
 
 
 class ProcessFactory:
@@ -10,22 +11,25 @@ class ProcessFactory:
     history_length = 10
 
     @staticmethod
-    def get_processor(processor_name: str, generated_files, unique_id):
+    def get_processor(processor_name: str, generated_files, unique_id, on_scene=None):
         if processor_name == "manim":
             ProcessFactory.process_history.append("manim")
-            return lambda: VideoFactory.run_manim_on_files(generated_files,unique_id)
+            return lambda: VideoFactory.run_manim_on_files(generated_files, unique_id, on_scene=on_scene)
         elif processor_name == "tts":
             ProcessFactory.process_history.append("tts")
             return lambda: PyttsxAudioFactory.text_files_to_audio_bytes(generated_files, unique_id)
         elif processor_name == "coqui":
             ProcessFactory.process_history.append("coqui")
-            return lambda: CoquiAudioFactory.text_files_to_audio_bytes(generated_files, unique_id)
+            return lambda: CoquiAudioFactory.text_files_to_audio_bytes(generated_files, unique_id, on_scene=on_scene)
         elif processor_name == "indic":
             ProcessFactory.process_history.append("indic")
-            return lambda: IndicTTSAudioFactory.text_files_to_audio_bytes(generated_files, unique_id)
+            return lambda: IndicTTSAudioFactory.text_files_to_audio_bytes(generated_files, unique_id, on_scene=on_scene)
         elif processor_name == "kokoro":
             ProcessFactory.process_history.append("kokoro")
-            return lambda: KokoroAudioFactory.text_files_to_audio_bytes(generated_files, unique_id)
+            return lambda: KokoroAudioFactory.text_files_to_audio_bytes(generated_files, unique_id, on_scene=on_scene)
+        elif processor_name == "kokoro_int8":
+            ProcessFactory.process_history.append("kokoro_int8")
+            return lambda: KokoroInt8AudioFactory.text_files_to_audio_bytes(generated_files, unique_id, on_scene=on_scene)
         else:
             raise Exception(f"❌ Processor {processor_name} not implemented")
 
@@ -0,0 +1,93 @@
+import re
+import unicodedata
+from io import BytesIO
+import numpy as np
+from config import Settings
+from disk_cache import DiskLRUCache
+
+
+class TTSCache:
+    """
+    Content-addressed cache of synthesized sentences, shared by every AudioFactory.
+
+    Keys are hash(backend, voice, normalized text, speed, sample rate), so a
+    retried lesson or a recurring intro line is synthesized once. Model
+    backends store sample arrays (.npy payloads, dtype preserved); gTTS stores
+    its mp3 bytes.
+    """
+
+    _cache = None
+
+    @staticmethod
+    def get_cache() -> DiskLRUCache:
+        if TTSCache._cache is None:
+            TTSCache._cache = DiskLRUCache(
+                Settings.TTS_CACHE_DIR,
+                max_bytes=Settings.TTS_CACHE_MAX_MB * 1024 * 1024,
+                suffix=".tts",
+                name="tts cache",
+            )
+        return TTSCache._cache
+
+    # ---------------- Keys ----------------
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        """Unicode NFC with runs of whitespace collapsed — formatting-only edits still hit."""
+        return re.sub(r"\s+", " ", unicodedata.normalize("NFC", text)).strip()
+
+    @staticmethod
+    def sentence_key(backend: str, voice: str, text: str, speed=1.0, sample_rate=None) -> str:
+        return DiskLRUCache.make_key(
+            backend, voice, TTSCache.normalize_text(text), f"{float(speed):g}", sample_rate or ""
+        )
+
+    # ---------------- Lookup / store ----------------
+    @staticmethod
+    def cached_bytes(key: str, synthesize):
+        """Return cached bytes for `key`, else `synthesize()` and store it (None is never cached)."""
+        if not Settings.TTS_CACHE_ENABLED:
+            return synthesize()
+
+        cache = TTSCache.get_cache()
+        path = cache.get(key)
+        if path is not None:
+            try:
+                return path.read_bytes()
+            except OSError:
+                pass  # evicted between lookup and read
+
+        data = synthesize()
+        if data is not None:
+            cache.put_bytes(key, data)
+        return data
+
+    @staticmethod
+    def cached_samples(key: str, synthesize):
+        """Like `cached_bytes`, for numpy sample arrays."""
+        def synthesize_npy():
+            samples = synthesize()
+            if samples is None:
+                return None
+            buffer = BytesIO()
+            np.save(buffer, np.asarray(samples), allow_pickle=False)
+            return buffer.getvalue()
+
+        data = TTSCache.cached_bytes(key, synthesize_npy)
+        if data is None:
+            return None
+        return np.load(BytesIO(data), allow_pickle=False)
+
+    # ---------------- Metrics ----------------
+    @staticmethod
+    def counters():
+        cache = TTSCache.get_cache()
+        return cache.hits, cache.misses
+
+    @staticmethod
+    def record(hits: int, misses: int):
+        """Fold lookups made in a worker process into this process's metrics."""
+        TTSCache.get_cache().add_counts(hits, misses)
+
+    @staticmethod
+    def stats() -> dict:
+        return TTSCache.get_cache().stats()
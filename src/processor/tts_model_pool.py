@@ -0,0 +1,195 @@
+import gc
+import os
+import threading
+import time
+from contextlib import contextmanager
+from config import Settings
+from logger import pipeline_logger, validation_logger
+
+try:
+    import psutil
+except ImportError:  # optional: /proc is used on Linux, memory eviction is skipped elsewhere
+    psutil = None
+
+
+def current_rss_mb():
+    """Resident memory of this process in MB, or None if it can't be measured."""
+    if psutil is not None:
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class TTSModelPool:
+    """
+    Process-wide pool of loaded TTS models, shared across pipelines.
+
+    Backends register a loader (and optional warmup) at import time; callers
+    borrow an instance with `acquire(name)`. Each backend keeps at most
+    TTS_POOL_MAX_INSTANCES models alive — extra callers wait for one to be
+    returned. Idle models are unloaded after TTS_POOL_IDLE_SECONDS, and
+    least-recently-used idle models are unloaded first while the process is
+    above TTS_POOL_MAX_RSS_MB.
+    """
+
+    _backends = {}    # name -> {"load": callable, "warmup": callable or None}
+    _idle = {}        # name -> [(last_used, model), ...]
+    _counts = {}      # name -> models alive (idle + borrowed)
+    _cond = threading.Condition()
+    _janitor = None
+
+    # ---------------- Registration ----------------
+    @staticmethod
+    def register(name, load, warmup=None):
+        with TTSModelPool._cond:
+            TTSModelPool._backends[name] = {"load": load, "warmup": warmup}
+            TTSModelPool._idle.setdefault(name, [])
+            TTSModelPool._counts.setdefault(name, 0)
+
+    @staticmethod
+    def _create(name):
+        spec = TTSModelPool._backends[name]
+        start = time.perf_counter()
+        model = spec["load"]()
+        if spec["warmup"]:
+            try:
+                spec["warmup"](model)
+            except Exception as e:
+                validation_logger.warning(f"⚠️ Warmup failed for {name} TTS model: {e}")
+        pipeline_logger.info(f"🧠 Loaded {name} TTS model in {time.perf_counter() - start:.1f}s")
+        return model
+
+    # ---------------- Borrowing ----------------
+    @staticmethod
+    @contextmanager
+    def acquire(name):
+        """Borrow a loaded model for `name`, loading one if the pool has room."""
+        model = TTSModelPool._checkout(name)
+        try:
+            yield model
+        finally:
+            TTSModelPool._checkin(name, model)
+
+    @staticmethod
+    def _checkout(name):
+        if name not in TTSModelPool._backends:
+            raise ValueError(f"❌ TTS backend {name} is not registered")
+        TTSModelPool._start_janitor()
+
+        with TTSModelPool._cond:
+            while True:
+                idle = TTSModelPool._idle[name]
+                if idle:
+                    _, model = idle.pop()   # most recently used first
+                    return model
+                if TTSModelPool._counts[name] < max(1, Settings.TTS_POOL_MAX_INSTANCES):
+                    TTSModelPool._counts[name] += 1
+                    break
+                TTSModelPool._cond.wait()
+
+        # Load outside the lock so other backends stay usable meanwhile
+        try:
+            return TTSModelPool._create(name)
+        except Exception:
+            with TTSModelPool._cond:
+                TTSModelPool._counts[name] -= 1
+                TTSModelPool._cond.notify_all()
+            raise
+
+    @staticmethod
+    def _checkin(name, model):
+        with TTSModelPool._cond:
+            TTSModelPool._idle[name].append((time.monotonic(), model))
+            TTSModelPool._cond.notify_all()
+        TTSModelPool.evict()
+
+    @staticmethod
+    def preload(names):
+        """Load and warm up one model per backend (e.g. at API startup)."""
+        for name in names:
+            if name in TTSModelPool._backends:
+                with TTSModelPool.acquire(name):
+                    pass
+
+    # ---------------- Eviction ----------------
+    @staticmethod
+    def _forget(names):
+        """Bookkeeping after unloading; the caller drops its references before gc runs."""
+        gc.collect()
+        with TTSModelPool._cond:
+            for name in names:
+                TTSModelPool._counts[name] -= 1
+            TTSModelPool._cond.notify_all()
+        for name in names:
+            pipeline_logger.info(f"🧹 Unloaded idle {name} TTS model")
+
+    @staticmethod
+    def evict(now=None):
+        """Unload expired idle models, then LRU idle models while over the RSS budget. Returns count."""
+        now = now if now is not None else time.monotonic()
+        expired = []
+        with TTSModelPool._cond:
+            if Settings.TTS_POOL_IDLE_SECONDS:
+                for name, idle in TTSModelPool._idle.items():
+                    keep = []
+                    for last_used, model in idle:
+                        if now - last_used > Settings.TTS_POOL_IDLE_SECONDS:
+                            expired.append(name)
+                        else:
+                            keep.append((last_used, model))
+                    idle[:] = keep
+                model = keep = None
+        removed = len(expired)
+        if expired:
+            TTSModelPool._forget(expired)
+
+        limit = Settings.TTS_POOL_MAX_RSS_MB
+        while limit:
+            rss = current_rss_mb()
+            if rss is None or rss <= limit:
+                break
+            with TTSModelPool._cond:
+                candidates = [
+                    (idle[i][0], name, i)
+                    for name, idle in TTSModelPool._idle.items()
+                    for i in range(len(idle))
+                ]
+                if not candidates:
+                    break
+                _, name, i = min(candidates)
+                del TTSModelPool._idle[name][i]
+            validation_logger.warning(f"⚠️ RSS {rss:.0f} MB over TTS budget ({limit} MB), unloading {name}")
+            TTSModelPool._forget([name])
+            removed += 1
+        return removed
+
+    @staticmethod
+    def _start_janitor():
+        """Background sweep so idle models are unloaded even when no request comes in."""
+        with TTSModelPool._cond:
+            if TTSModelPool._janitor is not None or not Settings.TTS_POOL_SWEEP_SECONDS:
+                return
+
+            def sweep():
+                while True:
+                    time.sleep(Settings.TTS_POOL_SWEEP_SECONDS)
+                    try:
+                        TTSModelPool.evict()
+                    except Exception as e:
+                        validation_logger.error(f"❌ TTS pool sweep failed: {e}")
+
+            TTSModelPool._janitor = threading.Thread(target=sweep, name="tts_pool_janitor", daemon=True)
+            TTSModelPool._janitor.start()
+
+    # ---------------- Metrics ----------------
+    @staticmethod
+    def stats() -> dict:
+        with TTSModelPool._cond:
+            return {
+                name: {"alive": TTSModelPool._counts[name], "idle": len(TTSModelPool._idle[name])}
+                for name in TTSModelPool._backends
+            }
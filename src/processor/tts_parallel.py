@@ -0,0 +1,236 @@
+import os
+import threading
+import multiprocessing
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from config import Settings
+from media_handle import PCMStreamWriter
+from logger import pipeline_logger, validation_logger, flush_postgres_logs
+from processor.tts_model_pool import TTSModelPool
+from processor.tts_cache import TTSCache
+from processor.audio_utils import delivery_codec_args
+from Transaction.status_writer import StatusWriter
+
+
+# ---------------- Worker side ----------------
+def _init_tts_worker(backend, synthesize_shard, threads):
+    # Unpickling `synthesize_shard` imported the backend module, which registered it
+    try:
+        import torch
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+    TTSModelPool.preload([backend])
+
+
+def _synthesize_in_worker(backend, synthesize_shard, sentences, txt_name, unique_id):
+    hits, misses = TTSCache.counters()
+    with TTSModelPool.acquire(backend) as model:
+        result = synthesize_shard(model, sentences, txt_name, unique_id)
+    # Status rows and error logs queued by this shard should reach the DB before the worker process can exit,
+    # but a slow or unreachable DB must not stall synthesis: both waits are bounded
+    StatusWriter.flush(timeout=Settings.STATUS_QUEUE_BLOCK_SECONDS)
+    flush_postgres_logs(timeout=Settings.LOG_DB_FLUSH_INTERVAL_MS / 1000 + Settings.DB_CONNECT_TIMEOUT_SECONDS)
+    # Report this shard's cache lookups so the parent's metrics cover all workers
+    after_hits, after_misses = TTSCache.counters()
+    return result, after_hits - hits, after_misses - misses
+
+
+class ParallelTTS:
+    """
+    Scene- and sentence-parallel narration synthesis.
+
+    Network-bound backends (gTTS) expose a per-file `synthesize_file` and fan
+    out over a shared thread pool. Model-based backends split each narration
+    into sentence shards (`read_shards`), synthesize shards on a per-backend
+    process pool whose workers each keep their own resident model
+    (`synthesize_shard`), and stitch a file's shards back together in the
+    parent (`assemble`). Results always come back in scene order, with skipped
+    files dropped, exactly as the sequential loops did.
+    """
+
+    _thread_executor = None
+    _process_executors = {}   # backend -> ProcessPoolExecutor
+    _lock = threading.Lock()
+
+    # ---------------- Pools ----------------
+    @staticmethod
+    def _get_thread_executor():
+        with ParallelTTS._lock:
+            if ParallelTTS._thread_executor is None:
+                ParallelTTS._thread_executor = ThreadPoolExecutor(
+                    max_workers=max(1, Settings.TTS_THREAD_WORKERS),
+                    thread_name_prefix="tts",
+                )
+            return ParallelTTS._thread_executor
+
+    @staticmethod
+    def _get_process_executor(backend, synthesize_shard):
+        with ParallelTTS._lock:
+            executor = ParallelTTS._process_executors.get(backend)
+            if executor is None:
+                workers = Settings.TTS_PROCESS_WORKERS
+                # Split the cores between workers so torch threads don't oversubscribe
+                threads = max(1, (os.cpu_count() or 1) // workers)
+                executor = ProcessPoolExecutor(
+                    max_workers=workers,
+                    # torch is not fork-safe once it has started its thread pools
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_tts_worker,
+                    initargs=(backend, synthesize_shard, threads),
+                )
+                ParallelTTS._process_executors[backend] = executor
+                pipeline_logger.info(f"🧵 TTS pool started: {workers} {backend} worker(s), {threads} thread(s) each")
+            return executor
+
+    @staticmethod
+    def _reset_process_executor(backend):
+        with ParallelTTS._lock:
+            executor = ParallelTTS._process_executors.pop(backend, None)
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    # ---------------- Mapping ----------------
+    @staticmethod
+    def map_threads(synthesize_file, txt_files, unique_id):
+        """Run `synthesize_file(txt_file, unique_id)` concurrently; ordered, skips dropped."""
+        txt_files = list(txt_files)
+        if len(txt_files) <= 1 or Settings.TTS_THREAD_WORKERS <= 1:
+            results = [synthesize_file(f, unique_id) for f in txt_files]
+        else:
+            executor = ParallelTTS._get_thread_executor()
+            results = list(executor.map(lambda f: synthesize_file(f, unique_id), txt_files))
+        ParallelTTS._log_cache_stats()
+        return [audio for audio in results if audio is not None]
+
+    @staticmethod
+    def map_shards(backend, factory, txt_files, unique_id, on_scene=None):
+        """
+        Synthesize `txt_files` with a model-based backend.
+
+        `factory` provides read_shards(txt_file, unique_id) -> [[sentence, ...], ...]
+        or None to skip, synthesize_shard(model, sentences, txt_name, unique_id)
+        -> (samples, sample_rate) or None, assemble(txt_file, shards,
+        unique_id) -> MediaHandle or None, and shard_gap_ms(). Shards of every file
+        share one queue, so a long narration no longer runs serially on a single
+        core. With TTS_PROCESS_WORKERS <= 1 (or a single shard) this process's
+        resident model is used.
+
+        With `on_scene(idx, handle)` (idx = position in `txt_files`), each narration's PCM is piped into an
+        ffmpeg encoder shard by shard as results arrive, and the finished
+        MediaHandle is handed over as soon as its last shard is written.
+        """
+        txt_files = list(txt_files)
+        file_shards = [factory.read_shards(f, unique_id) for f in txt_files]
+        tasks = [
+            (file_idx, sentences, Path(txt_files[file_idx]).name)
+            for file_idx, shards in enumerate(file_shards) if shards
+            for sentences in shards
+        ]
+        results = ParallelTTS._shard_results(backend, factory, tasks, unique_id)
+
+        if on_scene is not None:
+            audio_list = ParallelTTS._stream_shards(factory, tasks, results, on_scene)
+            ParallelTTS._log_cache_stats()
+            return audio_list
+
+        # Regroup shards per file (tasks are in file order) and stitch each narration
+        by_file = {}
+        for (file_idx, _, _), result in zip(tasks, results):
+            by_file.setdefault(file_idx, []).append(result)
+
+        audio_bytes_list = []
+        for file_idx, shards in sorted(by_file.items()):
+            if len(shards) > 1:
+                pipeline_logger.info(f"🧩 {Path(txt_files[file_idx]).name}: stitched {len(shards)} shard(s)")
+            audio = factory.assemble(txt_files[file_idx], shards, unique_id)
+            if audio is not None:
+                audio_bytes_list.append(audio)
+
+        ParallelTTS._log_cache_stats()
+        return audio_bytes_list
+
+    @staticmethod
+    def _shard_results(backend, factory, tasks, unique_id):
+        """
+        Yield each task's shard result in task order. If the worker pool
+        crashes, it is discarded and the remaining shards run in this process.
+        """
+        done = 0
+        if len(tasks) > 1 and Settings.TTS_PROCESS_WORKERS > 1:
+            executor = ParallelTTS._get_process_executor(backend, factory.synthesize_shard)
+            futures = [
+                executor.submit(_synthesize_in_worker, backend, factory.synthesize_shard, sentences, name, unique_id)
+                for _, sentences, name in tasks
+            ]
+            try:
+                for future in futures:
+                    result, hits, misses = future.result()
+                    TTSCache.record(hits, misses)
+                    done += 1
+                    yield result
+            except BrokenProcessPool as e:
+                validation_logger.error(f"❌ {backend} TTS pool crashed ({e}), synthesizing the rest sequentially")
+                ParallelTTS._reset_process_executor(backend)
+
+        if done < len(tasks):
+            with TTSModelPool.acquire(backend) as model:
+                for _, sentences, name in tasks[done:]:
+                    yield factory.synthesize_shard(model, sentences, name, unique_id)
+
+    @staticmethod
+    def _stream_shards(factory, tasks, results, on_scene):
+        """Pipe shard PCM into one encoder per narration; a failed shard drops its narration."""
+        remaining = {}
+        for file_idx, _, _ in tasks:
+            remaining[file_idx] = remaining.get(file_idx, 0) + 1
+
+        handles, writer, failed = [], None, False
+        try:
+            for (file_idx, _, name), result in zip(tasks, results):
+                if result is None:
+                    failed = True
+                elif not failed:
+                    samples, sample_rate = result
+                    if writer is None:
+                        writer = PCMStreamWriter(sample_rate, codec_args=delivery_codec_args())
+                    else:
+                        writer.write_silence(factory.shard_gap_ms())
+                    writer.write(samples)
+
+                remaining[file_idx] -= 1
+                if remaining[file_idx]:
+                    continue
+
+                # Last shard of this narration: finish it and hand it on immediately
+                finished, writer = writer, None
+                if finished is None:
+                    failed = False
+                    continue
+                if failed:
+                    finished.abort()
+                    failed = False
+                    continue
+                try:
+                    handle = finished.close()
+                except RuntimeError as e:
+                    validation_logger.error(f"❌ Streaming audio for {name} failed: {e}")
+                    continue
+                pipeline_logger.info(f"🌊 Streamed narration for {name} ({handle.duration:.1f}s)")
+                # Scene index, not success count: a dropped narration must not shift later ones
+                on_scene(file_idx, handle)
+                handles.append(handle)
+        finally:
+            if writer is not None:
+                writer.abort()
+        return handles
+
+    @staticmethod
+    def _log_cache_stats():
+        if Settings.TTS_CACHE_ENABLED:
+            stats = TTSCache.stats()
+            pipeline_logger.info(
+                f"🎯 TTS cache: {stats['hits']} hit(s), {stats['misses']} miss(es), "
+                f"hit rate {stats['hit_rate']:.0%}, {stats['entries']} sentence(s) stored"
+            )
@@ -2,6 +2,10 @@ import os
 import psycopg2
 from pathlib import Path
 from logger import pipeline_logger
+from media_handle import MediaHandle
+from db_pool import DBPool
+from migrations import Migrations
+from config import Settings
 from datetime import datetime
 
 
@@ -22,8 +26,11 @@ class LocalSaver(BaseSaver):
         os.makedirs(self.BASE_OUTPUT_DIR, exist_ok=True)
         output_path = self.BASE_OUTPUT_DIR / filename
 
-        with open(output_path, "wb") as f:
-            f.write(video_bytes)
+        if isinstance(video_bytes, MediaHandle):
+            video_bytes.copy_to(output_path)
+        else:
+            with open(output_path, "wb") as f:
+                f.write(video_bytes)
 
         pipeline_logger.info(f"✅ Final video saved locally at: {output_path}")
         return str(output_path)
@@ -31,6 +38,8 @@ class LocalSaver(BaseSaver):
 
 # --- Postgres Saver ---
 class PostgresSaver(BaseSaver):
+    _created_tables = set()   # (database, table) for tables outside the schema migration
+
     def save(self, video_bytes: bytes, filename: str, db_credentials=None):
         if not filename.lower().endswith(".mp4"):
             filename = f"{filename}.mp4"
@@ -38,34 +47,37 @@ class PostgresSaver(BaseSaver):
         if not db_credentials:
             raise ValueError("❌ No DB credentials provided for Postgres saving")
 
-        conn = psycopg2.connect(
-            host=db_credentials["host"],
-            port=db_credentials["port"],
-            user=db_credentials["user"],
-            password=db_credentials["password"],
-            dbname=db_credentials["dbname"],
-        )
-        cursor = conn.cursor()
-
-        table = db_credentials.get("table", "videos")
-
-        cursor.execute(f"""
-            CREATE TABLE IF NOT EXISTS {table} (
-                id SERIAL PRIMARY KEY,
-                filename TEXT,
-                video BYTEA,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        table = db_credentials.get("table", Settings.FINAL_VIDEO_TABLE)
+        if table == Settings.FINAL_VIDEO_TABLE:
+            Migrations.ensure(db_credentials)
+
+        # BYTEA needs the content itself — the one place a handle is read into memory
+        if isinstance(video_bytes, MediaHandle):
+            video_bytes = video_bytes.read_bytes()
+
+        with DBPool.connection(db_credentials) as conn:
+            cursor = conn.cursor()
+
+            # Custom tables aren't covered by the migration: create them once per process
+            table_key = (DBPool._key(db_credentials), table)
+            if table != Settings.FINAL_VIDEO_TABLE and table_key not in PostgresSaver._created_tables:
+                cursor.execute(f"""
+                    CREATE TABLE IF NOT EXISTS {table} (
+                        id SERIAL PRIMARY KEY,
+                        filename TEXT,
+                        video BYTEA,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                """)
+
+            cursor.execute(
+                f"INSERT INTO {table} (filename, video) VALUES (%s, %s)",
+                (filename, psycopg2.Binary(video_bytes))
             )
-        """)
+            conn.commit()
+            PostgresSaver._created_tables.add(table_key)
 
-        cursor.execute(
-            f"INSERT INTO {table} (filename, video) VALUES (%s, %s)",
-            (filename, psycopg2.Binary(video_bytes))
-        )
-        conn.commit()
-
-        cursor.close()
-        conn.close()
+            cursor.close()
 
         pipeline_logger.info(f"✅ Final video saved in PostgreSQL table '{table}' as {filename}")
         return f"postgres://{db_credentials['host']}:{db_credentials['port']}/{db_credentials['dbname']}/{table}/{filename}"
@@ -90,7 +102,7 @@ class SaverFactory:
     @staticmethod
     def save_all_script_media(video_bytes_list, audio_bytes_list, generated_files):
         """
-        Saves each script step video/audio into fixed output paths:
+        Saves each script step video/audio (bytes or MediaHandle) into fixed output paths:
         Videos -> C:\Vivek_Main\tutter\src\output\Video
         Audios -> C:\Vivek_Main\tutter\src\output\Audio
         Naming: <parent_folder_name>_script_seq<seq>.mp4/.mp3
@@ -127,7 +139,11 @@ class SaverFactory:
             video_path = videos_dir / video_filename
             audio_path = audios_dir / audio_filename
 
-            if v_bytes:
+            if isinstance(v_bytes, MediaHandle):
+                v_bytes.copy_to(video_path)
+                pipeline_logger.info(f"🎬 Video saved at: {video_path}")
+                video_paths.append(str(video_path))
+            elif v_bytes:
                 with open(video_path, "wb") as f:
                     f.write(v_bytes)
                 pipeline_logger.info(f"🎬 Video saved at: {video_path}")
@@ -135,7 +151,13 @@ class SaverFactory:
             else:
                 pipeline_logger.warning(f"⚠ Video bytes for step {idx} are empty, file not saved.")
 
-            if a_bytes:
+            if isinstance(a_bytes, MediaHandle):
+                if a_bytes.path.suffix == ".m4a":
+                    audio_path = audio_path.with_suffix(".m4a")  # delivery-format AAC narration
+                a_bytes.copy_to(audio_path)
+                pipeline_logger.info(f"🎵 Audio saved at: {audio_path}")
+                audio_paths.append(str(audio_path))
+            elif a_bytes:
                 with open(audio_path, "wb") as f:
                     f.write(a_bytes)
                 pipeline_logger.info(f"🎵 Audio saved at: {audio_path}")
@@ -1,9 +1,11 @@
 import os
-import psycopg2
+from db_pool import DBPool
+from migrations import Migrations
 import random
 import string
 from datetime import datetime
 from psycopg2 import sql
+from psycopg2.extras import execute_values
 from config import Settings
 from logger import pipeline_logger, validation_logger
 POSTGRES = Settings.POSTGRES
@@ -19,11 +21,14 @@ class Table_gen:
         return f"{topic_name}_{date_part}_{random_part}"
 
     @staticmethod
-    def table_generator(generated_files, PathList):
+    def table_generator(generated_files, PathList, narrations=None):
         """
         Saves records to PostgreSQL using file paths instead of byte arrays.
         PathList: [{'video_paths': [...], 'audio_paths': [...]}]
+        narrations: {script folder name: narration text}, already in memory
+        (see Artifacts.artifacts.load_script_data); nothing is read from disk here.
         """
+        narrations = narrations or {}
         base_path = generated_files[1]
         topic_name = os.path.basename(base_path)
 
@@ -39,82 +44,62 @@ class Table_gen:
         if len(audio_paths) != len(txt_files):
             validation_logger.warning("⚠ Warning: number of audio paths and txt files do not match!")
 
+        # Build every row first, so the DB sees a single INSERT
+        rows = []
+        for i, py_file in enumerate(py_files):
+            script_name = os.path.splitext(os.path.basename(py_file))[0]
+            video_path = video_paths[i] if i < len(video_paths) else None
+            audio_path = audio_paths[i] if i < len(audio_paths) else None
+
+            # TTS script, keyed like its file (script_seqN.txt -> "script_seqN")
+            tts_script = None
+            if i < len(txt_files):
+                tts_script = narrations.get(os.path.splitext(os.path.basename(txt_files[i]))[0])
+                if tts_script is None:
+                    validation_logger.warning(f"⚠ No narration loaded for {script_name}")
+
+            # Generate unique content_id
+            content_id = Table_gen._generate_content_id(topic_name)
+            rows.append((
+                content_id,
+                script_name,
+                video_path,
+                VIDEO_Type,
+                tts_script,
+                AUDIO_Type,
+                audio_path,
+                "save",
+                None,
+            ))
+
+        if not rows:
+            return
+
+        # Table comes from the schema migration (migrations.Migrations), so only DML runs here
+        Migrations.ensure(POSTGRES)
+
+        conn = cur = None
         try:
-            # Connect to PostgreSQL
-            conn = psycopg2.connect(
-                host=POSTGRES["host"],
-                port=POSTGRES["port"],
-                user=POSTGRES["user"],
-                password=POSTGRES["password"],
-                dbname=POSTGRES["dbname"],
-            )
+            # Borrow a pooled PostgreSQL connection
+            conn = DBPool.getconn(POSTGRES)
             cur = conn.cursor()
 
-            # Create table if not exists
-            cur.execute(
+            # Insert all records with file paths in one round trip
+            execute_values(
+                cur,
                 sql.SQL(
                     """
-                    CREATE TABLE IF NOT EXISTS {table} (
-                        content_id TEXT PRIMARY KEY,
-                        video_script TEXT,
-                        video_path TEXT,
-                        video_type TEXT,
-                        tts_script TEXT,
-                        tts_type TEXT,
-                        tts_path TEXT,
-                        creation_timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        update_timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        flag TEXT,
-                        exception TEXT
-                    )
+                    INSERT INTO {table}
+                    (content_id, video_script, video_path, video_type,
+                     tts_script, tts_type, tts_path,
+                     flag, exception)
+                    VALUES %s
                     """
-                ).format(table=sql.Identifier(POSTGRES["table"]))
+                ).format(table=sql.Identifier(POSTGRES["table"])),
+                rows,
             )
-
-            # Insert rows
-            for i, py_file in enumerate(py_files):
-                script_name = os.path.splitext(os.path.basename(py_file))[0]
-                video_path = video_paths[i] if i < len(video_paths) else None
-                audio_path = audio_paths[i] if i < len(audio_paths) else None
-
-                # Read TTS script
-                tts_script = None
-                if i < len(txt_files):
-                    try:
-                        with open(txt_files[i], "r", encoding="utf-8") as f:
-                            tts_script = f.read()
-                    except Exception as e:
-                        validation_logger.error(f"⚠ Could not read TTS file for {script_name}: {e}")
-
-                # Generate unique content_id
-                content_id = Table_gen._generate_content_id(topic_name)
-
-                # Insert record with file paths
-                cur.execute(
-                    sql.SQL(
-                        """
-                        INSERT INTO {table}
-                        (content_id, video_script, video_path, video_type,
-                         tts_script, tts_type, tts_path,
-                         flag, exception)
-                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                        """
-                    ).format(table=sql.Identifier(POSTGRES["table"])),
-                    (
-                        content_id,
-                        script_name,
-                        video_path,
-                        VIDEO_Type,
-                        tts_script,
-                        AUDIO_Type,
-                        audio_path,
-                        "save",
-                        None,
-                    ),
-                )
-                pipeline_logger.info(f"✅ Inserted record {content_id} with paths")
-
             conn.commit()
+            pipeline_logger.info(f"✅ Inserted {len(rows)} record(s) with paths: {', '.join(row[0] for row in rows)}")
 
         except Exception as e:
             validation_logger.error(f"❌ Database error: {e}")
@@ -123,4 +108,4 @@ class Table_gen:
             if cur:
                 cur.close()
             if conn:
-                conn.close()
\ No newline at end of file
+                DBPool.putconn(conn)
\ No newline at end of file
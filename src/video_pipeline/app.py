@@ -1,4 +1,6 @@
+import threading
 from fastapi import FastAPI
+from config import Settings
 from video_pipeline.routes import (
     search_routes,
     file_routes,
@@ -6,6 +8,11 @@ from video_pipeline.routes import (
     write_routes,
     video_routes
 )
+from processor.Manim.video_factory import VideoFactory
+from processor.tts_model_pool import TTSModelPool
+from db_pool import DBPool
+from migrations import Migrations
+from Transaction.status_writer import StatusWriter
 
 app = FastAPI(title="🎬 Modular Video Processing Pipeline API")
 
@@ -16,6 +23,31 @@ app.include_router(generator_routes.router)
 app.include_router(write_routes.router)   # 👈 important
 app.include_router(video_routes.router)
 
+@app.on_event("startup")
+def apply_schema_migrations():
+    # Create/upgrade every pipeline table once, so status writes are plain DML
+    Migrations.ensure()
+
+@app.on_event("startup")
+def prewarm_render_assets():
+    # Compile common formulas into the shared Tex cache before the first render
+    VideoFactory.prewarm_asset_cache()
+
+@app.on_event("startup")
+def preload_tts_model():
+    # Load the configured TTS backend in the background so the first request doesn't pay for it
+    if Settings.TTS_PRELOAD:
+        threading.Thread(
+            target=TTSModelPool.preload, args=([Settings.AUDIO_PROCESSOR],),
+            name="tts_preload", daemon=True,
+        ).start()
+
+@app.on_event("shutdown")
+def close_db_pool():
+    # Write queued status rows, then return pooled PostgreSQL connections cleanly
+    StatusWriter.flush(timeout=Settings.STATUS_QUEUE_BLOCK_SECONDS)
+    DBPool.closeall()
+
 @app.get("/")
 def root():
     return {"message": "🚀 Modular Video Pipeline API Running!"}
@@ -137,10 +137,9 @@
 
 # video_pipeline/drive_utils.py
 import os
-import io
 from pathlib import Path
 from googleapiclient.discovery import build
-from googleapiclient.http import MediaIoBaseUpload
+from googleapiclient.http import MediaFileUpload
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.oauth2.credentials import Credentials
 from google.oauth2 import service_account
@@ -320,9 +319,8 @@ def upload_folder_to_drive(folder_path: str, auth_mode: str = None):
                         else "text/plain" if filename.endswith((".txt", ".py"))
                         else "application/octet-stream"
                     )
-                    with open(local_file, "rb") as f:
-                        file_bytes = io.BytesIO(f.read())
-                    media = MediaIoBaseUpload(file_bytes, mimetype=mime_type)
+                    # Streamed from disk in chunks, never read whole into memory
+                    media = MediaFileUpload(local_file, mimetype=mime_type, resumable=True)
                     metadata = {"name": filename, "parents": [current_parent_id]}
                     uploaded = service.files().create(
                         body=metadata,
@@ -363,9 +361,8 @@ def upload_folder_to_drive(folder_path: str, auth_mode: str = None):
                         else "text/plain" if filename.endswith((".txt", ".py"))
                         else "application/octet-stream"
                     )
-                    with open(local_file, "rb") as f:
-                        file_bytes = io.BytesIO(f.read())
-                    media = MediaIoBaseUpload(file_bytes, mimetype=mime_type)
+                    # Streamed from disk in chunks, never read whole into memory
+                    media = MediaFileUpload(local_file, mimetype=mime_type, resumable=True)
                     metadata = {"name": filename, "parents": [current_parent_id]}
                     uploaded = service.files().create(
                         body=metadata,
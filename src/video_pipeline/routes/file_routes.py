@@ -4,6 +4,7 @@ from video_pipeline.utils import save_temp_json
 from logger import pipeline_logger
 from config import Settings
 from main import prepare_files
+from processor.audio_stage import AudioStage
 from pydantic import BaseModel
 from Transaction.transaction_handler import transaction
 from Transaction.excepetion import exception
@@ -32,6 +33,9 @@ async def generate_files_endpoint(request: GenerateFilesRequest):
         finally:
             Settings.JSON_FILE_PATH = old_path
 
+        # Narration is final now — synthesize it while Manim code is still being generated
+        if Settings.EARLY_AUDIO_STAGE:
+            AudioStage.start(Settings.AUDIO_PROCESSOR, generated, unique_id)
 
         return {
             "status": "success",
@@ -1,8 +1,9 @@
 from fastapi import APIRouter, HTTPException
 from typing import List, Dict
 from LLM_Processor.codeGen_factory import CodeGenerator
-from video_pipeline.utils import async_post
-from logger import pipeline_logger
+from video_pipeline.utils import async_post, latest_input_folder, write_scene_script
+from processor.Manim.video_factory import VideoFactory
+from logger import pipeline_logger, validation_logger
 from config import Settings
 from pydantic import BaseModel
 
@@ -14,12 +15,27 @@ class GenerateFilesRequest(BaseModel):
     input_data: List[Dict]
     unique_id: str
 
+
+def render_as_generated(unique_id: str):
+    """on_code callback: write each scene as soon as it arrives and start rendering it."""
+    def on_code(name, manim_code):
+        try:
+            folder = latest_input_folder(Settings.TEMP_GENERATED_FOLDER, unique_id)
+        except FileNotFoundError as e:
+            # /generate-files-api hasn't created the folder yet; /write-scripts will cover it
+            validation_logger.warning(f"⚠️ Early render skipped for {name}: {e}")
+            return
+        file_path = write_scene_script(folder, name, manim_code)
+        VideoFactory.submit_early_render(str(file_path))
+    return on_code
+
 @router.post("/Generator")
 async def generate_code_endpoint(request: GenerateFilesRequest):
     """Generate Manim Python code & forward to /write-scripts."""
     try:
         generator = CodeGenerator(API_KEY)
-        result = generator.generate_code(request.input_data, request.unique_id)
+        on_code = render_as_generated(request.unique_id) if Settings.STREAMING_RENDER else None
+        result = generator.generate_code(request.input_data, request.unique_id, on_code=on_code)
         pipeline_logger.info("🎬 Generated Manim Code Successfully")
         write_url = f"{Settings.IP_ADDRESS }/write-scripts"
         payload = {
@@ -2,7 +2,7 @@ from fastapi import APIRouter, HTTPException
 from pydantic import RootModel, BaseModel
 from typing import List, Dict
 from pathlib import Path
-from video_pipeline.utils import async_post, latest_input_folder
+from video_pipeline.utils import async_post, latest_input_folder, write_scene_script
 from logger import pipeline_logger, validation_logger
 from Transaction.transaction_handler import transaction
 from Transaction.excepetion import exception
@@ -57,18 +57,11 @@ async def write_scripts(data: GenerateFilesRequest):
         try:
             for item in data.result_data:
                 for name, content in item.items():
-                    target = folder / name
-                    target.mkdir(parents=True, exist_ok=True)
-                    file_path = target / f"{name}.py"
-
                     try:
-                        file_path.write_text(
-                            content.encode("utf-8").decode("unicode_escape"),
-                            encoding="utf-8"
-                        )
+                        file_path = write_scene_script(folder, name, content)
                         pipeline_logger.info(f"✅ Script written: {file_path}")
                     except Exception as fe:
-                        validation_logger.error(f"❌ File write failed: {file_path} | {fe}")
+                        validation_logger.error(f"❌ File write failed: {folder / name} | {fe}")
                         exception(
                             unique_id,
                             script_written="Script file write failed",
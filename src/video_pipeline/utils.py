@@ -1,6 +1,8 @@
 import json
+import os
 from datetime import datetime
 from pathlib import Path
+from tempfile import NamedTemporaryFile
 from fastapi import HTTPException
 import httpx
 from logger import pipeline_logger
@@ -45,6 +47,35 @@ def latest_input_folder(base_dir: Path, unique_id: str) -> Path:
     return max(folders, key=lambda d: d.stat().st_mtime)
 
 
+def write_scene_script(folder: Path, name: str, content: str) -> Path:
+    """
+    Write one generated Manim script to <folder>/<name>/<name>.py and return its path.
+
+    The file is replaced atomically (temp file + os.replace), and left untouched
+    when it already holds the same script, so an early render started on it
+    never reads a partly written file.
+    """
+    target = folder / name
+    target.mkdir(parents=True, exist_ok=True)
+    file_path = target / f"{name}.py"
+    text = content.encode("utf-8").decode("unicode_escape")
+
+    try:
+        if file_path.read_text(encoding="utf-8") == text:
+            return file_path
+    except (OSError, UnicodeDecodeError):
+        pass
+
+    with NamedTemporaryFile("w", encoding="utf-8", dir=target, suffix=".tmp", delete=False) as tmp:
+        tmp.write(text)
+    try:
+        os.replace(tmp.name, file_path)
+    except OSError:
+        os.remove(tmp.name)
+        raise
+    return file_path
+
+
 def save_temp_json(data):
     print("data", data)
     unique_id = data.unique_id  # ✅ Works with Pydantic model
@@ -0,0 +1,24 @@
+import json
+from Artifacts.artifacts import load_script_data
+
+
+def test_script_data_is_loaded_from_the_run_folder(tmp_path):
+    run = tmp_path / "20261017_uid"
+    (run / "script_seq1").mkdir(parents=True)
+    (run / "uid.json").write_text(json.dumps([{"script_seq": 1}]), encoding="utf-8")
+    (run / "script_seq1" / "script_seq1.py").write_text("code", encoding="utf-8")
+    (run / "script_seq1" / "script_seq1.txt").write_text("narration", encoding="utf-8")
+
+    data = load_script_data("uid", str(run))
+    assert data["codes"] == {"script_seq1": "code"}
+    assert data["narrations"] == {"script_seq1": "narration"}
+    assert data["folder_name"] == "input_data_20261017_uid"
+
+
+def test_create_table_falls_through_when_migration_is_unavailable(monkeypatch):
+    from Artifacts.artifacts import ScriptDataHandler
+    from migrations import Migrations
+
+    monkeypatch.setattr(Migrations, "ensure", staticmethod(lambda credentials=None: False))
+    handler = ScriptDataHandler("json", "manim", {}, "uid")
+    handler.create_table()   # no raise: the insert still gets its chance
@@ -0,0 +1,17 @@
+import os
+from processor.Manim.asset_cache import seed_assets, evict_assets
+
+
+def test_seeded_assets_survive_eviction(tmp_path):
+    shared = tmp_path / "shared" / "Tex"
+    shared.mkdir(parents=True)
+    for i, name in enumerate(("used.svg", "unused.svg")):
+        path = shared / name
+        path.write_bytes(b"x" * 100)
+        os.utime(path, (1000 + i, 1000 + i))   # "used" is the older file
+
+    assert seed_assets(tmp_path / "shared", tmp_path / "media") == 2
+    os.utime(shared / "unused.svg", (500, 500))   # last touched before that render
+
+    assert evict_assets(tmp_path / "shared", max_bytes=100) == 1
+    assert (shared / "used.svg").exists() and not (shared / "unused.svg").exists()
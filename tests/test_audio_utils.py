@@ -0,0 +1,100 @@
+from io import BytesIO
+
+import numpy as np
+import soundfile as sf
+from pydub import AudioSegment
+
+from processor.audio_utils import (
+    to_pcm16, join_with_silence, encode_wav, split_sentences, group_shards, spectral_similarity,
+)
+
+
+def test_to_pcm16_peak_normalises():
+    pcm = to_pcm16([0.0, 0.25, -0.5])
+    assert pcm.dtype == np.int16
+    assert pcm.tolist() == [0, 16383, -32767]
+    assert to_pcm16([]).size == 0
+
+
+def test_join_with_silence_places_gaps_after_each_segment():
+    out = join_with_silence([np.array([1, 2], dtype=np.int16), np.array([3], dtype=np.int16)], 1000, gap_ms=2)
+    assert out.tolist() == [1, 2, 0, 0, 3, 0, 0]
+    out = join_with_silence([np.array([1], dtype=np.int16), np.array([3], dtype=np.int16)], 1000, gap_ms=2, trailing=False)
+    assert out.tolist() == [1, 0, 0, 3]
+
+
+def test_split_sentences_keeps_punctuation():
+    assert split_sentences("One. Two?  Three! चार। five") == ["One.", "Two?", "Three!", "चार।", "five"]
+
+
+def test_group_shards_respects_min_length():
+    sentences = ["a" * 10, "b" * 10, "c" * 10, "d" * 10, "e" * 3]
+    assert group_shards(sentences, 0) == [sentences]
+    assert group_shards(sentences, 40) == [sentences]          # too short to be worth splitting
+    assert group_shards(sentences, 20) == [sentences[:2], sentences[2:]]   # short tail folded in
+    assert group_shards([], 20) == []
+
+
+def test_matches_pydub_concatenation():
+    rate = 22050
+    parts = [to_pcm16(np.sin(np.linspace(0, 50, n))) for n in (2205, 4410)]
+
+    # Old path: per-part WAV + AudioSegment.silent(400) accumulated with +=
+    expected = AudioSegment.empty()
+    for part in parts:
+        expected += AudioSegment.from_wav(BytesIO(encode_wav(part, rate))) + AudioSegment.silent(duration=400)
+
+    data, sr = sf.read(BytesIO(encode_wav(join_with_silence(parts, rate, gap_ms=400), rate)), dtype="int16")
+    expected = np.array(expected.get_array_of_samples())
+    assert sr == rate
+    # Speech is sample-identical; pydub's resampled 11 kHz silence can be a sample short per gap
+    assert data[:2205].tolist() == expected[:2205].tolist()
+    assert abs(len(data) - len(expected)) <= len(parts)
+    assert not data[2205:2205 + 8800].any()
+
+
+def test_spectral_similarity_tolerates_timing_but_not_timbre():
+    t = np.arange(24000) / 24000
+    tone = np.sin(2 * np.pi * 220 * t)
+    stretched = np.sin(2 * np.pi * 220 * np.arange(26400) / 24000)   # 10% longer, same content
+    noise = np.random.default_rng(0).standard_normal(24000)
+
+    assert spectral_similarity(tone, tone) > 0.999
+    assert spectral_similarity(tone, stretched) > 0.99
+    assert spectral_similarity(tone, noise) < spectral_similarity(tone, stretched)
+
+
+def test_encode_delivery_uses_shared_rate_and_layout():
+    from media_handle import probe_media
+    from processor.audio_utils import encode_delivery, transcode_to_delivery
+
+    handle = encode_delivery(np.zeros(24000, dtype=np.float32), 24000)
+    again = transcode_to_delivery(encode_wav(np.zeros(22050, dtype=np.int16), 22050))
+    try:
+        for h in (handle, again):
+            info = probe_media(h.path)
+            assert info["audio"] == ("aac", 48000, "stereo")
+            assert abs(info["duration"] - 1.0) < 0.1
+            assert h.audio_format == ("aac", 48000, 2)
+            assert abs(h.duration - info["duration"]) < 0.1
+    finally:
+        handle.release()
+        again.release()
+
+
+def test_encode_audio_metadata_matches_the_file(monkeypatch):
+    from config import Settings
+    from media_handle import MediaHandle
+    from processor.audio_utils import encode_audio
+
+    monkeypatch.setattr(Settings, "AUDIO_OUTPUT_FORMAT", "native")
+    handle = encode_audio(np.zeros(36000, dtype=np.float32), 24000)
+    try:
+        assert handle.path.suffix == ".wav" and handle.owned
+        assert handle.duration == 1.5
+        assert handle.audio_format == ("pcm_s16le", 24000, 1)
+        probed = MediaHandle.from_path(handle.path, probe=True)
+        assert probed.audio_format == handle.audio_format
+        assert abs(probed.duration - handle.duration) < 0.01
+    finally:
+        handle.release()
@@ -1,4 +1,5 @@
 import json
+from contextlib import contextmanager
 import pytest
 from pathlib import Path
 from src.parsers.base_handler import JsonHandler, PostgresHandler, InputHandlerFactory
@@ -60,7 +61,11 @@ def test_postgres_handler_handle(monkeypatch, tmp_path):
         def cursor(self): return FakeCursor()
         def close(self): pass
 
-    monkeypatch.setattr("parsers.base_handler.psycopg2.connect", lambda **kwargs: FakeConn())
+    @contextmanager
+    def fake_connection(credentials=None):
+        yield FakeConn()
+
+    monkeypatch.setattr("parsers.base_handler.DBPool.connection", fake_connection)
 
     # Fake _generate_files
     monkeypatch.setattr(handler, "_generate_files", lambda data, base, file_types: {"data": data})
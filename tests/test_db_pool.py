@@ -0,0 +1,127 @@
+import pytest
+import psycopg2
+from psycopg2 import extensions
+from config import Settings
+from db_pool import DBPool
+
+
+CREDENTIALS = {"host": "db", "port": 5432, "user": "u", "password": "p", "dbname": "d", "table": "videos"}
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+    def execute(self, *args):
+        if self.conn.dead:
+            raise psycopg2.OperationalError("server closed the connection unexpectedly")
+    def close(self): pass
+    def __enter__(self): return self
+    def __exit__(self, *exc): self.close()
+
+
+class FakeInfo:
+    transaction_status = extensions.TRANSACTION_STATUS_IDLE
+
+
+class FakeConn:
+    def __init__(self):
+        self.closed = 0
+        self.dead = False
+        self.info = FakeInfo()
+    def cursor(self): return FakeCursor(self)
+    def rollback(self): pass
+    def commit(self): pass
+    def close(self): self.closed = 1
+
+
+@pytest.fixture
+def connects(monkeypatch):
+    """Record every new connection the pools open."""
+    opened = []
+    def fake_connect(*args, **kwargs):
+        assert "table" not in kwargs
+        opened.append(FakeConn())
+        return opened[-1]
+    monkeypatch.setattr(psycopg2, "connect", fake_connect)
+    monkeypatch.setattr(Settings, "DB_POOL_MIN_CONN", 1)
+    monkeypatch.setattr(Settings, "DB_POOL_MAX_CONN", 2)
+    monkeypatch.setattr(Settings, "DB_POOL_TIMEOUT_SECONDS", 0.1)
+    monkeypatch.setattr(Settings, "DB_POOL_HEALTHCHECK_SECONDS", 60)
+    DBPool.closeall()
+    yield opened
+    DBPool.closeall()
+
+
+def test_connections_are_reused(connects):
+    for _ in range(3):
+        with DBPool.connection(CREDENTIALS) as conn:
+            assert conn is connects[0]
+
+    stats = DBPool.stats()["u@db:5432/d"]
+    assert len(connects) == 1
+    assert stats["checkouts"] == 3 and stats["in_use"] == 0 and stats["idle"] == 1
+
+
+def test_callers_beyond_max_wait_then_time_out(connects):
+    first, second = DBPool.getconn(CREDENTIALS), DBPool.getconn(CREDENTIALS)
+    with pytest.raises(psycopg2.OperationalError, match="No free PostgreSQL connection"):
+        DBPool.getconn(CREDENTIALS)
+
+    DBPool.putconn(first)
+    third = DBPool.getconn(CREDENTIALS)
+    assert third is first
+    stats = DBPool.stats()["u@db:5432/d"]
+    assert stats["waits"] == 1 and stats["timeouts"] == 1 and stats["in_use"] == 2
+    DBPool.putconn(second)
+    DBPool.putconn(third)
+
+
+def test_dropped_connection_is_replaced(connects, monkeypatch):
+    with DBPool.connection(CREDENTIALS) as conn:
+        pass
+    conn.dead = True
+    monkeypatch.setattr(Settings, "DB_POOL_HEALTHCHECK_SECONDS", 0)
+
+    with DBPool.connection(CREDENTIALS) as fresh:
+        assert fresh is not conn and not fresh.closed
+    assert conn.closed
+    assert DBPool.stats()["u@db:5432/d"]["replaced"] == 1
+
+
+def test_broken_connection_is_discarded(connects):
+    with pytest.raises(psycopg2.OperationalError):
+        with DBPool.connection(CREDENTIALS) as conn:
+            raise psycopg2.OperationalError("connection reset")
+    assert conn.closed
+    with DBPool.connection(CREDENTIALS) as fresh:
+        assert fresh is not conn
+
+
+def test_slow_connect_does_not_block_other_callers(connects, monkeypatch):
+    import threading
+    import time
+    with DBPool.connection(CREDENTIALS):
+        pass
+
+    release = threading.Event()
+    real_connect = psycopg2.connect
+
+    def slow_connect(*args, **kwargs):
+        if kwargs.get("host") == "slow":
+            release.wait(5)
+        return real_connect(*args, **kwargs)
+
+    monkeypatch.setattr(psycopg2, "connect", slow_connect)
+    slow = threading.Thread(target=lambda: DBPool.putconn(DBPool.getconn({**CREDENTIALS, "host": "slow"})))
+    slow.start()
+    try:
+        # While the slow server is connecting, the existing pool and stats() stay usable
+        start = time.monotonic()
+        with DBPool.connection(CREDENTIALS) as conn:
+            assert conn is connects[0]
+        assert "u@db:5432/d" in DBPool.stats()
+        assert time.monotonic() - start < 2
+    finally:
+        release.set()
+        slow.join(5)
+    assert "u@slow:5432/d" in DBPool.stats()
@@ -0,0 +1,61 @@
+import os
+import time
+from disk_cache import DiskLRUCache
+
+
+def test_make_key_is_stable_and_boundary_safe():
+    assert DiskLRUCache.make_key("abc", "ql") == DiskLRUCache.make_key(b"abc", "ql")
+    assert DiskLRUCache.make_key("ab", "cql") != DiskLRUCache.make_key("abc", "ql")
+
+
+def test_get_put_counts_hits_and_misses(tmp_path):
+    cache = DiskLRUCache(tmp_path / "cache", max_bytes=1024, suffix=".mp4")
+    src = tmp_path / "scene.mp4"
+    src.write_bytes(b"video")
+    key = DiskLRUCache.make_key("scene source")
+
+    assert cache.get(key) is None
+    stored = cache.put(key, src)
+    assert stored.read_bytes() == b"video"
+    assert cache.get(key) == stored
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["entries"] == 1
+    assert stats["hit_rate"] == 0.5
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = DiskLRUCache(tmp_path, max_bytes=20, suffix=".bin")
+    cache.put_bytes("old", b"x" * 10)
+    cache.put_bytes("recent", b"y" * 10)
+
+    # Make "old" clearly older, then touch "recent" via a hit
+    past = time.time() - 100
+    os.utime(cache.path_for("old"), (past, past))
+    assert cache.get("recent") is not None
+
+    cache.put_bytes("new", b"z" * 10)
+
+    assert not cache.path_for("old").exists()
+    assert cache.path_for("recent").exists()
+    assert cache.path_for("new").exists()
+
+
+def test_puts_under_budget_do_not_rescan(tmp_path, monkeypatch):
+    cache = DiskLRUCache(tmp_path, max_bytes=100, suffix=".bin")
+    cache.put_bytes("first", b"x" * 10)   # seeds the running total
+
+    scans = []
+    real_entries = cache._entries
+    monkeypatch.setattr(cache, "_entries", lambda: scans.append(1) or real_entries())
+    for i in range(5):
+        cache.put_bytes(f"k{i}", b"y" * 10)
+    cache.put_bytes("k0", b"z" * 5)   # replacing shrinks the total
+    assert scans == []
+    assert cache._bytes == 55
+
+    cache.put_bytes("big", b"w" * 60)   # over budget: scan once and evict
+    assert scans == [1]
+    assert cache._bytes <= 100
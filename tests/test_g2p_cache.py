@@ -0,0 +1,55 @@
+from processor.Kokoro.g2p_cache import G2PCache
+
+
+class Token:
+    def __init__(self, text):
+        self.text = text
+        self.start_ts = None
+
+
+class FakeG2P:
+    lexicon = "fake lexicon"
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, text):
+        self.calls.append(text)
+        return text.upper(), [Token(w) for w in text.split()]
+
+
+def test_repeated_chunks_skip_g2p_and_return_fresh_tokens(tmp_path):
+    g2p = FakeG2P()
+    cache = G2PCache(g2p, "a", tmp_path / "g2p.sqlite3")
+
+    phonemes, tokens = cache("pythagoras theorem")
+    tokens[0].start_ts = 1.5   # KPipeline mutates tokens when joining timestamps
+    again, fresh = cache("pythagoras theorem")
+
+    assert g2p.calls == ["pythagoras theorem"]
+    assert again == phonemes == "PYTHAGORAS THEOREM"
+    assert [t.text for t in fresh] == ["pythagoras", "theorem"]
+    assert fresh[0].start_ts is None
+    assert cache.lexicon == "fake lexicon"
+    assert cache.stats() == {"hits": 1, "misses": 1, "hit_rate": 0.5, "entries": 1}
+
+
+def test_persists_across_restarts_per_language(tmp_path):
+    db = tmp_path / "g2p.sqlite3"
+    G2PCache(FakeG2P(), "a", db)("integral of x")
+
+    g2p = FakeG2P()
+    reopened = G2PCache(g2p, "a", db)
+    reopened("integral of x")
+    G2PCache(g2p, "b", db)("integral of x")
+
+    assert g2p.calls == ["integral of x"]   # only the other language code missed
+
+
+def test_prune_keeps_most_recent(tmp_path):
+    cache = G2PCache(FakeG2P(), "a", tmp_path / "g2p.sqlite3")
+    for text in ("one", "two", "three"):
+        cache(text)
+
+    assert cache.prune(2) == 1
+    assert cache.stats()["entries"] == 2
@@ -0,0 +1,82 @@
+import logging
+import queue
+import threading
+from config import Settings
+from logger import BufferedQueueHandler, PostgresErrorHandler, PostgresLogListener, formatter
+
+
+class RecordingHandler(PostgresErrorHandler):
+    """Collects batches instead of inserting them."""
+
+    def __init__(self):
+        super().__init__("pipeline", Settings.POSTGRES)
+        self.batches = []
+        self.caller_threads = set()
+
+    def emit_batch(self, records):
+        self.caller_threads.add(threading.current_thread().name)
+        self.batches.append([(r.log_type, getattr(r, "part_name", None), r.getMessage()) for r in records])
+
+
+def make_logger(name, buffer, log_type="pipeline"):
+    logger = logging.getLogger(name)
+    logger.propagate = False
+    logger.handlers.clear()
+    handler = BufferedQueueHandler(buffer, log_type)
+    handler.setLevel(logging.ERROR)
+    handler.setFormatter(formatter)
+    logger.addHandler(handler)
+    return logger
+
+
+def test_records_are_written_in_batches_off_the_calling_thread(monkeypatch):
+    monkeypatch.setattr(Settings, "LOG_DB_FLUSH_INTERVAL_MS", 200)
+    buffer = queue.Queue(maxsize=100)
+    sink = RecordingHandler()
+    listener = PostgresLogListener(buffer, sink)
+    logger = make_logger("test_db_batches", buffer, "validation")
+
+    listener.start()
+    for i in range(5):
+        logger.error(f"❌ Scene {i} failed", extra={"part_name": "VideoFactory"})
+    assert listener.flush(timeout=5)
+    listener.stop(timeout=5)
+
+    rows = [row for batch in sink.batches for row in batch]
+    assert len(rows) == 5 and len(sink.batches) < 5
+    assert rows[0][0] == "validation" and rows[0][1] == "VideoFactory"
+    assert rows[0][2].endswith("❌ Scene 0 failed") and "[ERROR]" in rows[0][2]
+    assert sink.caller_threads == {"postgres_log_writer"}
+
+
+def test_full_buffer_drops_instead_of_blocking():
+    buffer = queue.Queue(maxsize=2)
+    logger = make_logger("test_db_drops", buffer)
+    dropped = BufferedQueueHandler.dropped
+
+    for i in range(4):
+        logger.error(f"burst {i}")          # no listener: the buffer fills up
+    assert buffer.qsize() == 2
+    assert BufferedQueueHandler.dropped == dropped + 2
+
+
+def test_stop_flushes_what_is_buffered(monkeypatch):
+    monkeypatch.setattr(Settings, "LOG_DB_FLUSH_INTERVAL_MS", 60000)
+    buffer = queue.Queue(maxsize=100)
+    sink = RecordingHandler()
+    listener = PostgresLogListener(buffer, sink)
+    logger = make_logger("test_db_stop", buffer)
+
+    listener.start()
+    logger.error("last words")
+    listener.stop(timeout=5)
+    assert [row[2].endswith("last words") for batch in sink.batches for row in batch] == [True]
+
+
+def test_flush_without_a_running_listener_returns_at_once():
+    buffer = queue.Queue(maxsize=10)
+    listener = PostgresLogListener(buffer, RecordingHandler())
+    assert listener.flush()
+    make_logger("test_db_not_started", buffer).error("❌ queued before start")
+    # No thread drains the buffer, so this must not wait for the (absent) timeout
+    assert not listener.flush()
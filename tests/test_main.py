@@ -0,0 +1,12 @@
+import pytest
+
+
+def test_main_imports():
+    # A syntax error fails here even without the optional TTS/render packages installed
+    try:
+        import main
+    except ModuleNotFoundError as e:
+        if e.name == "main":
+            raise
+        pytest.skip(f"optional dependency not installed: {e.name}")
+    assert callable(main.process_pipeline)
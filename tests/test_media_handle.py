@@ -0,0 +1,72 @@
+import subprocess
+import numpy as np
+import pytest
+from media_handle import MediaHandle, PCMStreamWriter, probe_media
+
+
+def test_from_bytes_is_owned_and_released():
+    handle = MediaHandle.from_bytes(b"narration", ".mp3")
+    assert handle.owned
+    assert handle.size == len(b"narration")
+    assert handle.read_bytes() == b"narration"
+
+    handle.release()
+    assert not handle.path.exists()
+
+
+def test_from_path_is_not_owned(tmp_path):
+    src = tmp_path / "scene.mp4"
+    src.write_bytes(b"video")
+
+    handle = MediaHandle.from_path(src)
+    handle.release()
+    assert src.exists()  # someone else's file is never deleted
+
+    with pytest.raises(FileNotFoundError):
+        MediaHandle.from_path(tmp_path / "missing.mp4")
+
+
+def test_copy_to_keeps_original(tmp_path):
+    handle = MediaHandle.from_bytes(b"final", ".mp4")
+    dest = handle.copy_to(tmp_path / "final.mp4")
+
+    assert dest.read_bytes() == b"final"
+    assert handle.path.exists()
+    handle.release()
+    assert dest.read_bytes() == b"final"
+
+
+def test_probe_fills_duration_and_codec(tmp_path):
+    video = tmp_path / "scene.mp4"
+    subprocess.run(
+        ["ffmpeg", "-y", "-f", "lavfi", "-i", "color=c=red:s=160x120:d=2", "-pix_fmt", "yuv420p", str(video)],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True,
+    )
+    handle = MediaHandle.from_path(video, probe=True)
+    assert handle.duration == pytest.approx(2.0, abs=0.1)
+    assert handle.codec == "h264"
+    assert probe_media(video)["video"][2:4] == (160, 120)
+
+
+def test_pcm_stream_writer_encodes_chunks_as_they_arrive():
+    writer = PCMStreamWriter(24000)
+    writer.write(np.zeros(12000, dtype=np.float32))     # float chunk
+    writer.write_silence(250)
+    writer.write(np.zeros(6000, dtype=np.int16))        # int16 chunk
+    handle = writer.close()
+
+    try:
+        assert handle.owned and handle.codec == "aac"
+        assert handle.duration == 1.0
+        assert (handle.sample_rate, handle.channels) == (24000, 1)
+        assert abs(probe_media(handle.path)["duration"] - 1.0) < 0.1
+    finally:
+        handle.release()
+    assert not handle.path.exists()
+
+
+def test_pcm_stream_writer_abort_removes_partial_file():
+    writer = PCMStreamWriter(24000)
+    writer.write(np.zeros(2400, dtype=np.int16))
+    writer.abort()
+    assert not writer.path.exists()
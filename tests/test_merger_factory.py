@@ -1,7 +1,7 @@
 import subprocess
 import pytest
 from pathlib import Path
-from merger_factory import MergerFactory
+from merger_factory import MergerFactory, StreamingMerger
 
 
 def generate_dummy_video(path: Path, duration=1):
@@ -94,3 +94,224 @@ def test_merge_all_videos_with_audio_mismatched_lists(dummy_files):
             [dummy_files["video_bytes"]],
             [dummy_files["audio_bytes"], dummy_files["audio_bytes"]]
         )
+
+
+def test_streaming_merger_muxes_out_of_order_scenes(dummy_files, tmp_path, monkeypatch):
+    second_video = tmp_path / "test2.mp4"
+    generate_dummy_video(second_video, duration=2)
+
+    muxed = []
+
+    def fake_mux_pair(video_bytes, audio_bytes, pair_idx=1):
+        muxed.append(pair_idx)
+        return video_bytes
+
+    monkeypatch.setattr(MergerFactory, "mux_pair", staticmethod(fake_mux_pair))
+
+    merger = StreamingMerger("test-uid", max_workers=2)
+    merger.add_audio_list([dummy_files["audio_bytes"], dummy_files["audio_bytes"]])
+    merger.add_video(1, second_video.read_bytes())
+    merger.add_video(0, dummy_files["video_bytes"])
+
+    final = merger.finish(video_count=2, audio_count=2)
+    assert sorted(muxed) == [1, 2]
+    assert final is not None
+    assert isinstance(final, bytes)
+    assert len(final) > len(dummy_files["video_bytes"])
+
+
+def test_streaming_merger_mismatched_counts(dummy_files):
+    merger = StreamingMerger("test-uid", max_workers=1)
+    merger.add_video(0, dummy_files["video_bytes"])
+    with pytest.raises(ValueError):
+        merger.finish(video_count=1, audio_count=2)
+
+
+def test_assemble_single_pass(dummy_files, tmp_path):
+    second_video = tmp_path / "test2.mp4"
+    generate_dummy_video(second_video, duration=2)
+
+    final = MergerFactory.assemble(
+        [dummy_files["video_bytes"], second_video.read_bytes()],
+        [dummy_files["audio_bytes"], dummy_files["audio_bytes"]],
+        "test-uid",
+    )
+    assert isinstance(final, bytes)
+
+    out_file = tmp_path / "final.mp4"
+    out_file.write_bytes(final)
+    probe = MergerFactory._probe_stream(out_file)
+    assert probe["duration"] == pytest.approx(3.0, abs=0.2)  # 1s + 2s scenes, audio fitted to each
+
+
+def test_assemble_mismatched_lists(dummy_files):
+    with pytest.raises(ValueError):
+        MergerFactory.assemble([dummy_files["video_bytes"]], [], "test-uid")
+
+
+def _record_ffmpeg_calls(monkeypatch):
+    import merger_factory
+    calls = []
+    real_run = merger_factory.subprocess.run
+
+    def recording_run(cmd, *args, **kwargs):
+        calls.append(cmd)
+        return real_run(cmd, *args, **kwargs)
+
+    monkeypatch.setattr(merger_factory.subprocess, "run", recording_run)
+    return calls
+
+
+def test_concatenate_uniform_videos_uses_stream_copy(dummy_files, tmp_path, monkeypatch):
+    second_video = tmp_path / "test2.mp4"
+    generate_dummy_video(second_video, duration=2)
+    calls = _record_ffmpeg_calls(monkeypatch)
+
+    final = MergerFactory.concatenate_videos([dummy_files["video_bytes"], second_video.read_bytes()])
+    assert final is not None
+    concat_cmds = [cmd for cmd in calls if "concat" in cmd]
+    assert concat_cmds[-1][-3:-1] == ["-c", "copy"]
+
+
+def test_concatenate_mixed_videos_reencodes(dummy_files, tmp_path, monkeypatch):
+    other_size = tmp_path / "other.mp4"
+    subprocess.run(
+        ["ffmpeg", "-y", "-f", "lavfi", "-i", "color=c=blue:s=320x240:d=1", "-pix_fmt", "yuv420p", str(other_size)],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True,
+    )
+    calls = _record_ffmpeg_calls(monkeypatch)
+
+    final = MergerFactory.concatenate_videos([dummy_files["video_bytes"], other_size.read_bytes()])
+    assert final is not None
+    concat_cmds = [cmd for cmd in calls if "concat" in cmd]
+    assert "libx264" in concat_cmds[-1]
+
+
+def test_assemble_with_media_handles(dummy_files, tmp_path):
+    from media_handle import MediaHandle
+
+    video = tmp_path / "scene.mp4"
+    video.write_bytes(dummy_files["video_bytes"])
+    audio = MediaHandle.from_bytes(dummy_files["audio_bytes"], ".mp3")
+
+    final = MergerFactory.assemble([MediaHandle.from_path(video)], [audio], "test-uid")
+    try:
+        assert isinstance(final, MediaHandle)
+        assert final.owned and final.size > 0
+        assert video.exists()  # inputs are read in place, not consumed
+    finally:
+        final.release()
+        audio.release()
+
+
+def test_mux_pair_stream_copies_delivery_audio(dummy_files, tmp_path, monkeypatch):
+    import numpy as np
+    from config import Settings
+    from media_handle import MediaHandle, probe_media
+    from processor.audio_utils import encode_delivery
+
+    monkeypatch.setattr(Settings, "AUDIO_OUTPUT_FORMAT", "aac")
+    video = tmp_path / "scene.mp4"
+    video.write_bytes(dummy_files["video_bytes"])
+    audio = encode_delivery(np.zeros(24000 * 2, dtype=np.float32), 24000)   # longer than the 1 s scene
+    calls = _record_ffmpeg_calls(monkeypatch)
+
+    merged = MergerFactory.mux_pair(MediaHandle.from_path(video), audio)
+    try:
+        assert ["-c:a", "copy"] == calls[-1][calls[-1].index("-c:a"):calls[-1].index("-c:a") + 2]
+        assert probe_media(merged.path)["audio"] == ("aac", 48000, "stereo")
+    finally:
+        merged.release()
+        audio.release()
+
+
+def test_audio_copyable_needs_delivery_format_and_full_coverage(dummy_files, tmp_path, monkeypatch):
+    import numpy as np
+    from config import Settings
+    from processor.audio_utils import encode_delivery
+
+    video = tmp_path / "scene.mp4"
+    video.write_bytes(dummy_files["video_bytes"])
+    mp3 = tmp_path / "narration.mp3"
+    mp3.write_bytes(dummy_files["audio_bytes"])
+    short = encode_delivery(np.zeros(12000, dtype=np.float32), 24000)       # 0.5 s
+
+    try:
+        monkeypatch.setattr(Settings, "AUDIO_OUTPUT_FORMAT", "aac")
+        assert not MergerFactory._audio_copyable(video, mp3)
+        assert not MergerFactory._audio_copyable(video, short.path)
+        monkeypatch.setattr(Settings, "AUDIO_OUTPUT_FORMAT", "native")
+        assert not MergerFactory._audio_copyable(video, short.path)
+    finally:
+        short.release()
+
+
+def test_audio_copyable_uses_handle_metadata_without_probing_audio(dummy_files, tmp_path, monkeypatch):
+    import numpy as np
+    from config import Settings
+    from processor.audio_utils import encode_delivery
+
+    monkeypatch.setattr(Settings, "AUDIO_OUTPUT_FORMAT", "aac")
+    video = tmp_path / "scene.mp4"
+    video.write_bytes(dummy_files["video_bytes"])
+    audio = encode_delivery(np.zeros(24000 * 2, dtype=np.float32), 24000)
+    probed = []
+    real_probe = MergerFactory._probe_stream
+    monkeypatch.setattr(MergerFactory, "_probe_stream", staticmethod(lambda p: probed.append(str(p)) or real_probe(p)))
+
+    try:
+        assert MergerFactory._audio_copyable(video, audio)
+        assert probed == [str(video)]
+    finally:
+        audio.release()
+
+
+def test_single_pass_falls_back_to_two_stage(monkeypatch):
+    from config import Settings
+    calls = []
+    monkeypatch.setattr(Settings, "MERGE_MODE", "single_pass")
+    monkeypatch.setattr(MergerFactory, "assemble", staticmethod(lambda v, a, uid: calls.append("single_pass")))
+    monkeypatch.setattr(
+        MergerFactory, "merge_video_with_audio",
+        staticmethod(lambda v, a, uid: calls.append("two_stage") or b"merged"),
+    )
+
+    assert MergerFactory.merge_all_videos_with_audio([b"v"], [b"a"], "test-uid") == b"merged"
+    assert calls == ["single_pass", "two_stage"]
+
+
+def test_streaming_merger_close_releases_unconsumed_muxes(tmp_path, monkeypatch):
+    from media_handle import MediaHandle
+
+    def fake_mux_pair(video_bytes, audio_bytes, pair_idx=1):
+        return MediaHandle.from_bytes(video_bytes, ".mp4")
+
+    monkeypatch.setattr(MergerFactory, "mux_pair", staticmethod(fake_mux_pair))
+
+    merger = StreamingMerger("test-uid", max_workers=1)
+    merger.add_audio(0, b"audio")
+    merger.add_video(0, b"video")
+    muxed = merger._futures[0].result()
+    assert muxed.path.exists()
+
+    # The run failed before `finish`: the pool stops and the scene mux is deleted
+    merger.close()
+    assert not muxed.path.exists()
+    assert merger._executor._shutdown
+
+
+def test_streaming_merger_ignores_compacted_list_after_streaming(monkeypatch):
+    pairs = []
+    monkeypatch.setattr(MergerFactory, "mux_pair", staticmethod(lambda v, a, pair_idx=1: pairs.append((v, a))))
+
+    merger = StreamingMerger("test-uid", max_workers=1)
+    merger.add_audio(0, b"audio0")
+    merger.add_audio(2, b"audio2")   # scene 1's narration was dropped
+    merger.add_audio_list([b"audio0", b"audio2"])
+    for idx in range(3):
+        merger.add_video(idx, f"video{idx}".encode())
+    for future in list(merger._futures.values()):
+        future.result()
+    merger.close()
+
+    assert sorted(pairs) == [(b"video0", b"audio0"), (b"video2", b"audio2")]
@@ -0,0 +1,93 @@
+import pytest
+from contextlib import contextmanager
+from config import Settings
+from db_pool import DBPool
+from migrations import Migrations, MIGRATIONS
+
+
+class FakeCursor:
+    def __init__(self, db):
+        self.db = db
+        self.last = None
+    def execute(self, query, params=None):
+        self.db.statements.append(query)
+        if "FROM schema_version" in query:
+            self.last = (1,) if params[0] in self.db.versions else None
+        elif "INSERT INTO schema_version" in query:
+            self.db.versions.add(params[0])
+    def fetchone(self): return self.last
+    def close(self): pass
+
+
+class FakeDB:
+    def __init__(self):
+        self.statements = []
+        self.versions = set()
+    def cursor(self): return FakeCursor(self)
+    def commit(self): pass
+    def rollback(self): pass
+
+
+@pytest.fixture
+def db(monkeypatch):
+    fake = FakeDB()
+
+    @contextmanager
+    def fake_connection(credentials=None):
+        yield fake
+
+    monkeypatch.setattr(DBPool, "connection", fake_connection)
+    monkeypatch.setattr(Migrations, "_migrated", set())
+    monkeypatch.setattr(Migrations, "_failed_at", {})
+    return fake
+
+
+def test_run_applies_each_version_once(db):
+    assert Migrations.run() == len(MIGRATIONS)
+    ddl = [q for q in db.statements if "CREATE TABLE" in q]
+    assert Migrations.run() == 0
+    # Second run only checks versions: no further table DDL
+    assert [q for q in db.statements if "CREATE TABLE" in q and "schema_version" not in q] == \
+        [q for q in ddl if "schema_version" not in q]
+
+
+def test_baseline_covers_every_pipeline_table(db):
+    Migrations.run()
+    ddl = " ".join(str(q) for q in db.statements)
+    for table in ("transaction", "exception_store", "exceptions", "script_store",
+                  Settings.POSTGRES["table"], Settings.FINAL_VIDEO_TABLE):
+        assert table in ddl
+
+
+def test_ensure_runs_once_per_database(db):
+    assert Migrations.ensure()
+    assert Migrations.ensure()
+    assert sum("CREATE TABLE IF NOT EXISTS schema_version" in str(q) for q in db.statements) == 1
+
+
+@pytest.fixture
+def failing_run(monkeypatch):
+    monkeypatch.setattr(Migrations, "_migrated", set())
+    monkeypatch.setattr(Migrations, "_failed_at", {})
+    attempts = []
+
+    def failing(credentials=None):
+        attempts.append(1)
+        raise RuntimeError("connection refused")
+
+    monkeypatch.setattr(Migrations, "run", staticmethod(failing))
+    return attempts
+
+
+def test_ensure_reports_failure_and_retries(failing_run, monkeypatch):
+    monkeypatch.setattr(Settings, "DB_MIGRATION_RETRY_SECONDS", 0)
+    assert not Migrations.ensure()
+    assert not Migrations.ensure()
+    assert len(failing_run) == 2
+
+
+def test_ensure_backs_off_after_a_failure(failing_run, monkeypatch):
+    monkeypatch.setattr(Settings, "DB_MIGRATION_RETRY_SECONDS", 30)
+    assert not Migrations.ensure()
+    assert not Migrations.ensure()
+    assert len(failing_run) == 1
@@ -1,5 +1,6 @@
 import os
 import pytest
+from contextlib import contextmanager
 from pathlib import Path
 from saver_factory import SaverFactory
 
@@ -56,10 +57,11 @@ def test_save_final_video_postgres_mock(monkeypatch):
         def commit(self): pass
         def close(self): pass
 
-    def fake_connect(**kwargs):
-        return FakeConnection()
+    @contextmanager
+    def fake_connection(credentials=None):
+        yield FakeConnection()
 
-    monkeypatch.setattr("saver_factory.psycopg2.connect", fake_connect)
+    monkeypatch.setattr("saver_factory.DBPool.connection", fake_connection)
 
     video_bytes = b"postgres_video_data"
     db_credentials = {
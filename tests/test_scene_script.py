@@ -0,0 +1,21 @@
+import os
+from video_pipeline.utils import write_scene_script
+
+
+def test_scene_script_is_written_atomically(tmp_path):
+    path = write_scene_script(tmp_path, "scene1", "print('a')")
+    assert path == tmp_path / "scene1" / "scene1.py"
+    assert path.read_text(encoding="utf-8") == "print('a')"
+
+    write_scene_script(tmp_path, "scene1", "print('b')")
+    assert path.read_text(encoding="utf-8") == "print('b')"
+    assert [p.name for p in (tmp_path / "scene1").iterdir()] == ["scene1.py"]   # no temp files left
+
+
+def test_unchanged_scene_script_is_not_rewritten(tmp_path):
+    path = write_scene_script(tmp_path, "scene1", "print('a')")
+    os.utime(path, (1000, 1000))
+    inode = path.stat().st_ino
+
+    write_scene_script(tmp_path, "scene1", "print('a')")
+    assert path.stat().st_mtime == 1000 and path.stat().st_ino == inode
@@ -0,0 +1,87 @@
+import threading
+import pytest
+from config import Settings
+from Transaction.status_writer import StatusWriter
+
+
+@pytest.fixture
+def sink(monkeypatch):
+    """A registered 'test' sink that records every batch it is handed."""
+    batches = []
+    StatusWriter.register("test", lambda rows: batches.append(rows))
+    monkeypatch.setattr(Settings, "STATUS_FLUSH_INTERVAL_MS", 60000)   # only flush() triggers a batch
+    monkeypatch.setattr(Settings, "STATUS_BATCH_SIZE", 1000)
+    yield batches
+    StatusWriter.flush(timeout=5)
+
+
+def test_updates_for_one_key_are_coalesced(sink):
+    StatusWriter.submit("test", "tx-1", {"topic": "Math", "merge_status": None})
+    StatusWriter.submit("test", "tx-2", {"topic": "Physics"})
+    StatusWriter.submit("test", "tx-1", {"merge_status": "merged", "topic": None})
+
+    assert StatusWriter.flush(timeout=5)
+    assert sink == [[("tx-1", {"topic": "Math", "merge_status": "merged"}), ("tx-2", {"topic": "Physics"})]]
+
+
+def test_flush_waits_for_the_write(monkeypatch):
+    release = threading.Event()
+    written = []
+    StatusWriter.register("slow", lambda rows: (release.wait(5), written.extend(rows)))
+
+    StatusWriter.submit("slow", "tx", {"video_status": "success"})
+    assert not StatusWriter.flush(timeout=0.2)
+    release.set()
+    assert StatusWriter.flush(timeout=5)
+    assert written == [("tx", {"video_status": "success"})]
+
+
+def test_full_queue_drops_with_drop_policy(sink, monkeypatch):
+    monkeypatch.setattr(Settings, "STATUS_QUEUE_MAX", 2)
+    monkeypatch.setattr(Settings, "STATUS_QUEUE_POLICY", "drop")
+    dropped = StatusWriter.stats()["dropped"]
+
+    assert StatusWriter.submit("test", "a", {"x": 1})
+    assert StatusWriter.submit("test", "b", {"x": 1})
+    assert StatusWriter.submit("test", "a", {"x": 2})      # coalesced: always fits
+    assert not StatusWriter.submit("test", "c", {"x": 1})
+    assert StatusWriter.stats()["dropped"] == dropped + 1
+
+    StatusWriter.flush(timeout=5)
+    assert [key for key, _ in sink[-1]] == ["a", "b"]
+
+
+def test_full_queue_blocks_until_flushed_with_block_policy(sink, monkeypatch):
+    monkeypatch.setattr(Settings, "STATUS_QUEUE_MAX", 1)
+    monkeypatch.setattr(Settings, "STATUS_QUEUE_POLICY", "block")
+    monkeypatch.setattr(Settings, "STATUS_QUEUE_BLOCK_SECONDS", 5)
+
+    assert StatusWriter.submit("test", "a", {"x": 1})
+    assert StatusWriter.submit("test", "b", {"x": 1})      # waits for "a" to be written
+    assert sink[0] == [("a", {"x": 1})]
+
+
+def test_failed_batch_does_not_stall_flush():
+    def broken(rows):
+        raise RuntimeError("database is down")
+
+    StatusWriter.register("broken", broken)
+    StatusWriter.submit("broken", "tx", {"x": 1})
+    assert StatusWriter.flush(timeout=5)
+
+
+def test_transaction_wrapper_queues_instead_of_connecting(monkeypatch):
+    from Transaction.transaction_handler import transaction
+
+    rows = []
+    monkeypatch.setattr(Settings, "STATUS_WRITE_BEHIND", True)
+    monkeypatch.setitem(StatusWriter._sinks, "transaction", rows.extend)
+
+    transaction("uid-1", topic="Math", cleaned_script={"scenes": 2})
+    transaction("uid-1", merge_status="Final video merged successfully")
+    assert StatusWriter.flush(timeout=5)
+
+    (key, fields), = rows
+    assert key == "uid-1"
+    assert fields["topic"] == "Math" and fields["cleaned_script"] == '{"scenes": 2}'
+    assert fields["merge_status"] == "Final video merged successfully" and "updated_at" in fields
@@ -0,0 +1,49 @@
+import table_gen
+from table_gen import Table_gen
+
+
+class FakeCursor:
+    def close(self): pass
+
+
+class FakeConn:
+    def __init__(self):
+        self.commits = 0
+    def cursor(self): return FakeCursor()
+    def commit(self): self.commits += 1
+    def rollback(self): pass
+
+
+def test_rows_are_inserted_in_one_statement(tmp_path, monkeypatch):
+    # Narrations come from memory: the .txt paths don't even exist
+    txt_files = [str(tmp_path / f"script_seq{i}" / f"script_seq{i}.txt") for i in range(3)]
+    narrations = {f"script_seq{i}": f"narration {i}" for i in range(3)}
+    py_files = [f"script_seq{i}.py" for i in range(3)]
+
+    conn = FakeConn()
+    calls = []
+    monkeypatch.setattr(table_gen.Migrations, "ensure", staticmethod(lambda credentials=None: True))
+    monkeypatch.setattr(table_gen.DBPool, "getconn", staticmethod(lambda credentials=None: conn))
+    monkeypatch.setattr(table_gen.DBPool, "putconn", staticmethod(lambda c, discard=False: None))
+    monkeypatch.setattr(table_gen, "execute_values", lambda cur, query, rows: calls.append(rows))
+
+    Table_gen.table_generator(
+        [{"py_files": py_files, "txt_files": txt_files}, str(tmp_path / "Pythagoras")],
+        [{"video_paths": ["a.mp4", "b.mp4", "c.mp4"]}, {"audio_paths": ["a.wav", "b.wav", "c.wav"]}],
+        narrations,
+    )
+
+    assert len(calls) == 1 and conn.commits == 1
+    rows = calls[0]
+    assert [row[1] for row in rows] == ["script_seq0", "script_seq1", "script_seq2"]
+    assert [row[4] for row in rows] == ["narration 0", "narration 1", "narration 2"]
+    assert rows[2][2] == "c.mp4" and rows[2][6] == "c.wav"
+    assert all(row[0].startswith("Pythagoras_") for row in rows)
+
+
+def test_nothing_to_insert_skips_the_database(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("no connection expected")
+    monkeypatch.setattr(table_gen.DBPool, "getconn", staticmethod(fail))
+
+    Table_gen.table_generator([{"py_files": [], "txt_files": []}, "topic"], [{}, {}])
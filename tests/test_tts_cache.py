@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from config import Settings
+from processor.tts_cache import TTSCache
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(Settings, "TTS_CACHE_ENABLED", True)
+    monkeypatch.setattr(Settings, "TTS_CACHE_DIR", tmp_path / "tts_cache")
+    monkeypatch.setattr(TTSCache, "_cache", None)
+    return tmp_path / "tts_cache"
+
+
+def test_key_normalizes_whitespace_but_not_voice_or_speed():
+    key = TTSCache.sentence_key("kokoro", "af_aoede", "Welcome!  Today\nwe begin.", speed=1.0, sample_rate=24000)
+    assert key == TTSCache.sentence_key("kokoro", "af_aoede", " Welcome! Today we begin. ", speed=1, sample_rate=24000)
+    assert key != TTSCache.sentence_key("kokoro", "af_bella", "Welcome! Today we begin.", speed=1.0, sample_rate=24000)
+    assert key != TTSCache.sentence_key("kokoro", "af_aoede", "Welcome! Today we begin.", speed=1.2, sample_rate=24000)
+    assert key != TTSCache.sentence_key("coqui", "af_aoede", "Welcome! Today we begin.", speed=1.0, sample_rate=24000)
+
+
+def test_cached_samples_synthesizes_once_and_keeps_dtype(cache_dir):
+    calls = []
+
+    def synthesize():
+        calls.append(1)
+        return np.array([1, -2, 3], dtype=np.int16)
+
+    key = TTSCache.sentence_key("coqui", "Kumar Dahl:en", "Hello there", sample_rate=24000)
+    first = TTSCache.cached_samples(key, synthesize)
+    second = TTSCache.cached_samples(key, synthesize)
+
+    assert len(calls) == 1
+    assert second.dtype == np.int16 and second.tolist() == first.tolist() == [1, -2, 3]
+    stats = TTSCache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+
+
+def test_failures_are_not_cached_and_disabled_cache_is_bypassed(cache_dir, monkeypatch):
+    key = TTSCache.sentence_key("gtts", "en", "Hi")
+    assert TTSCache.cached_bytes(key, lambda: None) is None
+    assert TTSCache.cached_bytes(key, lambda: b"mp3") == b"mp3"
+
+    monkeypatch.setattr(Settings, "TTS_CACHE_ENABLED", False)
+    assert TTSCache.cached_bytes(key, lambda: b"fresh") == b"fresh"
@@ -0,0 +1,75 @@
+import threading
+import time
+
+import pytest
+
+from config import Settings
+from processor.tts_model_pool import TTSModelPool
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    # Isolate the class-level state and keep the janitor thread out of tests
+    monkeypatch.setattr(TTSModelPool, "_backends", {})
+    monkeypatch.setattr(TTSModelPool, "_idle", {})
+    monkeypatch.setattr(TTSModelPool, "_counts", {})
+    monkeypatch.setattr(Settings, "TTS_POOL_SWEEP_SECONDS", 0)
+    monkeypatch.setattr(Settings, "TTS_POOL_MAX_RSS_MB", 0)
+    monkeypatch.setattr(Settings, "TTS_POOL_MAX_INSTANCES", 1)
+    return TTSModelPool
+
+
+def test_model_is_loaded_once_and_reused(pool):
+    loads, warmups = [], []
+    pool.register("fake", lambda: loads.append(1) or object(), warmups.append)
+
+    with pool.acquire("fake") as first:
+        pass
+    with pool.acquire("fake") as second:
+        pass
+
+    assert first is second
+    assert len(loads) == 1
+    assert warmups == [first]
+    assert pool.stats()["fake"] == {"alive": 1, "idle": 1}
+
+
+def test_unregistered_backend_raises(pool):
+    with pytest.raises(ValueError):
+        with pool.acquire("missing"):
+            pass
+
+
+def test_callers_wait_when_pool_is_full(pool):
+    pool.register("fake", object)
+    order = []
+
+    def borrower(tag):
+        with pool.acquire("fake"):
+            order.append(tag)
+
+    with pool.acquire("fake"):
+        t = threading.Thread(target=borrower, args=("second",))
+        t.start()
+        time.sleep(0.1)
+        order.append("first")
+    t.join(timeout=5)
+
+    assert order == ["first", "second"]
+    assert pool.stats()["fake"]["alive"] == 1
+
+
+def test_idle_models_are_evicted(pool, monkeypatch):
+    monkeypatch.setattr(Settings, "TTS_POOL_IDLE_SECONDS", 10)
+    loads = []
+    pool.register("fake", lambda: loads.append(1) or object())
+
+    with pool.acquire("fake"):
+        pass
+    assert pool.evict(now=time.monotonic() + 5) == 0
+    assert pool.evict(now=time.monotonic() + 60) == 1
+    assert pool.stats()["fake"] == {"alive": 0, "idle": 0}
+
+    with pool.acquire("fake"):
+        pass
+    assert len(loads) == 2
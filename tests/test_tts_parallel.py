@@ -0,0 +1,120 @@
+import os
+import time
+
+import numpy as np
+
+from config import Settings
+from processor.tts_model_pool import TTSModelPool
+from processor.tts_parallel import ParallelTTS
+
+
+def _load_fake_model():
+    return os.getpid()
+
+
+# Registered at import so spawned workers know the backend too
+TTSModelPool.register("fake_parallel", _load_fake_model)
+
+
+class FakeFactory:
+    """Shard protocol with the worker pid standing in for the audio."""
+
+    @staticmethod
+    def read_shards(txt_file, unique_id):
+        sentences = open(txt_file, encoding="utf-8").read().split()
+        return [[s] for s in sentences] or None
+
+    @staticmethod
+    def synthesize_shard(model, sentences, txt_name, unique_id):
+        return (model, sentences[0])
+
+    @staticmethod
+    def assemble(txt_file, shards, unique_id):
+        return shards
+
+
+def _write_scenes(tmp_path, texts):
+    files = []
+    for i, text in enumerate(texts, start=1):
+        path = tmp_path / f"script_seq{i}.txt"
+        path.write_text(text, encoding="utf-8")
+        files.append(str(path))
+    return files
+
+
+def test_map_threads_keeps_scene_order_and_drops_skipped(tmp_path, monkeypatch):
+    monkeypatch.setattr(Settings, "TTS_THREAD_WORKERS", 4)
+    files = _write_scenes(tmp_path, ["one", "", "three", "four"])
+
+    def slow_first(txt_file, unique_id):
+        # Earlier scenes finish last; output must still follow the input order
+        text = open(txt_file, encoding="utf-8").read().strip()
+        time.sleep({"one": 0.15, "three": 0.05}.get(text, 0))
+        return text.encode() or None
+
+    assert ParallelTTS.map_threads(slow_first, files, "uid") == [b"one", b"three", b"four"]
+
+
+def test_map_shards_fans_out_to_workers_and_regroups_in_order(tmp_path, monkeypatch):
+    monkeypatch.setattr(Settings, "TTS_PROCESS_WORKERS", 2)
+    monkeypatch.setattr(Settings, "TTS_POOL_SWEEP_SECONDS", 0)
+    files = _write_scenes(tmp_path, ["a1 a2 a3", "", "c1"])
+
+    try:
+        result = ParallelTTS.map_shards("fake_parallel", FakeFactory, files, "uid")
+    finally:
+        ParallelTTS._reset_process_executor("fake_parallel")
+
+    assert [[text for _, text in shards] for shards in result] == [["a1", "a2", "a3"], ["c1"]]
+    assert os.getpid() not in {pid for shards in result for pid, _ in shards}
+
+
+def test_map_shards_single_shard_runs_in_process(tmp_path, monkeypatch):
+    monkeypatch.setattr(Settings, "TTS_POOL_SWEEP_SECONDS", 0)
+    files = _write_scenes(tmp_path, ["only"])
+
+    assert ParallelTTS.map_shards("fake_parallel", FakeFactory, files, "uid") == [[(os.getpid(), "only")]]
+
+
+class StreamFactory:
+    """Each sentence is 0.1 s of audio; sentences marked FAIL fail their shard."""
+
+    @staticmethod
+    def read_shards(txt_file, unique_id):
+        sentences = open(txt_file, encoding="utf-8").read().split()
+        return [[s] for s in sentences] or None
+
+    @staticmethod
+    def synthesize_shard(model, sentences, txt_name, unique_id):
+        if sentences == ["FAIL"]:
+            return None
+        return np.full(2400, 0.1, dtype=np.float32), 24000
+
+    @staticmethod
+    def shard_gap_ms():
+        return 100
+
+    @staticmethod
+    def assemble(txt_file, shards, unique_id):
+        raise AssertionError("streaming mode must not assemble")
+
+
+def test_map_shards_streams_each_narration_to_on_scene(tmp_path, monkeypatch):
+    monkeypatch.setattr(Settings, "TTS_PROCESS_WORKERS", 1)
+    monkeypatch.setattr(Settings, "TTS_POOL_SWEEP_SECONDS", 0)
+    files = _write_scenes(tmp_path, ["a b", "x FAIL", "", "c"])
+    delivered = []
+
+    handles = ParallelTTS.map_shards(
+        "fake_parallel", StreamFactory, files, "uid",
+        on_scene=lambda idx, handle: delivered.append((idx, handle.duration)),
+    )
+
+    try:
+        # Failed and empty narrations are dropped; the rest keep their scene index
+        assert delivered == [(0, 0.3), (3, 0.1)]
+        assert all(h.codec == "aac" and h.path.exists() for h in handles)
+    finally:
+        for handle in handles:
+            handle.release()
+
@@ -0,0 +1,57 @@
+from config import Settings
+from processor.Manim.video_factory import VideoFactory
+
+
+class FakeExecutor:
+    def __init__(self):
+        self.shut_down = False
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.shut_down = True
+
+
+def test_reset_leaves_a_replacement_pool_alone(monkeypatch):
+    broken, replacement = FakeExecutor(), FakeExecutor()
+    monkeypatch.setattr(VideoFactory, "_executor", replacement)
+
+    # Pipeline A noticed its pool broke after pipeline B had already replaced it
+    VideoFactory._reset_executor(broken)
+    assert VideoFactory._executor is replacement and not replacement.shut_down
+    assert broken.shut_down
+
+    VideoFactory._reset_executor(replacement)
+    assert VideoFactory._executor is None and replacement.shut_down
+
+
+class FakeCache:
+    def __init__(self):
+        self.stored = {}
+    def get(self, key): return None
+    def put(self, key, path): self.stored[key] = path
+    def path_for(self, key): return None
+
+
+def test_failed_early_render_is_rendered_again(monkeypatch):
+    from concurrent.futures import Future
+    from processor.Manim.render_cache import RenderCache
+
+    failed = Future()
+    failed.set_result({"returncode": 1, "video_path": None, "stdout": "", "stderr": "boom"})
+    cache = FakeCache()
+    rendered = []
+
+    def fake_render_all(jobs, on_result=None):
+        for i, (file, _) in enumerate(jobs):
+            rendered.append(file)
+            on_result(i, {"file": file, "returncode": 0, "video_path": f"/out/{file}.mp4", "stdout": "", "stderr": ""})
+
+    monkeypatch.setattr(Settings, "RENDER_CACHE_ENABLED", True)
+    monkeypatch.setattr(RenderCache, "get_cache", staticmethod(lambda: cache))
+    monkeypatch.setattr(RenderCache, "scene_key", staticmethod(lambda file, quality: f"key-{file}"))
+    monkeypatch.setattr(VideoFactory, "_inflight", {"key-a": failed})
+    monkeypatch.setattr(VideoFactory, "_render_all", staticmethod(fake_render_all))
+
+    results = VideoFactory._render_with_cache([("a", "media/a"), ("b", "media/b")])
+
+    assert sorted(rendered) == ["a", "b"]
+    assert [r["returncode"] for r in results] == [0, 0]
+    assert cache.stored["key-a"] == "/out/a.mp4"